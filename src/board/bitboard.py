@@ -0,0 +1,671 @@
+from src.config import config
+from src.utils import flip_pos
+from src.board.zobrist import get_square
+from src.board.tables import AttackTables, get_tables
+from src.board.move_encoding import encode_move, get_from_square, get_to_square, is_quiet, CAPTURE, EN_PASSANT, CASTLING, DOUBLE_PUSH
+from src.constants import bishop_directions, rook_directions, queen_directions, castling_king_column
+
+# Notations of the pieces, in the order their moves are generated
+PIECE_NOTATIONS = ("P", "N", "B", "R", "Q", "K")
+# Pieces of the white and black players with which no player can checkmate
+INSUFFICIENT_MATERIALS = (("K", "K"), ("KB", "K"), ("K", "KB"), ("KN", "K"), ("K", "KN"))
+# Pieces with which no player can checkmate if the bishops stand on squares of the same color
+BISHOPS_MATERIAL = ("KB", "KB")
+# Masks already computed, depending on the board's geometry
+_masks = {}
+
+class BitboardMasks:
+    def __init__(self, tables: AttackTables):
+        """
+        Turns the attack tables of a board's geometry into the masks used by the bitboards.
+
+        A mask is an integer where the bit of index `row * columns + column` is set for each square it
+        contains, the squares being the ones of the unflipped board (as for the Zobrist keys). Python's
+        integers have no fixed size, so a mask is not limited to 64 squares.
+
+        Parameters:
+            tables (AttackTables): The attack tables of the board's geometry.
+
+        Attributes:
+            rows (int): The number of rows of the board.
+            columns (int): The number of columns of the board.
+            knight (list[int]): For each square, the squares a knight standing on it attacks.
+            king (list[int]): For each square, the squares a king standing on it attacks.
+            pawn (dict): A dictionary where keys are colors and values are, for each square,
+                         the squares a pawn of this color standing on it attacks.
+            rays (dict): A dictionary where keys are directions (d_row, d_column) and values are,
+                         for each square, the squares met by following the direction up to the edge.
+            increasing (dict): A dictionary where keys are directions and values are whether the
+                               index of the squares increases when following the direction.
+            between (list[dict]): For each square, a dictionary where keys are the squares aligned with
+                                  it and values are the squares strictly between them.
+            material_units (dict): A dictionary where keys are colors and values are dictionaries where keys
+                                   are notations and values are the amounts one piece adds to the material
+                                   signature (see `BitboardPosition.material`). Each type and color has its
+                                   own field, wide enough to count a piece on every square of the board.
+            insufficient_materials (frozenset[int]): The signatures of `INSUFFICIENT_MATERIALS`.
+            bishops_material (int): The signature of `BISHOPS_MATERIAL`.
+        """
+        self.rows = tables.rows
+        self.columns = tables.columns
+        positions = [(row, column) for row in range(self.rows) for column in range(self.columns)]
+        self.knight = [self._to_mask(tables.knight[pos]) for pos in positions]
+        self.king = [self._to_mask(tables.king[pos]) for pos in positions]
+        # White pawns move up the unflipped board, towards the row 0
+        self.pawn = {color: [self._to_mask(tables.pawn[color][pos]) for pos in positions] for color in [1, -1]}
+        self.rays = {direction: [self._to_mask(tables.rays[pos][direction]) for pos in positions] for direction in queen_directions}
+        self.increasing = {direction: direction[0] * self.columns + direction[1] > 0 for direction in queen_directions}
+        self.between = [{} for _ in positions]
+        for square, pos in enumerate(positions):
+            for ray in tables.rays[pos].values():
+                between = 0
+                for target in ray:
+                    target_square = target[0] * self.columns + target[1]
+                    self.between[square][target_square] = between
+                    between |= 1 << target_square
+        bits = len(positions).bit_length()
+        self.material_units = {color: {notation: 1 << (bits * (index + (0 if color == 1 else len(PIECE_NOTATIONS)))) for index, notation in enumerate(PIECE_NOTATIONS)} for color in [1, -1]}
+        self.insufficient_materials = frozenset(self.get_material_signature(white, black) for white, black in INSUFFICIENT_MATERIALS)
+        self.bishops_material = self.get_material_signature(*BISHOPS_MATERIAL)
+
+    def _to_mask(self, positions: tuple[tuple[int, int], ...]) -> int:
+        """
+        Computes the mask of some positions.
+
+        Parameters:
+            positions (tuple[tuple[int, int], ...]): The positions (row, column) of the unflipped board.
+
+        Returns:
+            int: The mask with the bit of each position set.
+        """
+        mask = 0
+        for row, column in positions:
+            mask |= 1 << (row * self.columns + column)
+        return mask
+
+    def get_material_signature(self, white: str, black: str) -> int:
+        """
+        Computes the material signature of a set of pieces.
+
+        Parameters:
+            white (str): The notations of the white pieces, such as "KB".
+            black (str): The notations of the black pieces.
+
+        Returns:
+            int: The signature, as kept by `BitboardPosition.material`.
+        """
+        return sum(self.material_units[1][notation] for notation in white) + sum(self.material_units[-1][notation] for notation in black)
+
+def get_masks() -> BitboardMasks:
+    """
+    Retrieves the masks of the current board's geometry, computing them the first time.
+
+    Returns:
+        BitboardMasks: The masks matching `config.rows` and `config.columns`.
+    """
+    geometry = (config.rows, config.columns)
+    if geometry not in _masks:
+        _masks[geometry] = BitboardMasks(get_tables())
+    return _masks[geometry]
+
+def get_pos(square: int, flipped: int) -> tuple[int, int]:
+    """
+    Converts the index of a square seen from white's side into a position of the board.
+
+    This is the inverse of `get_square`.
+
+    Parameters:
+        square (int): The index of the square.
+        flipped (int): The flipped state of the board (1 for normal, -1 for flipped).
+
+    Returns:
+        tuple[int, int]: The position (row, column) on the board.
+    """
+    return flip_pos(divmod(square, config.columns), flipped=flipped)
+
+def iter_squares(mask: int):
+    """
+    Iterates over the squares of a mask, from the lowest index to the highest.
+
+    Parameters:
+        mask (int): The mask of squares.
+
+    Yields:
+        int: The index of each square of the mask.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+class BitboardPosition:
+    def __init__(self, rules):
+        """
+        Initializes an empty position stored as bitboards.
+
+        The board's tiles are still used by the interface, but the move generation and the attack
+        detection only read these integers, which are updated by `Board.set_piece`. Finding the
+        pieces attacking a square or the moves of a slider then takes a few bitwise operations
+        on precomputed masks, instead of following rays tile by tile.
+
+        Parameters:
+            rules (Rules): The rules of the board, which decide of the legal moves.
+
+        Attributes:
+            rules (Rules): The rules of the board.
+            masks (BitboardMasks): The precomputed masks of the board's geometry.
+            pieces (dict): A dictionary where keys are colors and values are dictionaries where keys are
+                           the notations of the pieces and values are the masks of their squares.
+            occupancy (dict): A dictionary where keys are colors and values are the masks of the squares
+                              occupied by the pieces of this color.
+            occupied (int): The mask of the squares occupied by any piece.
+            mailbox (list[str | None]): For each square, the notation of the piece standing on it, or None.
+            material (int): The material signature of the position, the number of pieces of each type and
+                            color packed in an integer (see `BitboardMasks.material_units`). Two positions with the same
+                            pieces have the same signature, whatever their squares.
+        """
+        self.rules = rules
+        self.masks = get_masks()
+        self.pieces = {color: {notation: 0 for notation in PIECE_NOTATIONS} for color in [1, -1]}
+        self.occupancy = {1: 0, -1: 0}
+        self.occupied = 0
+        self.mailbox = [None] * (self.masks.rows * self.masks.columns)
+        self.material = 0
+
+    def add_piece(self, color: int, notation: str, square: int) -> None:
+        """
+        Places a piece on an empty square.
+
+        Parameters:
+            color (int): The color of the piece.
+            notation (str): The notation of the piece.
+            square (int): The index of the square.
+        """
+        bit = 1 << square
+        self.pieces[color][notation] |= bit
+        self.occupancy[color] |= bit
+        self.occupied |= bit
+        self.mailbox[square] = notation
+        self.material += self.masks.material_units[color][notation]
+
+    def remove_piece(self, color: int, notation: str, square: int) -> None:
+        """
+        Removes a piece from its square.
+
+        Parameters:
+            color (int): The color of the piece.
+            notation (str): The notation of the piece.
+            square (int): The index of the square.
+        """
+        bit = ~(1 << square)
+        self.pieces[color][notation] &= bit
+        self.occupancy[color] &= bit
+        self.occupied &= bit
+        self.mailbox[square] = None
+        self.material -= self.masks.material_units[color][notation]
+
+    def __getstate__(self) -> dict:
+        """
+        Retrieves the state of the position to pickle it, without its masks.
+
+        The masks only depend on the board's geometry, so a worker process computes its own once
+        instead of receiving them with each copy of the board.
+
+        Returns:
+            dict: The attributes of the position, apart from its masks.
+        """
+        state = self.__dict__.copy()
+        del state["masks"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled position, retrieving the masks of the board's geometry.
+
+        Parameters:
+            state (dict): The attributes of the position, as returned by `__getstate__`.
+        """
+        self.__dict__.update(state)
+        self.masks = get_masks()
+
+    def copy(self) -> "BitboardPosition":
+        """
+        Copies the position, so that the copy can be played on without changing the original.
+
+        The masks and the rules never change, so they are shared with the copy.
+
+        Returns:
+            BitboardPosition: The copy of the position.
+        """
+        position = BitboardPosition(self.rules)
+        position.pieces = {color: dict(pieces) for color, pieces in self.pieces.items()}
+        position.occupancy = dict(self.occupancy)
+        position.occupied = self.occupied
+        position.mailbox = list(self.mailbox)
+        position.material = self.material
+        return position
+
+    def slider_attacks(self, square: int, directions: list[tuple[int, int]], occupied: int) -> int:
+        """
+        Computes the squares attacked by a slider, which stops at the first piece met on each ray.
+
+        The first piece of a ray is its lowest or highest bit depending on the direction,
+        and the squares behind it are the ones of the ray starting from this piece.
+
+        Parameters:
+            square (int): The index of the slider's square.
+            directions (list[tuple[int, int]]): The directions of the slider.
+            occupied (int): The mask of the squares occupied by any piece.
+
+        Returns:
+            int: The mask of the attacked squares, the first piece of each ray included.
+        """
+        rays = self.masks.rays
+        increasing = self.masks.increasing
+        attacks = 0
+        for direction in directions:
+            ray = rays[direction][square]
+            blockers = ray & occupied
+            if blockers:
+                first = (blockers & -blockers).bit_length() - 1 if increasing[direction] else blockers.bit_length() - 1
+                ray ^= rays[direction][first]
+            attacks |= ray
+        return attacks
+
+    def attacks_from(self, notation: str, color: int, square: int, occupied: int) -> int:
+        """
+        Computes the squares attacked by a piece standing on a square.
+
+        Parameters:
+            notation (str): The notation of the piece.
+            color (int): The color of the piece, which matters for the pawns.
+            square (int): The index of the piece's square.
+            occupied (int): The mask of the squares occupied by any piece.
+
+        Returns:
+            int: The mask of the attacked squares.
+        """
+        if notation == "P":
+            return self.masks.pawn[color][square]
+        if notation == "N":
+            return self.masks.knight[square]
+        if notation == "K":
+            return self.masks.king[square]
+        if notation == "B":
+            return self.slider_attacks(square, bishop_directions, occupied)
+        if notation == "R":
+            return self.slider_attacks(square, rook_directions, occupied)
+        return self.slider_attacks(square, queen_directions, occupied)
+
+    def attackers(self, square: int, by_color: int, occupied: int = None) -> int:
+        """
+        Finds the pieces of a color attacking a square.
+
+        Instead of generating the moves of the attacking player, the attacks of each type of piece
+        are computed from the square and intersected with the pieces of this type. The occupancy
+        can be given to test a position where some pieces have moved: the pieces whose square is
+        not occupied are ignored.
+
+        Parameters:
+            square (int): The index of the square.
+            by_color (int): The color of the attacking pieces (1 for white, -1 for black).
+            occupied (int, optional): The mask of the occupied squares. Defaults to the current one.
+
+        Returns:
+            int: The mask of the squares of the attacking pieces.
+        """
+        if occupied is None:
+            occupied = self.occupied
+        masks = self.masks
+        pieces = self.pieces[by_color]
+        # A pawn attacks the square if a pawn of the other color would attack the pawn from it
+        attackers = (masks.knight[square] & pieces["N"]) | (masks.king[square] & pieces["K"]) | (masks.pawn[-by_color][square] & pieces["P"])
+        rooks = pieces["R"] | pieces["Q"]
+        if rooks:
+            attackers |= self.slider_attacks(square, rook_directions, occupied) & rooks
+        bishops = pieces["B"] | pieces["Q"]
+        if bishops:
+            attackers |= self.slider_attacks(square, bishop_directions, occupied) & bishops
+        return attackers & occupied
+
+    def is_attacked(self, square: int, by_color: int, occupied: int = None) -> bool:
+        """
+        Determines whether a square is attacked by any piece of the given color.
+
+        Parameters:
+            square (int): The index of the square.
+            by_color (int): The color of the attacking pieces (1 for white, -1 for black).
+            occupied (int, optional): The mask of the occupied squares. Defaults to the current one.
+
+        Returns:
+            bool: True if at least one piece of the given color attacks the square, False otherwise.
+        """
+        return self.attackers(square, by_color, occupied) != 0
+
+    def has_non_pawn_material(self, color: int) -> bool:
+        """
+        Determines whether a player has pieces other than pawns and king.
+
+        A player with only pawns and a king often has no move which does not worsen their position
+        (zugzwang), so the search checks its null move pruning in such positions.
+
+        Parameters:
+            color (int): The color of the player.
+
+        Returns:
+            bool: True if the player has a knight, a bishop, a rook or a queen, False otherwise.
+        """
+        pieces = self.pieces[color]
+        return bool(pieces["N"] | pieces["B"] | pieces["R"] | pieces["Q"])
+
+    def is_insufficient_material(self) -> bool:
+        """
+        Determines whether none of the players has enough pieces left to checkmate.
+
+        The material signature is compared with the few drawn ones, without counting the pieces:
+        a king alone, or with a single bishop or knight, against a king alone, or a king and a
+        bishop against a king and a bishop standing on squares of the same color.
+
+        Returns:
+            bool: True if no checkmate is possible, False otherwise.
+        """
+        if self.material in self.masks.insufficient_materials:
+            return True
+        if self.material == self.masks.bishops_material:
+            columns = self.masks.columns
+            white, black = (self.pieces[color]["B"].bit_length() - 1 for color in [1, -1])
+            return (white // columns + white % columns) % 2 == (black // columns + black % columns) % 2
+        return False
+
+    def get_king(self, color: int) -> int | None:
+        """
+        Retrieves the square of the king of a color.
+
+        Parameters:
+            color (int): The color of the king.
+
+        Returns:
+            int | None: The index of the king's square, or None if there is no king (in giveaway).
+        """
+        kings = self.pieces[color]["K"]
+        return (kings & -kings).bit_length() - 1 if kings else None
+
+    def is_move_safe(self, color: int, from_square: int, to_square: int, captured_square: int = None) -> bool:
+        """
+        Determines whether a move leaves the king of its player out of check, without playing it.
+
+        The move is simulated on the occupancy only: the moving piece leaves its square and lands
+        on its destination, and the captured piece, if any, stops attacking.
+
+        Parameters:
+            color (int): The color of the moving piece.
+            from_square (int): The index of the square the piece leaves.
+            to_square (int): The index of the square the piece lands on.
+            captured_square (int, optional): The index of the square of the captured piece, which is
+                                             not the destination for an en passant capture.
+
+        Returns:
+            bool: True if the king is not attacked after the move, False otherwise.
+        """
+        king = self.get_king(color)
+        if king is None:
+            return True
+        if king == from_square:
+            king = to_square
+        captured = 1 << captured_square if captured_square is not None else 0
+        occupied = (self.occupied & ~(1 << from_square) & ~captured) | (1 << to_square)
+        # The captured piece can stand on the destination, where it is replaced by the moving piece
+        return self.attackers(king, -color, occupied) & ~captured == 0
+
+    def is_legal(self, color: int, move: int) -> bool:
+        """
+        Determines whether a pseudo-legal move leaves the king of its player out of check, without playing it.
+
+        This is cheaper than generating the legal moves when only a few pseudo-legal moves are searched,
+        such as the captures of the quiescence search or the first moves of a node. A castling move is
+        legal if the king is not in check and does not pass through or land on an attacked square.
+
+        Parameters:
+            color (int): The color of the player making the move.
+            move (int): The move, encoded with `encode_move`.
+
+        Returns:
+            bool: True if the king is not attacked after the move, False otherwise.
+        """
+        from_square, to_square = get_from_square(move), get_to_square(move)
+        if move & CASTLING:
+            side = 1 if to_square > from_square else -1
+            return not self.is_attacked(from_square, -color) and move in self._generate_castling(color, from_square, (side,), True)
+        captured_square = None
+        if move & EN_PASSANT:
+            columns = self.masks.columns
+            captured_square = (from_square // columns) * columns + to_square % columns
+        elif move & CAPTURE:
+            captured_square = to_square
+        return self.is_move_safe(color, from_square, to_square, captured_square)
+
+    def is_pseudo_legal(self, color: int, move: int, ep_square: int = None, castling_sides: list[int] = ()) -> bool:
+        """
+        Determines whether a move can be played in the position, possibly leaving the king in check.
+
+        The moves coming from another position, such as the best move of the transposition table or
+        the killer moves, are checked before being played. Only the moves of the moving piece are generated.
+
+        Parameters:
+            color (int): The color of the player making the move.
+            move (int): The move, encoded with `encode_move`.
+            ep_square (int, optional): The index of the en passant square, if any.
+            castling_sides (list[int]): The sides where the player can castle.
+
+        Returns:
+            bool: True if the move is one of the pseudo-legal moves of the position, False otherwise.
+        """
+        from_square = get_from_square(move)
+        if not self.occupancy[color] >> from_square & 1:
+            return False
+        quiet = is_quiet(move)
+        return move in self.generate_moves(color, ep_square, castling_sides, noisy=not quiet, quiet=quiet, from_squares=1 << from_square)
+
+    def get_pins_and_checkers(self, color: int) -> tuple[dict[int, int], int]:
+        """
+        Finds the pinned pieces of a player and the opponent's pieces checking its king.
+
+        The enemy sliders aligned with the king are found on an empty board, then the pieces
+        standing between each of them and the king are counted: none means a check, a single
+        piece of the player means this piece is pinned.
+
+        Parameters:
+            color (int): The color of the player.
+
+        Returns:
+            tuple: A tuple (pins, checkers) where pins is a dictionary whose keys are the squares of the
+                   pinned pieces and values are the masks of the squares they can still move to (their
+                   pin line, up to the pinning piece), and checkers is the mask of the checking pieces.
+        """
+        king = self.get_king(color)
+        masks = self.masks
+        enemies = self.pieces[-color]
+        between = masks.between[king]
+        checkers = (masks.knight[king] & enemies["N"]) | (masks.pawn[color][king] & enemies["P"])
+        snipers = (self.slider_attacks(king, rook_directions, 0) & (enemies["R"] | enemies["Q"])) | (self.slider_attacks(king, bishop_directions, 0) & (enemies["B"] | enemies["Q"]))
+        pins = {}
+        for sniper in iter_squares(snipers):
+            blockers = between[sniper] & self.occupied
+            if blockers == 0:
+                checkers |= 1 << sniper
+            elif blockers & (blockers - 1) == 0 and blockers & self.occupancy[color]:
+                pins[blockers.bit_length() - 1] = between[sniper] | (1 << sniper)
+        return pins, checkers
+
+    def generate_moves(self, color: int, ep_square: int = None, castling_sides: list[int] = (), legal: bool = False, noisy: bool = True, quiet: bool = True, from_squares: int = -1) -> list[int]:
+        """
+        Generates the moves of a player.
+
+        This is the only move generator of the game, the moves of the pieces are not computed anywhere else.
+        Without `legal`, the moves are pseudo-legal: they can leave the king in check.
+        With `legal`, the pinned pieces and the pieces checking the king are found once, then the targets
+        of each piece are masked with its pin line and, when the king is in check, with the squares where
+        the checking piece can be captured or blocked. Only the king can move out of a double check, to
+        squares which are not attacked once it has left its square. En passant captures are tested with
+        both pawns removed, since they can uncover the king on their row. The rules of the position decide
+        of the rest: in giveaway, there is no castling and the captures are the only legal moves when there
+        is at least one (see `Rules.filter_moves`).
+
+        The captures and promotions (noisy moves) can be generated apart from the other moves (quiet moves),
+        so that a search only generates the quiet moves of a node when the noisy ones did not cause a cutoff.
+
+        Parameters:
+            color (int): The color of the player.
+            ep_square (int, optional): The index of the en passant square, if any.
+            castling_sides (list[int]): The sides where the player can castle, 1 towards the last column
+                                        of the unflipped board and -1 towards the first one.
+            legal (bool): Whether only the legal moves are generated. Defaults to False.
+            noisy (bool): Whether the captures and promotions are generated. Defaults to True.
+            quiet (bool): Whether the other moves are generated. Defaults to True.
+            from_squares (int): The mask of the squares whose pieces are moved. Defaults to every square.
+
+        Returns:
+            list[int]: The moves, encoded with `encode_move`.
+        """
+        rules = self.rules
+        if rules.compulsory_captures and legal and not (noisy and quiet):
+            # Whether a quiet move is legal depends on the captures
+            moves = self.generate_moves(color, ep_square, castling_sides, True, from_squares=from_squares)
+            return [move for move in moves if (quiet if is_quiet(move) else noisy)]
+        masks = self.masks
+        pieces = self.pieces[color]
+        if from_squares != -1:
+            pieces = {notation: mask & from_squares for notation, mask in pieces.items()}
+        allies = self.occupancy[color]
+        enemies = self.occupancy[-color]
+        occupied = self.occupied
+        king = self.get_king(color)
+        pins, checkers = {}, 0
+        targets = ~allies
+        # Every move is legal in giveaway, apart from the compulsory captures
+        check_legality = legal and rules.checks and king is not None
+        if check_legality:
+            pins, checkers = self.get_pins_and_checkers(color)
+            if checkers:
+                checker = checkers.bit_length() - 1
+                # Only the king can escape a double check
+                targets = 0 if checkers & (checkers - 1) else (masks.between[king].get(checker, 0) | checkers)
+        stage_targets = (enemies if noisy else 0) | (~occupied if quiet else 0)
+        moves = []
+
+        # Pawns
+        columns = masks.columns
+        push = -color * columns
+        start_row = masks.rows - 2 if color == 1 else 1
+        last_row = 0 if color == 1 else masks.rows - 1
+        promotions = rules.promotions
+        for square in iter_squares(pieces["P"]):
+            pawn_targets = 0
+            to_square = square + push
+            if 0 <= to_square < masks.rows * columns and not occupied >> to_square & 1:
+                pawn_targets |= 1 << to_square
+                if square // columns == start_row and not occupied >> (to_square + push) & 1:
+                    pawn_targets |= 1 << (to_square + push)
+            pawn_targets |= masks.pawn[color][square] & enemies
+            pawn_targets &= targets & pins.get(square, -1)
+            for to_square in iter_squares(pawn_targets):
+                if enemies >> to_square & 1:
+                    flags = CAPTURE
+                else:
+                    flags = DOUBLE_PUSH if to_square - square == 2 * push else 0
+                promotion_row = to_square // columns == last_row
+                if not (noisy if flags == CAPTURE or promotion_row else quiet):
+                    continue
+                if promotion_row:
+                    moves.extend(encode_move(square, to_square, promotion, flags) for promotion in promotions)
+                else:
+                    moves.append(encode_move(square, to_square, None, flags))
+            # The pawn captured en passant stands next to the capturing pawn
+            if noisy and ep_square is not None and masks.pawn[color][square] >> ep_square & 1:
+                captured_square = (square // columns) * columns + ep_square % columns
+                if enemies >> captured_square & 1 and (not check_legality or (not checkers & (checkers - 1) and self.is_move_safe(color, square, ep_square, captured_square))):
+                    moves.append(encode_move(square, ep_square, None, CAPTURE | EN_PASSANT))
+
+        # Knights and sliders
+        for notation in ("N", "B", "R", "Q"):
+            for square in iter_squares(pieces[notation]):
+                piece_targets = self.attacks_from(notation, color, square, occupied) & targets & stage_targets & pins.get(square, -1)
+                moves.extend(encode_move(square, to_square, None, CAPTURE if enemies >> to_square & 1 else 0) for to_square in iter_squares(piece_targets))
+
+        # Kings, there can be several of them in giveaway
+        for square in iter_squares(pieces["K"]):
+            king_targets = masks.king[square] & ~allies & stage_targets
+            if check_legality:
+                without_king = occupied & ~(1 << square)
+                king_targets = sum(1 << to_square for to_square in iter_squares(king_targets) if not self.is_attacked(to_square, -color, without_king))
+            moves.extend(encode_move(square, to_square, None, CAPTURE if enemies >> to_square & 1 else 0) for to_square in iter_squares(king_targets))
+        if quiet and rules.castling and king is not None and from_squares >> king & 1 and not checkers:
+            moves.extend(self._generate_castling(color, king, castling_sides, check_legality))
+
+        if legal:
+            return rules.filter_moves(moves)
+        return moves
+
+    def _generate_castling(self, color: int, king: int, castling_sides: list[int], legal: bool) -> list[int]:
+        """
+        Generates the castling moves of a player.
+
+        The rook is the outermost piece of the king's row on the side of the castling, and every
+        square between the king, the rook and their destinations must be empty, apart from
+        themselves. When only legal moves are wanted, the king must not pass through or land on
+        an attacked square, the king and the rook being removed from the board.
+
+        Parameters:
+            color (int): The color of the player.
+            king (int): The index of the king's square.
+            castling_sides (list[int]): The sides where the player can castle.
+            legal (bool): Whether the squares crossed by the king are checked.
+
+        Returns:
+            list[int]: The castling moves, encoded with `encode_move`. They go to the rook's square
+                       in Chess960, and to the king's destination otherwise.
+        """
+        columns = self.masks.columns
+        row_start = (king // columns) * columns
+        king_column = king % columns
+        moves = []
+        for side in castling_sides:
+            # The outermost piece of the side must be an allied rook
+            row_pieces = self.masks.rays[(0, side)][king] & self.occupied
+            if not row_pieces:
+                continue
+            rook = row_pieces.bit_length() - 1 if side == 1 else (row_pieces & -row_pieces).bit_length() - 1
+            if not self.pieces[color]["R"] >> rook & 1:
+                continue
+            rook_column = rook % columns
+            dest_king_column = castling_king_column[side]
+            dest_rook_column = dest_king_column - side
+            path = 0
+            for column in range(min(king_column, rook_column, dest_king_column, dest_rook_column), max(king_column, rook_column, dest_king_column, dest_rook_column) + 1):
+                path |= 1 << (row_start + column)
+            if path & self.occupied & ~((1 << king) | (1 << rook)):
+                continue
+            if legal:
+                occupied = self.occupied & ~((1 << king) | (1 << rook))
+                step = 1 if dest_king_column > king_column else -1
+                if any(self.is_attacked(row_start + column, -color, occupied) for column in range(king_column + step, dest_king_column + step, step)):
+                    continue
+            to_square = rook if self.rules.chess960 else row_start + dest_king_column
+            moves.append(encode_move(king, to_square, None, CASTLING))
+        return moves
+
+def create_position(board) -> BitboardPosition:
+    """
+    Creates the bitboards of a board from its tiles.
+
+    Parameters:
+        board (Board): The board whose pieces are stored.
+
+    Returns:
+        BitboardPosition: The position of the board.
+    """
+    position = BitboardPosition(board.rules)
+    for pos, tile in board.board.items():
+        if tile.piece is not None:
+            position.add_piece(tile.piece.color, tile.piece.notation, get_square(pos, board.flipped))
+    return position
@@ -1,21 +1,22 @@
+from copy import copy
 from random import choice
 from math import ceil
 
-import pygame
-import numpy as np
-
-from src.gui import Label
 from src.config import config
 from src.board.tile import Tile
 from src.board.player import Player
-from src.ia.negamax import NegamaxAI
 from src.board.move import Move, MoveTree
+from src.board.rules import Rules, create_rules
+from src.board.evaluation import compute_evaluation, piece_score
+from src.board.bitboard import BitboardPosition, create_position, get_pos
+from src.board.move_encoding import decode_move, get_from_square, get_to_square, EN_PASSANT, CASTLING
+from src.board.zobrist import compute_hash, piece_key, en_passant_key, get_zobrist_keys, get_square
 from src.constants import castling_king_column, en_passant_direction, Fonts, Colors
 from src.board.piece import notation_to_piece, piece_to_notation, piece_to_num
-from src.utils import generate_piece_images, generate_board_image, generate_sounds, flip_pos, play_sound
+from src.utils import flip_pos, sign, play_sound
 
 class Board:
-    def __init__(self, current_player: Player, waiting_player: Player, fen: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"):
+    def __init__(self, current_player: Player, waiting_player: Player, fen: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", rules: Rules = None):
         """
         Initializes the Board object, setting up the chessboard, players, and game state.
         Parameters:
@@ -23,7 +24,11 @@ class Board:
             waiting_player (Player): The player waiting for their turn.
             fen (str): The FEN (Forsyth-Edwards Notation) string representing the initial state of the board.
                        Defaults to the standard starting position.
+            rules (Rules, optional): The rules of the game. Defaults to the rules enabled in the configuration
+                                     when the board is created.
         Attributes:
+            rules (Rules): The rules of the game, resolved once from the configuration so that the moves
+                           are generated and played without reading it.
             board (dict): A dictionary representing the chessboard and its tiles.
             selected (Tile | None): The currently selected tile on the board, if any.
             turn (int): The current turn number.
@@ -39,17 +44,32 @@ class Board:
             waiting_player (Player): The player waiting for their turn.
             castling (dict): A dictionary tracking castling rights for both players.
             score (int): The current evaluation score of the board.
-            negamax (NegamaxAI): The AI engine used to evaluate the board.
+            hash (int): The Zobrist hash of the position, updated at each move.
+            evaluation (float): The material and heatmap evaluation of the position, updated at each move.
+                                Positive when white is better, negative when black is better.
+            position (BitboardPosition): The pieces stored as bitboards, updated at each move, on which
+                                         the moves are generated and the attacks are detected.
+            legal_moves (list[int]): The legal moves of the current player, encoded with `encode_move`,
+                                     shared by the consumers of the same position (see `get_legal_move_codes`).
+            legal_moves_hash (int | None): The hash of the position of `legal_moves`, None if they are outdated.
+            hash_history (list[int]): The hashes of the positions of the game, from the first one to the
+                                      current one, pushed and popped as the moves are played and undone.
+            hash_counts (dict): A dictionary where keys are the hashes of `hash_history` and values are
+                                the number of times they occur in it, used to detect the repetitions.
+                                It only counts the positions since the last null move (see `make_null_move`).
             checks (dict): Tracks the number of checks for each player (used in "+3_checks" rule).
-                           Only initialized if the "+3_checks" rule is enabled in the configuration.
-            image: The visual representation of the chessboard.
-            piece_images: The images of the chess pieces, adjusted for board orientation.
-            sounds: The sound effects used during the game.
+                           Only initialized if the rules count the checks.
+            headless (bool): Whether the board has no images and sounds, which is the case until
+                             `attach_assets` is called. A headless board does not need pygame.
+            image: The visual representation of the chessboard, None if the board is headless.
+            piece_images: The images of the chess pieces, adjusted for board orientation, None if the board is headless.
+            sounds: The sound effects used during the game, None if the board is headless.
             move_tree (MoveTree): The tree structure used to manage possible moves.
             history_change (bool): Indicates whether the game history has changed.
             history (list): A list of moves made during the game.
         """
         # Initialize board attributes
+        self.rules = rules if rules is not None else create_rules()
         self.board = {}
         self.selected = None
         self.turn = 1
@@ -65,16 +85,23 @@ class Board:
         self.waiting_player = waiting_player
         self.castling = {1: {1: False, -1: False}, -1: {1: False, -1: False}}
         self.score = 0
-        self.negamax = NegamaxAI(0, 0)
+        self.hash = 0
+        self.evaluation = 0
+        self.position = BitboardPosition(self.rules)
+        self.legal_moves = []
+        self.legal_moves_hash = None
+        self.hash_history = []
+        self.hash_counts = {}
 
         # Anarchy chess
-        if config.rules["+3_checks"] == True:
+        if self.rules.counts_checks:
             self.checks = {1: 0, -1: 0}
 
-        # Load resources
-        self.image = generate_board_image()
-        self.piece_images = generate_piece_images(self.flipped)
-        self.sounds = generate_sounds()
+        # Resources are only loaded by the game's scene, see attach_assets
+        self.headless = True
+        self.image = None
+        self.piece_images = None
+        self.sounds = None
 
         # Initialize the board from the FEN string
         self.move_tree = MoveTree(self)
@@ -83,25 +110,24 @@ class Board:
         self.history = []
         self._create_board(fen)
 
-        # IA plays first if the white player is an IA
-        if self.current_player.ia == True:
-            self.current_player.play_move(self)
-
     def _create_board(self, fen: str) -> None:
         """
         Initializes the chess board state based on the provided FEN (Forsyth-Edwards Notation) string.
         This method sets up the board tiles, pieces, turn, castling rights, en passant target square, 
         half-move clock, and full-move number. It also supports Chess960 (Fischer Random Chess) 
-        if enabled in the configuration. If the FEN string is invalid, an exception is raised.
+        if enabled in the rules of the board. If the FEN string is invalid, an exception is raised.
         Parameters:
             fen (str): A string in FEN format that describes the initial state of the chess board.
         Raises:
             ValueError: If the FEN string is invalid or cannot be parsed.
         """
         self.board = {(r, c): Tile((r, c)) for r in range(config.rows) for c in range(config.columns)}
+        # The players can come from a previous board
+        self.current_player.clear_pieces()
+        self.waiting_player.clear_pieces()
         try:
             # Chess960 row generation
-            if config.rules["chess960"] == True:
+            if self.rules.chess960 and self.rules.shuffled_start:
                 fen = self._transform_960_fen(fen)
 
             fen_parts = fen.split()
@@ -115,7 +141,11 @@ class Board:
             self.ep = self._parse_en_passant(fen_parts[3])
             self.half_moves = int(fen_parts[4])
             self.full_moves = int(fen_parts[5])
-            play_sound(self.sounds, "game-start")
+            self.hash = compute_hash(self)
+            self.evaluation = compute_evaluation(self)
+            self.position = create_position(self)
+            self.hash_history = [self.hash]
+            self.hash_counts = {self.hash: 1}
         except (IndexError, ValueError) as e:
             raise ValueError(f"Failed to parse FEN string: {fen}. Error: {e}")
 
@@ -124,15 +154,14 @@ class Board:
         Initializes the chess pieces on the board based on the given board notation.
         This function parses a board representation string in Forsyth-Edwards Notation (FEN) format 
         for the piece placement section and sets up the board with the appropriate pieces. It also 
-        assigns images to the pieces if the configuration specifies a visual representation and 
-        tracks the position of the kings for each player.
+        tracks the position of the kings for each player. The images of the pieces are assigned
+        by `attach_assets`.
         Args:
             board_part (str): A string representing the piece placement on the board in FEN format. 
                               Each row is separated by a forward slash ('/'), and empty squares are 
                               denoted by numbers.
         Raises:
-            ValueError: If an invalid piece notation is encountered or if a required piece image 
-                        is missing from the configuration.
+            ValueError: If an invalid piece notation is encountered.
         """
         for r, row in enumerate(board_part.split("/")):
             c = 0
@@ -146,12 +175,7 @@ class Board:
                     if not piece_type:
                         raise ValueError(f"Invalid piece notation: {char}")
                     piece = piece_type(color)
-                    if config.piece_asset != "blindfold":
-                        piece_image_key = f"{(('w' if color == 1 else 'b') if config.piece_asset != "mono" else "")}{char.upper()}"
-                        if piece_image_key not in self.piece_images:
-                            raise ValueError(f"Missing piece image for: {piece_image_key}")
-                        piece.image = self.piece_images[piece_image_key]
-                    self.get_player(color).add_piece(piece)
+                    self.get_player(color).add_piece(piece, get_square((r, c), self.flipped))
                     tile.piece = piece
                     self.board[(r, c)] = tile
 
@@ -292,38 +316,54 @@ class Board:
         (e.g., "king of the hill", "+3 checks", "giveaway"), stalemates, draws 
         (e.g., 50-move rule, insufficient material, threefold repetition), and 
         determines the winner or if the game ends in a draw.
+        It is called after every move, so each condition is cheap: the pieces are counted
+        with the material signature and the occupancy of the bitboards, and the legal moves
+        are the ones already generated for the notation of the move (see `get_legal_move_codes`).
         """
-        if config.rules["king_of_the_hill"] == True and self.waiting_player.king in self.get_center():
-            self.winner = "Black" if self.turn == 1 else "White"
-        elif config.rules["+3_checks"] == True and self.checks[-self.turn] >= 3:
-            self.winner = "Black" if self.turn == 1 else "White"
-        elif config.rules["giveaway"] == True and self.waiting_player.pieces == {}:
-            self.winner = "Black" if self.turn == 1 else "White"
-        elif self.is_stalemate():
-            if self.current_player.is_king_check(self) or config.rules["giveaway"] == True:
-                self.winner = "Black" if self.turn == 1 else "White"
-            else:
-                self.winner = "Stalemate"
-        elif self.half_moves >= 100:
-            self.winner = "Draw by the 50-move rule"
-        elif self.is_insufficient_material():
-            self.winner = "Draw by insufficient material"
-        elif self.is_threefold_repetition():
-            self.winner = "Draw by threefold repetition"
+        self.winner = self.get_game_result()
         if self.winner is not None:
             self.game_over = True
             play_sound(self.sounds, "game-end")
 
+    def get_game_result(self) -> str | None:
+        """
+        Determines the result of the game in the current position, in a single pass over the end conditions.
+
+        The conditions are tested in the order of the rules, and the first one met gives the result.
+        The player who has just moved wins the variants' conditions and the checkmates.
+
+        Returns:
+            str | None: "White" or "Black" for the winner, the kind of draw, or None if the game goes on.
+        """
+        last_mover = "Black" if self.turn == 1 else "White"
+        if self.rules.has_won(self):
+            return last_mover
+        if not self.get_legal_move_codes():
+            if self.rules.is_lost_without_moves(self):
+                return last_mover
+            return "Stalemate"
+        if self.half_moves >= 100:
+            return "Draw by the 50-move rule"
+        if self.is_insufficient_material():
+            return "Draw by insufficient material"
+        if self.is_threefold_repetition():
+            return "Draw by threefold repetition"
+        return None
+
     def is_threefold_repetition(self):
         """
         Determines if the current board position has occurred at least three times,
         indicating a threefold repetition, which is a condition for a draw in chess.
 
+        The number of occurrences of each position is kept up to date by `make_move` and `unmake_move`,
+        so the check does not depend on the length of the game. The positions played before the last
+        irreversible move are counted as well, but none of them can occur again: the hash of a position
+        includes its pieces, castling rights and en passant square.
+
         Returns:
         bool: True if a threefold repetition is detected, False otherwise.
         """
-        positions = [move.fen.split(" ")[:4] for move in self.move_tree.get_root_to_leaf()[self.last_irreversible_move:]]
-        return any(positions.count(pos) >= 3 for pos in positions)
+        return self.hash_counts.get(self.hash, 0) >= 3
 
     def is_stalemate(self):
         """
@@ -336,16 +376,41 @@ class Board:
         Returns:
             bool: True if the game is in a stalemate, False otherwise.
         """
-        return len(self.current_player.get_legal_moves(self)) == 0
+        return len(self.get_legal_move_codes()) == 0
     
+    def get_legal_move_codes(self) -> list[int]:
+        """
+        Retrieves the legal moves of the current player, generating them once per position.
+
+        A single move played in the game needs the legal moves several times: to highlight the moves
+        of the selected piece, to write the check or checkmate of its notation and to check the end of
+        the game. The moves are kept with the hash of their position, so they are generated again
+        only when the position changes, a move played and undone finding them back. Flipping the board
+        changes the castling sides without changing the hash, so it clears them (see `clear_legal_moves`).
+
+        Returns:
+            list[int]: The legal moves, encoded with `encode_move`. The list must not be modified.
+        """
+        if self.legal_moves_hash != self.hash:
+            self.legal_moves = self.current_player.get_move_codes(self)
+            self.legal_moves_hash = self.hash
+        return self.legal_moves
+
+    def clear_legal_moves(self) -> None:
+        """
+        Forgets the legal moves kept by `get_legal_move_codes`, so that they are generated again.
+        """
+        self.legal_moves = []
+        self.legal_moves_hash = None
+
     def is_insufficient_material(self):
         """
         Determines if the current board state constitutes insufficient material 
         to checkmate, which would result in a draw according to chess rules.
 
-        This function checks the number and type of pieces remaining on the board 
-        to identify scenarios where checkmate is impossible. The conditions checked 
-        include:
+        This function compares the material signature of the position, kept up to date
+        at each move, with the ones where checkmate is impossible (see
+        `BitboardPosition.is_insufficient_material`). The conditions checked include:
         - Only kings remain on the board.
         - One side has a king and a single bishop or knight.
         - Both sides have a king and a bishop, and the bishops are on squares of 
@@ -355,47 +420,35 @@ class Board:
             bool: True if the board state represents insufficient material to 
             checkmate, otherwise False.
         """
-        piece_count = self.count_pieces()
-        # Only kings remain
-        if piece_count == 2:
-            return True  
-        if piece_count == 3:
-            return any(
-                len(self.get_player(color).pieces.get("B")) == 1 or
-                len(self.get_player(color).pieces.get("K")) == 1
-                for color in [-1, 1]
-            )
-        if piece_count == 4:
-            if all(len(self.get_player(color).pieces.get("B")) == 1 for color in [-1, 1]):
-                square_colors = [self.find_tile("B", color).get_square_color() for color in [-1, 1]]
-                if square_colors[0] == square_colors[1]:
-                    return True
-        return False
+        return self.position.is_insufficient_material()
     
     def count_pieces(self):
         """
         Counts the total number of pieces currently on the board.
 
-        This method iterates through all the tiles on the board and checks if a piece is present on each tile.
-        It returns the total count of tiles that have a piece.
+        The pieces of each player are indexed by type and square, so they are counted
+        without going through the tiles of the board.
 
         Returns:
             int: The total number of pieces on the board.
         """
-        return sum(1 for tile in self.board.values() if tile.piece is not None)
+        return self.current_player.count_pieces() + self.waiting_player.count_pieces()
     
     def find_tile(self, notation, color):
         """
         Finds and returns a tile on the board that contains a piece matching the specified notation and color.
 
+        The tile is found from the pieces of the player, indexed by type and square.
+
         Parameters:
             notation (str): The notation of the piece to search for (e.g., 'K' for King, 'Q' for Queen).
-            color (str): The color of the piece to search for (e.g., 'white', 'black').
+            color (int): The color of the piece to search for (1 for white, -1 for black).
 
         Returns:
             Tile: The tile object containing the piece that matches the given notation and color, or None if no such tile exists.
         """
-        return next((tile for tile in self.board.values() if tile.piece and tile.piece.notation == notation and tile.piece.color == color), None)
+        square = next(iter(self.get_player(color).pieces[notation]), None)
+        return self.get_tile(get_pos(square, self.flipped)) if square is not None else None
     
     def convert_to_move(self, from_pos, to_pos, promotion=None):
         """
@@ -466,29 +519,55 @@ class Board:
         """
         return self.get_piece(pos) is None
 
-    def _update_castling(self, move: Move):
+    def _update_castling(self, piece, from_pos: tuple[int, int], to_pos: tuple[int, int], captured) -> list[tuple[int, int]]:
         """
         Updates the castling rights based on the given move.
 
-        This function modifies the castling rights for the current player
-        depending on the type of piece that is moved and its position. If a King
-        moves, all castling rights for that player are reset. If a Rook moves,
-        the castling rights for the corresponding side (king-side or queen-side)
-        are updated.
+        This function modifies the castling rights depending on the type of piece that
+        is moved and its position. If a King moves, all castling rights for that player
+        are removed. If a Rook moves, or if a Rook is captured, the castling rights for
+        the corresponding side (king-side or queen-side) are removed. The hash of the
+        board is updated accordingly.
 
         Parameters:
-            move (Move): An object representing the move being made. It contains
-                         information about the moving piece, its starting position,
-                         and its destination.
+            piece (Piece): The piece being moved.
+            from_pos (tuple[int, int]): The starting position of the move.
+            to_pos (tuple[int, int]): The destination position of the move.
+            captured (Piece | None): The piece being captured, if any.
+
+        Returns:
+            list[tuple[int, int]]: The (color, side) castling rights removed by the move,
+                                   so that they can be restored when the move is undone.
         """
-        piece = move.moving_piece
+        removed = []
         if piece.notation == "K":
-            # If the King moves, reset castling rights for that player
-            self.castling[piece.color] = {1: False, -1: False}
-        elif piece.notation == "R":
-            # If the Rook moves, update the castling rights for that rook's side
-            side = 1 if move.from_pos[1] > self.current_player.king[1] else -1
-            self.castling[piece.color][side] = False
+            # If the King moves, remove castling rights for that player
+            removed.extend((piece.color, side) for side in [1, -1])
+        elif piece.notation == "R" and from_pos[0] == self.current_player.king[0]:
+            # If the Rook moves, remove the castling right for that rook's side
+            removed.append((piece.color, 1 if from_pos[1] > self.current_player.king[1] else -1))
+        # If a Rook is captured, the opponent can no longer castle on that side
+        king = self.waiting_player.king
+        if captured is not None and captured.notation == "R" and captured.is_enemy(piece) and king is not None and to_pos[0] == king[0]:
+            removed.append((captured.color, 1 if to_pos[1] > king[1] else -1))
+        removed = [(color, side) for color, side in removed if self.castling[color][side]]
+        keys = get_zobrist_keys()
+        for color, side in removed:
+            self.castling[color][side] = False
+            self.hash ^= keys.castling[(color, side)]
+        return removed
+
+    def _restore_castling(self, removed: list[tuple[int, int]]) -> None:
+        """
+        Gives back castling rights removed by a move that is undone.
+
+        Parameters:
+            removed (list[tuple[int, int]]): The (color, side) castling rights returned by `_update_castling`.
+        """
+        keys = get_zobrist_keys()
+        for color, side in removed:
+            self.castling[color][side] = True
+            self.hash ^= keys.castling[(color, side)]
 
     def _update_last_irreversible_move(self, move: Move):
         """
@@ -506,7 +585,7 @@ class Board:
         """
         if move.is_capture() or move.moving_piece.notation == "P" or move.castling or self.move_tree.current.castling != self.castling:
             # If the move is a capture, pawn move, castling, or a change in castling rights, mark it as irreversible
-            self.last_irreversible_move = len(self.move_tree.get_root_to_leaf())
+            self.last_irreversible_move = len(self.hash_history) - 1
 
     def _is_valid_en_passant(self, pos: tuple[int, int], ep: tuple[int, int]):
         """
@@ -536,26 +615,366 @@ class Board:
                 return True
         return False
 
-    def _update_en_passant(self, move):
+    def _update_en_passant(self, piece, from_pos: tuple[int, int], to_pos: tuple[int, int]):
         """
         Updates the en passant target square based on the given move.
 
         This function determines whether an en passant target square should be set
-        after a pawn moves two squares forward. If the conditions for en passant
-        are met, the target square is updated accordingly.
+        after a pawn moves two squares forward. The target square is set only if an
+        enemy pawn stands next to the destination of the pawn and could capture it.
 
         Parameters:
-            move (Move): An object representing the move being made. It contains:
-                - from_pos (tuple): The starting position of the move as (row, column).
-                - to_pos (tuple): The ending position of the move as (row, column).
+            piece (Piece): The piece being moved.
+            from_pos (tuple[int, int]): The starting position of the move as (row, column).
+            to_pos (tuple[int, int]): The ending position of the move as (row, column).
+        """
+        ep = None
+        if piece.notation == "P" and abs(from_pos[0] - to_pos[0]) == 2:
+            for d_col in [-1, 1]:
+                pos = (to_pos[0], to_pos[1] + d_col)
+                if not self.in_bounds(pos) or self.is_empty(pos):
+                    continue
+                neighbour = self.get_piece(pos)
+                if neighbour.notation == "P" and neighbour.is_enemy(piece):
+                    ep = ((from_pos[0] + to_pos[0]) // 2, from_pos[1])
+                    break
+        self.set_en_passant(ep)
+
+    def set_en_passant(self, ep: tuple[int, int] | None) -> None:
+        """
+        Sets the en passant target square and updates the hash of the board.
+
+        Parameters:
+            ep (tuple[int, int] | None): The new en passant square, or None if there is none.
         """
-        from_pos, to_pos = move.from_pos, move.to_pos
-        self.ep = None
-        if not self.is_empty(from_pos) and self.get_piece(from_pos).notation == "P" and abs(from_pos[0] - to_pos[0]) == 2:
-            ep = ((from_pos[0] + to_pos[0]) // 2, from_pos[1])
-            if self._is_valid_en_passant((to_pos[0], to_pos[1]), ep):
-                self.ep = ep
-        
+        self.hash ^= en_passant_key(self.ep, self.flipped) ^ en_passant_key(ep, self.flipped)
+        self.ep = ep
+
+    def set_piece(self, pos: tuple[int, int], piece) -> None:
+        """
+        Places a piece on a tile, or empties it, and updates the hash, the evaluation, the bitboards
+        of the board and the pieces of the players.
+
+        The piece previously standing on the tile, if any, is removed from the hash, the
+        evaluation, the bitboards and its player's pieces, and the new one is added to them.
+
+        Parameters:
+            pos (tuple[int, int]): The position (row, column) of the tile.
+            piece (Piece | None): The piece to place on the tile, or None to empty it.
+        """
+        tile = self.board[pos]
+        square = get_square(pos, self.flipped)
+        if tile.piece is not None:
+            self.hash ^= piece_key(tile.piece, pos, self.flipped)
+            self.evaluation -= piece_score(tile.piece, pos, self.flipped)
+            self.position.remove_piece(tile.piece.color, tile.piece.notation, square)
+            self.get_player(tile.piece.color).remove_piece(tile.piece, square)
+        if piece is not None:
+            self.hash ^= piece_key(piece, pos, self.flipped)
+            self.evaluation += piece_score(piece, pos, self.flipped)
+            self.position.add_piece(piece.color, piece.notation, square)
+            self.get_player(piece.color).add_piece(piece, square)
+        tile.piece = piece
+
+    def get_castling_positions(self, from_pos: tuple[int, int], to_pos: tuple[int, int]) -> tuple[tuple[int, int], tuple[int, int], tuple[int, int]]:
+        """
+        Computes the positions of the pieces involved in a castling move.
+
+        Parameters:
+            from_pos (tuple[int, int]): The position of the castling king.
+            to_pos (tuple[int, int]): The destination of the castling move, which is the rook's
+                                      position in Chess960 and the king's destination otherwise.
+
+        Returns:
+            tuple: A tuple (rook_pos, dest_king_pos, dest_rook_pos) containing the starting position
+                   of the rook and the destinations of the king and the rook. It accounts for Chess960
+                   rules, where the rook's initial position may vary.
+        """
+        d = sign(to_pos[1] - from_pos[1])
+        rook_pos = to_pos if self.rules.chess960 else (to_pos[0], (7 if d == 1 else 0))
+        # Destinations columns
+        dest_king_column = flip_pos(castling_king_column[d*self.flipped], flipped=self.flipped)
+        dest_rook_column = dest_king_column - d
+        return rook_pos, (from_pos[0], dest_king_column), (from_pos[0], dest_rook_column)
+
+    def make_move(self, code: int) -> tuple:
+        """
+        Plays an encoded move on the board, updating the board state and handling special rules.
+
+        This is the fast path used by the searches and the perft tool, which play moves encoded with
+        `encode_move` without creating `Move` objects. `Move.move` plays its own code through it.
+
+        Functionality:
+            - Updates the castling rights and the en passant square, saving the previous ones.
+            - Moves the piece, the rook when castling, and removes the captured piece.
+            - Promotes the pawn if the move is a promotion.
+            - Keeps the positions of the kings up to date.
+            - Updates the turn to the next player, swaps the players and resets the selected piece.
+            - Checks for the "+3 checks" rule, and increments the check count for the opponent if applicable.
+            - Keeps the hash of the board up to date, and pushes it on the history of the positions.
+
+        Parameters:
+            code (int): The code of the move, which must be pseudo-legal in the current position.
+
+        Returns:
+            tuple: The information needed by `unmake_move` to undo the move: (code, moving_piece,
+                   captured_piece, previous_ep_square, removed_castling, gave_check).
+        """
+        from_square, to_square, promotion, flags = decode_move(code)
+        from_pos, to_pos = get_pos(from_square, self.flipped), get_pos(to_square, self.flipped)
+        piece = self.board[from_pos].piece
+        captured_pos = (from_pos[0], to_pos[1]) if flags & EN_PASSANT else to_pos
+        captured = None if flags & CASTLING else self.board[captured_pos].piece
+        # Update the castling rights and the en passant square before moving the pieces
+        previous_ep = self.get_ep_square()
+        removed_castling = self._update_castling(piece, from_pos, to_pos, captured) if self.rules.castling else []
+        self._update_en_passant(piece, from_pos, to_pos)
+        if flags & CASTLING:
+            rook_pos, dest_king_pos, dest_rook_pos = self.get_castling_positions(from_pos, to_pos)
+            rook = self.board[rook_pos].piece
+            self.set_piece(from_pos, None)
+            self.set_piece(rook_pos, None)
+            self.set_piece(dest_king_pos, piece)
+            self.set_piece(dest_rook_pos, rook)
+            self.current_player.king = dest_king_pos
+        else:
+            moved = piece
+            if promotion is not None:
+                moved = notation_to_piece(promotion)(piece.color)
+                if not self.headless and config.piece_asset != "blindfold":
+                    moved.image = self.get_piece_image(moved)
+                self.promotion = None
+            if flags & EN_PASSANT:
+                self.set_piece(captured_pos, None)
+            self.set_piece(to_pos, moved)
+            self.set_piece(from_pos, None)
+            if piece.notation == "K":
+                self.current_player.king = to_pos
+            # The king can be captured in giveaway
+            if captured is not None and captured.notation == "K":
+                self.waiting_player.king = None
+        self.turn *= -1
+        self.hash ^= get_zobrist_keys().turn
+        self.selected = None
+        self.current_player, self.waiting_player = self.waiting_player, self.current_player
+        gave_check = self.rules.counts_checks and self.current_player.is_king_check(self)
+        if gave_check:
+            self.checks[self.waiting_player.color] += 1
+        self.hash_history.append(self.hash)
+        self.hash_counts[self.hash] = self.hash_counts.get(self.hash, 0) + 1
+        if config.debug_hash:
+            self.check_hash()
+        return code, piece, captured, previous_ep, removed_castling, gave_check
+
+    def unmake_move(self, undo: tuple) -> None:
+        """
+        Undoes a move played with `make_move`, restoring the board state to what it was before the move.
+
+        The en passant square is saved as the index of its square, so a move can be undone
+        even if the board has been flipped since it was played.
+
+        Parameters:
+            undo (tuple): The tuple returned by `make_move` when the move was played.
+        """
+        code, piece, captured, previous_ep, removed_castling, gave_check = undo
+        from_square, to_square, _, flags = decode_move(code)
+        self.hash_history.pop()
+        if self.hash_counts[self.hash] == 1:
+            del self.hash_counts[self.hash]
+        else:
+            self.hash_counts[self.hash] -= 1
+        self.turn *= -1
+        self.hash ^= get_zobrist_keys().turn
+        self.selected = None
+        self.current_player, self.waiting_player = self.waiting_player, self.current_player
+        if gave_check:
+            self.checks[self.waiting_player.color] -= 1
+        from_pos, to_pos = get_pos(from_square, self.flipped), get_pos(to_square, self.flipped)
+        if flags & CASTLING:
+            rook_pos, dest_king_pos, dest_rook_pos = self.get_castling_positions(from_pos, to_pos)
+            rook = self.board[dest_rook_pos].piece
+            self.set_piece(dest_king_pos, None)
+            self.set_piece(dest_rook_pos, None)
+            self.set_piece(rook_pos, rook)
+            self.set_piece(from_pos, piece)
+        else:
+            captured_pos = (from_pos[0], to_pos[1]) if flags & EN_PASSANT else to_pos
+            self.set_piece(from_pos, piece)
+            if flags & EN_PASSANT:
+                self.set_piece(to_pos, None)
+            self.set_piece(captured_pos, captured)
+            # The king can be captured in giveaway
+            if captured is not None and captured.notation == "K":
+                self.waiting_player.king = captured_pos
+        if piece.notation == "K":
+            self.current_player.king = from_pos
+        self.set_en_passant(get_pos(previous_ep, self.flipped) if previous_ep is not None else None)
+        self._restore_castling(removed_castling)
+        if config.debug_hash:
+            self.check_hash()
+
+    def make_null_move(self) -> tuple:
+        """
+        Passes the turn to the opponent without moving any piece, for the null move pruning of the search.
+
+        Only the turn, the players and the en passant square change. The position is pushed on the history
+        of the positions, as after a move, so that `unmake_null_move` can pop it. The null move is not a
+        move of the game, so the repetitions are counted again from the position after it: a position
+        met after the null move is not a repetition of one met before it.
+
+        Returns:
+            tuple: The index of the en passant square and the counts of the positions before the null move,
+                   needed by `unmake_null_move`.
+        """
+        previous_ep = self.get_ep_square()
+        self.set_en_passant(None)
+        self.turn *= -1
+        self.hash ^= get_zobrist_keys().turn
+        self.current_player, self.waiting_player = self.waiting_player, self.current_player
+        self.hash_history.append(self.hash)
+        hash_counts = self.hash_counts
+        self.hash_counts = {self.hash: 1}
+        return previous_ep, hash_counts
+
+    def unmake_null_move(self, undo: tuple) -> None:
+        """
+        Undoes a null move played with `make_null_move`.
+
+        Parameters:
+            undo (tuple): The tuple returned by `make_null_move` when the null move was played.
+        """
+        previous_ep, self.hash_counts = undo
+        self.hash_history.pop()
+        self.turn *= -1
+        self.hash ^= get_zobrist_keys().turn
+        self.current_player, self.waiting_player = self.waiting_player, self.current_player
+        self.set_en_passant(get_pos(previous_ep, self.flipped) if previous_ep is not None else None)
+
+    def code_to_move(self, code: int) -> Move:
+        """
+        Converts an encoded move into a Move object, to play it with `Move.execute`.
+
+        Parameters:
+            code (int): The code of the move, encoded with `encode_move`.
+
+        Returns:
+            Move: An instance of the Move class representing the move.
+        """
+        from_square, to_square, promotion, _ = decode_move(code)
+        return Move(self, get_pos(from_square, self.flipped), get_pos(to_square, self.flipped), notation_to_piece(promotion) if promotion is not None else None)
+
+    def get_square(self, pos: tuple[int, int]) -> int:
+        """
+        Converts a position of the board into the index of its square in the bitboards.
+
+        Parameters:
+            pos (tuple[int, int]): The position (row, column) on the board.
+
+        Returns:
+            int: The index of the square, which does not change when the board is flipped.
+        """
+        return get_square(pos, self.flipped)
+
+    def get_pos(self, square: int) -> tuple[int, int]:
+        """
+        Converts the index of a square in the bitboards into a position of the board.
+
+        Parameters:
+            square (int): The index of the square.
+
+        Returns:
+            tuple[int, int]: The position (row, column) on the board.
+        """
+        return get_pos(square, self.flipped)
+
+    def get_castling_sides(self, color: int) -> list[int]:
+        """
+        Retrieves the sides where a player still has the right to castle, seen from white's side.
+
+        The castling rights are stored as directions of the displayed board, so they are turned
+        into sides of the unflipped board for the bitboards.
+
+        Parameters:
+            color (int): The color of the player.
+
+        Returns:
+            list[int]: The sides, 1 towards the last column of the unflipped board and -1 towards the first one.
+        """
+        return [direction * self.flipped for direction in [1, -1] if self.castling[color][direction]]
+
+    def get_ep_square(self) -> int | None:
+        """
+        Retrieves the index of the en passant square in the bitboards.
+
+        Returns:
+            int | None: The index of the en passant square, or None if there is none.
+        """
+        return get_square(self.ep, self.flipped) if self.ep is not None else None
+
+    def check_hash(self) -> None:
+        """
+        Checks that the incremental hash, evaluation, bitboards and pieces of the board match the ones computed from scratch.
+
+        This is only used when `config.debug_hash` is enabled, to find the moves which
+        forget to update the hash, the evaluation, the bitboards or the pieces of the players.
+
+        Raises:
+            ValueError: If the incremental hash, evaluation, bitboards or pieces differ from the recomputed ones.
+        """
+        expected = compute_hash(self)
+        if self.hash != expected:
+            raise ValueError(f"Incremental hash {self.hash:#018x} differs from recomputed hash {expected:#018x} for {str(self)}")
+        expected_evaluation = compute_evaluation(self)
+        if abs(self.evaluation - expected_evaluation) > 1e-6:
+            raise ValueError(f"Incremental evaluation {self.evaluation} differs from recomputed evaluation {expected_evaluation} for {str(self)}")
+        if self.hash_history[-1] != self.hash:
+            raise ValueError(f"The last hash of the history {self.hash_history[-1]:#018x} differs from the hash {self.hash:#018x} for {str(self)}")
+        expected_position = create_position(self)
+        if self.position.pieces != expected_position.pieces or self.position.material != expected_position.material:
+            raise ValueError(f"Incremental bitboards differ from recomputed bitboards for {str(self)}")
+        for color in [1, -1]:
+            expected_pieces = {notation: {} for notation in self.get_player(color).pieces}
+            for pos, tile in self.board.items():
+                if tile.piece is not None and tile.piece.color == color:
+                    expected_pieces[tile.piece.notation][get_square(pos, self.flipped)] = tile.piece
+            if self.get_player(color).pieces != expected_pieces:
+                raise ValueError(f"Incremental pieces of the player {color} differ from the pieces on the board for {str(self)}")
+
+    def copy(self) -> "Board":
+        """
+        Copies the position of the board into a headless board, on which an AI can search apart from the interface.
+
+        The copy has its own tiles, players, bitboards, castling rights and history of the positions, so the
+        moves played on it do not change the board, and the moves played on the board do not change it. The
+        pieces themselves are shared, since playing a move moves them without changing them. The images, the
+        sounds, the tree of the moves and the labels of the history are left out.
+
+        Returns:
+            Board: A headless board in the same position, with the same rules.
+        """
+        board = copy(self)
+        board.board = {}
+        for pos, tile in self.board.items():
+            board.board[pos] = Tile(pos)
+            board.board[pos].piece = tile.piece
+        board.current_player = self.current_player.copy()
+        board.waiting_player = self.waiting_player.copy()
+        board.castling = {color: dict(sides) for color, sides in self.castling.items()}
+        board.position = self.position.copy()
+        board.legal_moves = list(self.legal_moves)
+        board.hash_history = list(self.hash_history)
+        board.hash_counts = dict(self.hash_counts)
+        if self.rules.counts_checks:
+            board.checks = dict(self.checks)
+        board.selected = None
+        board.headless = True
+        board.image = None
+        board.piece_images = None
+        board.sounds = None
+        board.move_tree = MoveTree(board)
+        board.history = []
+        return board
+
     def select(self, pos: tuple[int, int]):
         """
         Handles the selection and movement of pieces on the chessboard.
@@ -601,8 +1020,8 @@ class Board:
         """
         if self.selected.piece.notation == "P" and self.promotion is not None:
             d = self.selected.piece.color * self.flipped
-            if pos[0] in range(flip_pos(0, flipped=d), flip_pos(0, flipped=d) + d*len(self.selected.piece.promotion), d) and pos[1] == self.promotion[1]:
-                self.convert_to_move(self.selected.pos, self.promotion, self.selected.piece.promotion[flip_pos(pos[0], flipped=d)]).execute(self)
+            if pos[0] in range(flip_pos(0, flipped=d), flip_pos(0, flipped=d) + d*len(self.rules.promotions), d) and pos[1] == self.promotion[1]:
+                self.convert_to_move(self.selected.pos, self.promotion, self.rules.promotion_pieces[flip_pos(pos[0], flipped=d)]).execute(self)
                 return True
             # Cancel promotion if the player doesn't click in the range of promotion
             self.promotion = None
@@ -628,7 +1047,7 @@ class Board:
         """
         if not self.is_empty(pos) and self.get_piece(pos).is_ally(self.selected.piece) and pos != self.selected.pos:
             # Castling move
-            if self.selected.piece.notation == "K" and not self.is_empty(pos) and self.get_piece(pos).notation == "R" and pos in self.selected.calc_moves(self):
+            if self.selected.piece.notation == "K" and not self.is_empty(pos) and self.get_piece(pos).notation == "R" and pos in [move.to_pos for move in self.selected.piece.moves]:
                 self.convert_to_move(self.selected.pos, pos).execute(self)
                 return True
             self.selected = None
@@ -721,26 +1140,22 @@ class Board:
         """
         Filters the possible moves for a given tile based on the current game rules.
 
-        This function generates a list of valid moves for the piece on the specified tile,
-        applying additional filtering based on the game mode and rules. For example, in
-        "giveaway" mode, the function prioritizes capture moves if no capture moves are
-        available for the current player.
+        This function retrieves the legal moves of the piece on the specified tile from the
+        legal moves of the position (see `get_legal_move_codes`), which already apply the
+        rules of the game mode, such as the compulsory captures of "giveaway". A pawn reaching
+        the last row gives a single move, the piece it is promoted to is chosen afterwards.
 
         Parameters:
             tile (Tile): The tile object containing the piece for which moves are being calculated.
-                         The tile must have a `pos` attribute representing its position and a `piece`
-                         attribute with a `calc_moves` method to calculate potential moves.
+                         The tile must have a `pos` attribute representing its position.
 
         Returns:
             list[Move]: A list of filtered Move objects that are valid for the current game state.
         """
-        moves = [self.convert_to_move(tile.pos, move) for move in tile.piece.calc_moves(self, tile.pos)]
-        if config.rules["giveaway"] == True:
-            if len([move for move in self.current_player.get_moves(self) if move.is_capture()]) != 0:
-                return [move for move in moves if move.is_capture()]
-            return [move for move in moves if not move.castling]
-        else:
-            return [move for move in moves if move.is_legal(self)]
+        square = self.get_square(tile.pos)
+        # The promotions of a pawn share their destination
+        to_squares = dict.fromkeys(get_to_square(code) for code in self.get_legal_move_codes() if get_from_square(code) == square)
+        return [self.convert_to_move(tile.pos, self.get_pos(to_square)) for to_square in to_squares]
 
     def in_bounds(self, pos: tuple[int, int]) -> bool:
         """
@@ -754,6 +1169,23 @@ class Board:
             bool: True if the position is within the bounds of the board, False otherwise.
         """
         return self.get_tile(pos) is not None
+
+    def is_square_attacked(self, pos: tuple[int, int], by_color: int) -> bool:
+        """
+        Determines whether a square is attacked by any piece of the given color.
+
+        Instead of generating every move of the attacking player, the attacks of each type of piece
+        are computed from the square on the bitboards (see `BitboardPosition.attackers`). The square
+        itself may be empty or occupied by any piece.
+
+        Parameters:
+            pos (tuple[int, int]): The position (row, column) of the square.
+            by_color (int): The color of the attacking pieces (1 for white, -1 for black).
+
+        Returns:
+            bool: True if at least one piece of the given color attacks the square, False otherwise.
+        """
+        return self.position.is_attacked(get_square(pos, self.flipped), by_color)
     
     def flip_board(self) -> None:
         """
@@ -767,6 +1199,7 @@ class Board:
         positional attributes are correctly flipped.
 
         - Flips the board tiles and updates the flipped state.
+        - Forgets the legal moves of the position, whose castling sides depend on the flipped state.
         - Clears the highlight of the selected piece and resets the selection.
         - Resets any ongoing promotion state.
         - Flips the positions of the kings for both players.
@@ -774,9 +1207,11 @@ class Board:
         - Flips the move tree to maintain consistency with the flipped board.
         - Regenerates piece images if flipped assets are enabled in the configuration.
         - Flips the visual representation of the board image.
+        The last two steps are skipped if the board is headless.
         """
         self._flip_board_tiles()
         self.flipped *= -1
+        self.clear_legal_moves()
         # Remove the highlight of the selected piece
         if self.selected is not None:
             self.selected.highlight_color = None
@@ -785,12 +1220,18 @@ class Board:
         # Flipping the kings' positions
         for color in [1, -1]:
             player = self.get_player(color)
-            player.king = flip_pos(player.king)
+            # The king can have been captured in giveaway
+            if player.king is not None:
+                player.king = flip_pos(player.king)
         # Flipping the en passant square
         if self.ep:
             self.ep = flip_pos(self.ep)
         # Flipping the move tree
         self.move_tree.flip_tree()
+        if self.headless:
+            return
+        import pygame
+        from src.assets import generate_piece_images
         # Regenerating the piece images depending on the flipped state
         if config.flipped_assets:
             self.piece_images = generate_piece_images(self.flipped)
@@ -818,11 +1259,52 @@ class Board:
 
         This method iterates through all the tiles on the board and updates the 
         image of each piece based on its color and notation. The images are 
-        retrieved from the `piece_images` dictionary using a key composed of 
-        the piece's color ('w' for white, 'b' for black) and its notation.
+        retrieved from the `piece_images` dictionary with `get_piece_image`.
         """
+        if config.piece_asset == "blindfold":
+            return
         for tile in self.board.values():
-            tile.piece.update_image(self.piece_images[("w" if tile.piece.color == 1 else "b") + tile.piece.notation])
+            if tile.piece is not None:
+                tile.piece.update_image(self.get_piece_image(tile.piece))
+
+    def get_piece_image(self, piece):
+        """
+        Retrieves the image of a piece from the loaded piece images.
+
+        Parameters:
+            piece (Piece): The piece whose image is needed.
+
+        Returns:
+            pygame.Surface: The image of the piece.
+
+        Raises:
+            ValueError: If the image of the piece is missing from the piece images.
+        """
+        piece_image_key = f"{(('w' if piece.color == 1 else 'b') if config.piece_asset != "mono" else "")}{piece.notation}"
+        if piece_image_key not in self.piece_images:
+            raise ValueError(f"Missing piece image for: {piece_image_key}")
+        return self.piece_images[piece_image_key]
+
+    def attach_assets(self):
+        """
+        Loads the images and sounds of the board, so that it can be drawn and heard.
+
+        The board's logic never needs them, so they are only loaded by the game's scene.
+        Boards created elsewhere (by the AI, the perft tool or other processes) stay headless,
+        which makes them fast to create and free of any pygame state: pygame and the assets
+        are only imported here, so that the workers of the AI never load them.
+        """
+        import pygame
+        from src.assets import generate_piece_images, generate_board_image, generate_sounds
+        self.headless = False
+        self.image = generate_board_image()
+        if self.flipped == -1:
+            self.image = pygame.transform.flip(self.image, True, False)
+        self.piece_images = generate_piece_images(self.flipped)
+        self.sounds = generate_sounds()
+        self.update_images()
+        self.update_history()
+        play_sound(self.sounds, "game-start")
 
     def get_player(self, color: int) -> Player:
         """
@@ -988,6 +1470,7 @@ class Board:
             numpy.ndarray: A 3D matrix representing the chessboard state, piece positions, 
             and legal moves for the current turn.
         """
+        import numpy as np
         matrix = np.zeros((14, 8, 8))
         for pos, tile in self.board.items():
             piece = tile.piece
@@ -996,16 +1479,10 @@ class Board:
                 if piece.color == -1:
                     channel += 6
                 matrix[channel, pos[0], pos[1]] = 1
-                if piece.color == self.turn:
-                    moves = piece.calc_moves(self, pos)
-                    if moves:
-                        legal_moves = 0
-                        for move in moves:
-                            if self.convert_to_move(pos, move).is_legal(self):
-                                matrix[13, move[0], move[1]] = 1 
-                                legal_moves += 1
-                            if legal_moves:       
-                                matrix[12, pos[0], pos[1]] = 1               
+        for code in self.get_legal_move_codes():
+            from_pos, to_pos = self.get_pos(get_from_square(code)), self.get_pos(get_to_square(code))
+            matrix[12, from_pos[0], from_pos[1]] = 1
+            matrix[13, to_pos[0], to_pos[1]] = 1
         return matrix
 
     def convert_uci_to_move(self, uci_move):
@@ -1034,11 +1511,8 @@ class Board:
         promotion = notation_to_piece(uci_move[4]) if len(uci_move) == 5 else None
         if self.is_empty(from_pos):
             return None
-        exist = False
-        for move in self.current_player.get_moves(self):
-            if (move.from_pos, move.to_pos) == (from_pos, to_pos):
-                exist = True
-        if not exist:
+        from_square, to_square = self.get_square(from_pos), self.get_square(to_pos)
+        if not any(get_from_square(code) == from_square and get_to_square(code) == to_square for code in self.get_legal_move_codes()):
             return None
         return self.convert_to_move(from_pos, to_pos, promotion)
 
@@ -1049,8 +1523,11 @@ class Board:
         the range of moves to display (up to the last 20 moves), and creates a list
         of `Label` objects to visually represent the moves and their corresponding
         move numbers on the board. The labels are positioned dynamically based on
-        the configuration of the board's dimensions.
+        the configuration of the board's dimensions. Nothing is done if the board is headless.
         """
+        if self.headless:
+            return
+        from src.gui import Label
         moves = self.move_tree.get_root_to_leaf()
         start_num = max(1, ceil((len(moves) - 20) / 2)) if len(moves) > 20 else 1
         moves = moves[-(22 if len(moves) % 2 == 0 else 21):]
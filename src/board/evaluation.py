@@ -0,0 +1,37 @@
+from src.utils import flip_pos
+from src.constants import piece_values, piece_heatmaps
+
+def piece_score(piece, pos: tuple[int, int], flipped: int) -> float:
+    """
+    Computes the contribution of a piece standing on a given position to the evaluation of the board.
+
+    The heatmaps of the black pieces are the ones of the white pieces turned around, so a piece
+    is scored on the square of the unflipped board and the evaluation does not change when the
+    board is flipped.
+
+    Parameters:
+        piece (Piece): The piece standing on the position.
+        pos (tuple[int, int]): The position (row, column) of the piece.
+        flipped (int): The flipped state of the board (1 for normal, -1 for flipped).
+
+    Returns:
+        float: The value of the piece plus its heatmap score, positive for white and negative for black.
+    """
+    row, column = flip_pos(pos, flipped=flipped)
+    return (piece_values[piece.notation] + piece_heatmaps[piece.color][piece.notation][row][column]) * piece.color
+
+def compute_evaluation(board) -> float:
+    """
+    Computes the material and heatmap evaluation of a board from scratch.
+
+    Parameters:
+        board (Board): The board to evaluate.
+
+    Returns:
+        float: The evaluation of the board, positive when white is better and negative when black is better.
+    """
+    score = 0
+    for pos, tile in board.board.items():
+        if tile.piece is not None:
+            score += piece_score(tile.piece, pos, board.flipped)
+    return score
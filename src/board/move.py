@@ -1,6 +1,7 @@
 from src.config import config
-from src.constants import castling_king_column
+from src.constants import checkmate_score, stalemate_score
 from src.board.piece import piece_to_notation
+from src.board.move_encoding import encode_move, CAPTURE, EN_PASSANT, CASTLING, DOUBLE_PUSH
 from src.utils import flip_pos, sign, get_value, debug_print, play_sound
 
 class Move:
@@ -29,6 +30,9 @@ class Move:
             promotion (str or None): The piece to promote to if the move is a pawn promotion.
             notation (str or None): The algebraic notation of the move. Defaults to None.
             fen (str or None): The FEN string representing the board state after the move. Defaults to None.
+            code (int): The move encoded with `encode_move`, which is what the board actually plays.
+            undo_info (tuple or None): The information returned by `Board.make_move` the last time the move
+                                       was played, used to undo it. Defaults to None.
 
         Raises:
             ValueError: If there is no piece at `from_pos`.
@@ -47,6 +51,29 @@ class Move:
         self.promotion = promotion
         self.notation = None
         self.fen = None
+        self.code = self._encode(board)
+        self.undo_info = None
+
+    def _encode(self, board) -> int:
+        """
+        Encodes the move into an integer, as the move generator of the bitboards does.
+
+        Parameters:
+            board (Board): The chess board on which the move is being made.
+
+        Returns:
+            int: The code of the move (see `encode_move`).
+        """
+        if self.castling:
+            flags = CASTLING
+        elif self.en_passant:
+            flags = CAPTURE | EN_PASSANT
+        else:
+            flags = CAPTURE if self.is_capture() else 0
+            if self.moving_piece.notation == "P" and abs(self.from_pos[0] - self.to_pos[0]) == 2:
+                flags |= DOUBLE_PUSH
+        promotion = piece_to_notation(self.promotion) if self.promotion is not None else None
+        return encode_move(board.get_square(self.from_pos), board.get_square(self.to_pos), promotion, flags)
     
     def is_capture(self) -> bool:
         """
@@ -82,9 +109,6 @@ class Move:
             board (Board): The chess board object on which the move is executed.
         """
         # All the things to update when the move is done for the first time
-        if config.rules["giveaway"] == False:
-            board._update_castling(self)
-        board._update_en_passant(self)
         board._update_last_irreversible_move(self)
         board.half_moves += 1
         # Reset half_moves if it's a capture, castling or a pawn move
@@ -99,214 +123,53 @@ class Move:
         self.notation = self.to_notation(board)
         board.update_history()
         board.check_game()
-        board.score = board.negamax.evaluate_board(board)
+        # The game's state has just been checked, only the winner is needed to score a finished game
+        if board.winner in ["White", "Black"]:
+            board.score = checkmate_score * (1 if board.winner == "White" else -1)
+        elif board.game_over:
+            board.score = stalemate_score
+        else:
+            board.score = board.evaluation
 
     def move(self, board):
         """
         Executes a move on the chessboard, updating the board state and handling special rules.
         This method can be called ad infinitum on the board.
 
+        The move is played through its code by `Board.make_move`, which updates the castling rights,
+        the en passant square, the pieces, the turn, the players, the "+3 checks" counts and the hash.
+
         Parameters:
             board (Board): The current state of the chessboard. This object is updated to reflect the move.
-
-        Functionality:
-            - If the move involves a promotion, the piece is promoted accordingly.
-            - Otherwise, the piece is moved to the target position.
-            - Updates the turn to the next player.
-            - Resets the selected piece on the board.
-            - Swaps the current player and the waiting player.
-            - Checks for the "+3 checks" rule, and increments the check count for the opponent if applicable.
         """
-        # Update the board state
-        if self.promotion is not None:
-            self.promote_piece(board, self.promotion)
-        else:
-            self.move_piece(board)
-        board.turn *= -1
-        board.selected = None
-        board.current_player, board.waiting_player = board.waiting_player, board.current_player
-        if config.rules["+3_checks"] == True and board.current_player.is_king_check(board):
-            board.checks[board.waiting_player.color] += 1
-
-    def move_piece(self, board):
-        # Update kings' positions
-        if self.moving_piece.notation == "K":
-            board.current_player.king = self.to_pos
-
-        # Update player's pieces
-        if self.is_capture() and not self.castling and not self.en_passant:
-            board.waiting_player.remove_piece(self.captured_piece)
-
-        # Capture en passant
-        if self.en_passant:
-            board.waiting_player.remove_piece(board.get_tile((self.from_pos[0], self.to_pos[1])).piece)
-            board.get_tile((self.from_pos[0], self.to_pos[1])).piece = None
-
-        # Handle castling logic
-        if self.castling:
-            self._handle_castling(board)
-        # Handle normal move
-        else:
-            self._handle_normal_move(board)
-        
-        # Anarchy chess
-        if config.rules["+3_checks"] == True and board.current_player.is_king_check(board):
-            self.checks[board.waiting_player.color] += 1
+        self.undo_info = board.make_move(self.code)
 
-    def _handle_castling(self, board):
-        """
-        Handles the castling move in a chess game. Castling is a special move 
-        involving the king and a rook, where both pieces move simultaneously 
-        under specific conditions.
-        Parameters:
-            board (Board): The current state of the chessboard. It provides 
-                           access to the positions of pieces and tiles.
-        Utility:
-            This function updates the board to reflect the castling move by:
-            - Moving the king to its destination column.
-            - Moving the rook to its corresponding destination column.
-            - Clearing the original positions of the king and rook.
-            It also accounts for Chess960 rules, where the rook's initial 
-            position may vary.
-        """
-        from_pos, to_pos = self.from_pos, self.to_pos
-        d = sign(to_pos[1] - from_pos[1])
-        # Save the pieces
-        king = self.moving_piece
-        rook_pos = to_pos if config.rules["chess960"] == True else (to_pos[0], (7 if d == 1 else 0))
-        rook = board.get_piece(rook_pos)
-
-        # Destinations columns
-        dest_king_column = flip_pos(castling_king_column[d*board.flipped], flipped=board.flipped)
-        dest_rook_column = dest_king_column - d
-        
-        # Castling move
-        board.get_tile(from_pos).piece = None
-        board.get_tile(rook_pos).piece = None
-        board.get_tile((from_pos[0], dest_king_column)).piece = king
-        board.get_tile((from_pos[0], dest_rook_column)).piece = rook
-        
-    def _handle_normal_move(self, board):
+    def _get_castling_positions(self, board) -> tuple[tuple[int, int], tuple[int, int], tuple[int, int]]:
         """
-        Handles a normal chess move by updating the board state.
-
-        This method moves a piece from its current position (`from_pos`) to a new position (`to_pos`) 
-        on the board. It updates the board tiles by setting the destination tile's piece to the 
-        moving piece and clearing the piece from the original tile.
+        Computes the positions of the pieces involved in a castling move.
 
         Parameters:
-            board (Board): The chessboard object that contains the tiles and pieces.
-        """
-        from_pos, to_pos = self.from_pos, self.to_pos
-        board.get_tile(to_pos).piece = self.moving_piece
-        board.get_tile(from_pos).piece = None
+            board (Board): The current state of the chessboard.
 
-    def promote_piece(self, board, type_piece):
+        Returns:
+            tuple: A tuple (rook_pos, dest_king_pos, dest_rook_pos) containing the starting position
+                   of the rook and the destinations of the king and the rook (see `Board.get_castling_positions`).
         """
-        Promotes a pawn to a specified piece type during a chess game.
-
-        This function replaces a pawn that has reached the promotion rank with a new piece 
-        of the specified type. It updates the board state, assigns the appropriate image 
-        to the new piece (if applicable), and ensures the new piece is added to the current 
-        player's collection of pieces.
-
-        Parameters:
-            board (Board): The chess board object representing the current game state.
-            type_piece (Type[Piece]): The class of the piece to which the pawn will be promoted 
-                                      (e.g., Queen, Rook, Bishop, Knight).
-
-        Raises:
-            ValueError: If the image for the promoted piece is missing in the board's piece images.
-        """
-        new_piece = type_piece(self.moving_piece.color)
-        if config.piece_asset != "blindfold":
-            piece_image_key = f"{(('w' if new_piece.color == 1 else 'b') if config.piece_asset != "mono" else "")}{new_piece.notation}"
-            if piece_image_key not in board.piece_images:
-                raise ValueError(f"Missing piece image for: {piece_image_key}")
-            new_piece.image = board.piece_images[piece_image_key]
-        board.current_player.add_piece(new_piece)
-        board.get_tile(self.to_pos).piece = new_piece
-        board.get_tile(self.from_pos).piece = None
-        board.promotion = None
+        return board.get_castling_positions(self.from_pos, self.to_pos)
 
     def undo(self, board) -> None:
         """
         Reverts the last move made on the chessboard, restoring the board state 
         to what it was before the move. This includes updating the turn, 
         resetting the selected piece, swapping the current and waiting players, 
+        restoring the castling rights, the en passant square and the hash,
         and handling specific rules such as promotion and the "+3 checks" rule.
 
         Parameters:
             board (Board): The chessboard object representing the current game state. 
                            It contains information about the players, pieces, and rules.
         """
-        board.turn *= -1
-        board.selected = None
-        board.current_player, board.waiting_player = board.waiting_player, board.current_player
-        if config.rules["+3_checks"] == True and board.current_player.is_king_check(board):
-            board.checks[board.waiting_player.color] -= 1
-        if self.promotion is not None:
-            self.undo_promote_piece(board)
-        else:
-            self.undo_move_piece(board)
-
-    def undo_promote_piece(self, board):
-        """
-        Reverts a pawn promotion on the chessboard by restoring the original piece 
-        and removing the promoted piece from the current player's active pieces.
-
-        Parameters:
-            board (Board): The chessboard object that contains the tiles and pieces. 
-                           It provides access to the tiles and manages the state of the game.
-
-        Utility:
-            This function is used to undo a pawn promotion, typically as part of 
-            reverting a move in the game. It restores the original state of the 
-            board before the promotion occurred, including the original piece 
-            and any captured piece.
-        """
-        board.get_tile(self.from_pos).piece = self.moving_piece
-        board.current_player.remove_piece(board.get_tile(self.to_pos).piece)
-        board.get_tile(self.to_pos).piece = self.captured_piece
-
-    def undo_move_piece(self, board):
-        """
-        Reverts the last move made on the chessboard, restoring the board state 
-        and updating the necessary attributes.
-        Parameters:
-            board (Board): The chessboard object representing the current state 
-                           of the game. It provides access to tiles, pieces, and 
-                           player information.
-        Utility:
-            - Restores the position of the moving piece to its original location.
-            - Restores the captured piece (if any) to its original position.
-            - Handles special cases such as en passant and castling.
-            - Updates the king's position if the moved piece was a king.
-            - Restores the captured piece to the waiting player's list of pieces 
-              if the move was a capture.
-        """
-        # Restore the board state
-        board.get_tile(self.from_pos).piece = self.moving_piece
-        board.get_tile((self.to_pos[0] + self.moving_piece.color*board.flipped, self.to_pos[1]) if self.en_passant else self.to_pos).piece = self.captured_piece
-        if self.en_passant:
-            board.get_tile(self.to_pos).piece = None
-
-        # Handle castling
-        if self.castling:
-            d = sign(self.to_pos[1] - self.from_pos[1])
-            rook_pos = (self.from_pos[0], self.from_pos[1] + d)
-            rook = board.get_piece(rook_pos)
-            dest_rook_pos = self.to_pos if config.rules["chess960"] == True else (self.to_pos[0], (7 if d == 1 else 0))
-            board.get_tile(rook_pos).piece = None
-            board.get_tile(dest_rook_pos).piece = rook
-
-        # Restore king position
-        if self.moving_piece.notation == "K":
-            board.current_player.king = self.from_pos
-
-        # Restore player's pieces
-        if self.is_capture() and not self.castling:
-            board.waiting_player.add_piece(self.captured_piece)
+        board.unmake_move(self.undo_info)
 
     def play_sound_move(self, board) -> None:
         """
@@ -346,27 +209,23 @@ class Move:
             bool: True if the move is legal, False otherwise.
         """
         if not self.castling:
-            if config.rules["giveaway"] == True:
+            if not board.rules.checks:
                 return True
             return board.get_tile(self.from_pos).can_move(board, self.to_pos)
         # Castling
-        if config.rules["giveaway"] == True or board.current_player.is_king_check(board):
+        if not board.rules.castling or board.current_player.is_king_check(board):
             return False
-        d = sign(self.to_pos[1] - self.from_pos[1])
-        is_legal = True
-        # -1 for O-O-O, 1 for O-O
-        castling_direction = d*board.flipped
-        rook_pos = self.to_pos if config.rules["chess960"] == True else (self.to_pos[0], (7 if d == 1 else 0))
-        dest_rook_column = flip_pos(castling_king_column[castling_direction] - castling_direction, flipped=board.flipped) * d
-        dest_king_column = flip_pos(castling_king_column[castling_direction], flipped=board.flipped) * d
-        start = d * min(self.from_pos[1] * d, dest_rook_column)
-        end = d * max(rook_pos[1] * d, dest_king_column)
-        for next_column in range(start + castling_direction, end + castling_direction, castling_direction):
-            condition = board.get_tile(self.from_pos).can_move(board, (self.from_pos[0], next_column))
-            is_legal = is_legal and condition
-            if not is_legal:
-                break
-        return is_legal
+        rook_pos, dest_king_pos, _ = self._get_castling_positions(board)
+        position = board.position
+        king_square, rook_square = board.get_square(self.from_pos), board.get_square(rook_pos)
+        # The king and the rook leave their squares, so they don't block the attacks on the others
+        occupied = position.occupied & ~((1 << king_square) | (1 << rook_square))
+        # The king can't pass through or land on an attacked square
+        d = sign(dest_king_pos[1] - self.from_pos[1])
+        return d == 0 or all(
+            not position.is_attacked(board.get_square((self.from_pos[0], column)), -self.moving_piece.color, occupied)
+            for column in range(self.from_pos[1] + d, dest_king_pos[1] + d, d)
+        )
     
     def _is_castling(self, board) -> bool:
         """
@@ -386,7 +245,7 @@ class Move:
         if self.moving_piece.notation != "K":
             return False
         d = 1 if self.to_pos[1] > self.from_pos[1] else -1
-        if (config.rules["chess960"] == False and abs(self.from_pos[1] - self.to_pos[1]) != 2) or (config.rules["chess960"] == True and (not self.is_capture() or board.is_empty(self.to_pos) or self.captured_piece.notation != "R" or self.moving_piece.is_enemy(self.captured_piece))):
+        if (not board.rules.chess960 and abs(self.from_pos[1] - self.to_pos[1]) != 2) or (board.rules.chess960 and (not self.is_capture() or board.is_empty(self.to_pos) or self.captured_piece.notation != "R" or self.moving_piece.is_enemy(self.captured_piece))):
             return False
         # O-O-O castling's right
         if d == -1 and not board.castling[self.moving_piece.color][d]:
@@ -417,6 +276,26 @@ class Move:
             self.to_pos == board.ep
             )
         
+    def to_uci(self, board) -> str:
+        """
+        Converts the current move into UCI (Universal Chess Interface) notation.
+
+        The squares are written from white's side whatever the board's flipped state. In Chess960,
+        castling is written as the king moving to its rook's square, as the move is stored.
+
+        Parameters:
+            board (Board): The current state of the chessboard, used for its flipped orientation.
+
+        Returns:
+            str: A string representing the move in UCI notation (e.g. "e2e4" or "e7e8q").
+        """
+        string = ""
+        for pos in [self.from_pos, self.to_pos]:
+            string += chr(flip_pos(pos[1], flipped=board.flipped) + 97) + str(flip_pos(pos[0], flipped=-board.flipped) + 1)
+        if self.promotion is not None:
+            string += piece_to_notation(self.promotion).lower()
+        return string
+
     def to_notation(self, board) -> str:
         """
         Converts the current move into standard chess notation.
@@ -0,0 +1,122 @@
+from src.config import config
+
+# A move is packed in an integer: its flags in the lowest bits, then the piece it is promoted to,
+# then its starting and destination squares, as indexed by the bitboards (see `Board.get_square`)
+CAPTURE = 1
+EN_PASSANT = 2
+CASTLING = 4
+DOUBLE_PUSH = 8
+FLAGS_MASK = 15
+PROMOTION_SHIFT = 4
+PROMOTION_MASK = 7
+FROM_SHIFT = 7
+# Enough bits for boards of up to 4096 squares
+SQUARE_BITS = 12
+SQUARE_MASK = (1 << SQUARE_BITS) - 1
+TO_SHIFT = FROM_SHIFT + SQUARE_BITS
+# Notations of the pieces a pawn can be promoted to, the index 0 meaning no promotion
+PROMOTIONS = (None, "N", "B", "R", "Q", "K")
+PROMOTION_INDEXES = {notation: index for index, notation in enumerate(PROMOTIONS)}
+
+def encode_move(from_square: int, to_square: int, promotion: str = None, flags: int = 0) -> int:
+    """
+    Packs a move into an integer.
+
+    The searches and the perft tool play thousands of moves per second, so they use these integers
+    instead of `Move` objects: they are created without reading the board, take little memory, and
+    can be compared and stored in the transposition table directly. As the squares do not change
+    when the board is flipped, neither does the code of a move.
+
+    Parameters:
+        from_square (int): The index of the square the piece leaves.
+        to_square (int): The index of the square the piece goes to. A castling move goes to its
+                         rook's square in Chess960, and to the king's destination otherwise.
+        promotion (str, optional): The notation of the piece a pawn is promoted to. Defaults to None.
+        flags (int): The kind of the move, a combination of CAPTURE, EN_PASSANT, CASTLING and DOUBLE_PUSH.
+
+    Returns:
+        int: The code of the move.
+    """
+    return flags | PROMOTION_INDEXES[promotion] << PROMOTION_SHIFT | from_square << FROM_SHIFT | to_square << TO_SHIFT
+
+def decode_move(code: int) -> tuple[int, int, str | None, int]:
+    """
+    Unpacks a move encoded with `encode_move`.
+
+    Parameters:
+        code (int): The code of the move.
+
+    Returns:
+        tuple: A tuple (from_square, to_square, promotion, flags).
+    """
+    return (code >> FROM_SHIFT & SQUARE_MASK, code >> TO_SHIFT, PROMOTIONS[code >> PROMOTION_SHIFT & PROMOTION_MASK], code & FLAGS_MASK)
+
+def get_from_square(code: int) -> int:
+    """
+    Retrieves the square a move starts from.
+
+    Parameters:
+        code (int): The code of the move.
+
+    Returns:
+        int: The index of the starting square.
+    """
+    return code >> FROM_SHIFT & SQUARE_MASK
+
+def get_to_square(code: int) -> int:
+    """
+    Retrieves the square a move goes to.
+
+    Parameters:
+        code (int): The code of the move.
+
+    Returns:
+        int: The index of the destination square.
+    """
+    return code >> TO_SHIFT
+
+def get_promotion(code: int) -> str | None:
+    """
+    Retrieves the piece a move promotes a pawn to.
+
+    Parameters:
+        code (int): The code of the move.
+
+    Returns:
+        str | None: The notation of the piece, or None if the move is not a promotion.
+    """
+    return PROMOTIONS[code >> PROMOTION_SHIFT & PROMOTION_MASK]
+
+def is_quiet(code: int) -> bool:
+    """
+    Determines whether a move is quiet, that is neither a capture nor a promotion.
+
+    Parameters:
+        code (int): The code of the move.
+
+    Returns:
+        bool: True if the move does not capture or promote, False otherwise.
+    """
+    return not code & CAPTURE and not code >> PROMOTION_SHIFT & PROMOTION_MASK
+
+def code_to_uci(code: int) -> str:
+    """
+    Converts an encoded move into UCI notation, without reading the board.
+
+    The squares are written from white's side, as `Move.to_uci` does, so a line of moves found
+    by the search can be written out without playing it on the board.
+
+    Parameters:
+        code (int): The code of the move.
+
+    Returns:
+        str: The move in UCI notation (e.g. "e2e4" or "e7e8q").
+    """
+    from_square, to_square, promotion, _ = decode_move(code)
+    uci = ""
+    for square in (from_square, to_square):
+        row, column = divmod(square, config.columns)
+        uci += chr(column + 97) + str(config.rows - row)
+    if promotion is not None:
+        uci += promotion.lower()
+    return uci
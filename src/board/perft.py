@@ -0,0 +1,172 @@
+import argparse
+from time import perf_counter
+
+from src.board.board import Board
+from src.board.player import Player
+from src.board.rules import create_rules
+
+# Known perft results: name, FEN, rules enabled and number of nodes from depth 1
+PERFT_SUITE = [
+    ("Start position", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", {}, [20, 400, 8902]),
+    ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", {}, [48, 2039, 97862]),
+    ("Position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", {}, [14, 191, 2812]),
+    ("Position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", {}, [6, 264, 9467]),
+    ("Position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", {}, [44, 1486, 62379]),
+    ("Position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", {}, [46, 2079, 89890]),
+    ("Illegal en passant", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", {}, [18, 92, 1670]),
+    ("En passant evading check", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", {}, [15, 126, 1928]),
+    ("En passant discovering check", "8/8/8/K2pP2q/8/8/8/7k w - d6 0 1", {}, [6, 120, 776]),
+    ("Promotion giving check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", {}, [9, 40, 472]),
+    ("Underpromotions", "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1", {}, [24, 496, 9483]),
+    ("Chess960 standard position", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", {"chess960": True}, [20, 400, 8902]),
+    ("Chess960 position 1", "bqnb1rkr/pp3ppp/3ppn2/2p5/5P2/P2P4/NPP1P1PP/BQ1BNRKR w KQkq - 2 9", {"chess960": True}, [21, 528, 12189]),
+    ("Chess960 position 2", "2nnrbkr/p1qppppp/8/1ppb4/6PP/3PP3/PPP2P2/BQNNRBKR w KQkq - 1 9", {"chess960": True}, [21, 807, 18002]),
+    ("Chess960 position 3", "qbbnnrkr/2pp2pp/p7/1p2pp2/8/P3PP2/1PPP1KPP/QBBNNR1R w kq - 0 9", {"chess960": True}, [22, 593, 13440]),
+    ("Giveaway start position", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1", {"giveaway": True}, [20, 400, 8067]),
+    ("Giveaway forced en passant", "4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1", {"giveaway": True}, [6, 26, 165]),
+]
+
+def create_board(fen: str, rules: dict) -> Board:
+    """
+    Creates a board from a FEN string with the given rules.
+
+    The FEN of a Chess960 position is kept as it is, instead of shuffling its back ranks.
+
+    Parameters:
+        fen (str): The FEN string of the position.
+        rules (dict): The rules enabled for the position.
+
+    Returns:
+        Board: The board of the position.
+    """
+    # The first player given to the board is the one who has to play
+    turn = 1 if fen.split()[1] == "w" else -1
+    return Board(Player(turn), Player(-turn), fen, create_rules(rules, shuffled_start=False))
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Counts the leaf nodes of the tree of legal moves, down to a given depth.
+
+    Comparing these counts with known results is the standard way to check a move generator,
+    and timing them measures its speed. The moves are played as integers with `Board.make_move`,
+    and the moves of the last ply are counted without being played.
+
+    Parameters:
+        board (Board): The position to start from.
+        depth (int): The number of plies to play.
+
+    Returns:
+        int: The number of positions reached after exactly `depth` plies.
+    """
+    if depth == 0:
+        return 1
+    moves = board.current_player.get_move_codes(board)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    """
+    Counts the leaf nodes below each legal move of the position.
+
+    When a count differs from a known result, comparing the divide of both move generators
+    shows which move is wrong, then the position after this move can be divided in turn.
+
+    Parameters:
+        board (Board): The position to start from.
+        depth (int): The number of plies to play, the first one included.
+
+    Returns:
+        dict[str, int]: A dictionary where keys are the moves in UCI notation and values are their counts.
+    """
+    counts = {}
+    for move in board.current_player.get_move_codes(board):
+        uci = board.code_to_move(move).to_uci(board)
+        undo = board.make_move(move)
+        counts[uci] = perft(board, depth - 1)
+        board.unmake_move(undo)
+    return counts
+
+def run_perft(fen: str, depth: int, rules: dict = None, show_divide: bool = False) -> int:
+    """
+    Runs and prints the perft of a position, with the speed of the move generator.
+
+    Parameters:
+        fen (str): The FEN string of the position.
+        depth (int): The number of plies to play.
+        rules (dict, optional): The rules enabled for the position. Defaults to the classic rules.
+        show_divide (bool): Whether the count of each move is printed. Defaults to False.
+
+    Returns:
+        int: The number of positions reached after exactly `depth` plies.
+    """
+    rules = rules or {}
+    board = create_board(fen, rules)
+    start = perf_counter()
+    if show_divide:
+        counts = divide(board, depth)
+        for uci, count in sorted(counts.items()):
+            print(f"{uci}: {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, depth)
+    elapsed = perf_counter() - start
+    print(f"Depth {depth}: {nodes} nodes in {elapsed:.2f}s ({nodes / max(elapsed, 1e-9):.0f} nodes/s)")
+    return nodes
+
+def run_suite(max_depth: int = 3) -> bool:
+    """
+    Runs the perft of every position of the known-answer suite and compares the counts.
+
+    Parameters:
+        max_depth (int): The deepest depth searched for each position. Defaults to 3.
+
+    Returns:
+        bool: True if every count matches the known result, False otherwise.
+    """
+    passed = True
+    total_nodes = 0
+    total_time = 0
+    for name, fen, rules, expected in PERFT_SUITE:
+        board = create_board(fen, rules)
+        for depth, expected_nodes in enumerate(expected[:max_depth], 1):
+            start = perf_counter()
+            nodes = perft(board, depth)
+            elapsed = perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = "OK" if nodes == expected_nodes else f"FAILED (expected {expected_nodes})"
+            passed = passed and nodes == expected_nodes
+            print(f"{name}, depth {depth}: {nodes} nodes in {elapsed:.2f}s {status}")
+    print(f"{'All tests passed' if passed else 'Some tests failed'}, {total_nodes} nodes in {total_time:.2f}s ({total_nodes / max(total_time, 1e-9):.0f} nodes/s)")
+    return passed
+
+def main():
+    """
+    Runs the perft tool from the command line, without opening a window.
+
+    Without a FEN, the known-answer suite is run. Use it from the root folder:
+        python3 -m src.board.perft --depth 2
+        python3 -m src.board.perft --fen "<fen>" --depth 4 --divide
+    """
+    parser = argparse.ArgumentParser(description="Counts the positions reached by the move generator.")
+    parser.add_argument("--fen", help="the position to search, the known-answer suite is run if omitted")
+    parser.add_argument("--depth", type=int, default=3, help="the number of plies to play")
+    parser.add_argument("--divide", action="store_true", help="print the count of each move")
+    parser.add_argument("--chess960", action="store_true", help="enable the Chess960 rules")
+    parser.add_argument("--giveaway", action="store_true", help="enable the giveaway rules")
+    args = parser.parse_args()
+
+    if args.fen is None:
+        passed = run_suite(args.depth)
+        raise SystemExit(0 if passed else 1)
+    rules = {"chess960": args.chess960, "giveaway": args.giveaway}
+    run_perft(args.fen, args.depth, rules, args.divide)
+
+if __name__ == "__main__":
+    main()
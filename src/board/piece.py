@@ -1,8 +1,3 @@
-import pygame
-
-from src.config import config
-from src.utils import flip_pos
-from src.constants import bishop_directions, rook_directions, queen_directions, knight_directions, castling_king_column
 
 
 def notation_to_piece(notation: str) -> "Piece":
@@ -68,13 +63,14 @@ def piece_to_num(piece) -> int:
     return {Pawn:0, Knight:1, Bishop:2, Rook:3, Queen:4, King:5}[piece]
 
 class Piece():
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a Piece object.
 
         Attributes:
             color (int): The color of the piece, typically represented as an integer (e.g., 0 for white, 1 for black).
-            moves (list): A list to store the possible moves for the piece. Initially empty.
+            moves (list): The legal moves of the piece, as `Move` objects, set when it is selected on the
+                          board (see `Board.select`). Initially empty.
             image (pygame.Surface): The graphical representation of the piece. Defaults to None if not provided.
 
         Args:
@@ -113,7 +109,7 @@ class Piece():
         """
         return not self.is_ally(piece)
     
-    def update_image(self, image: pygame.Surface) -> None:
+    def update_image(self, image: "pygame.Surface") -> None:
         """
         Updates the image of the piece.
 
@@ -122,8 +118,21 @@ class Piece():
         """
         self.image = image
 
+    def __getstate__(self) -> dict:
+        """
+        Retrieves the state of the piece to pickle it, without its image, which can't be pickled.
+
+        The pieces are pickled with the copies of the board sent to the worker processes of the search.
+
+        Returns:
+            dict: The attributes of the piece, its image being None.
+        """
+        state = self.__dict__.copy()
+        state["image"] = None
+        return state
+
 class Pawn(Piece):
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a chess piece with a specified color and optional image.
 
@@ -133,56 +142,13 @@ class Pawn(Piece):
 
         Attributes:
             notation (str): The standard chess notation for the piece. Defaults to 'P' for pawn.
-            promotion (tuple or type): The possible pieces for promotion. Defaults to (Queen, Rook, Bishop, Knight) 
-                                       unless the "giveaway" rule is enabled in the configuration, in which case it is (King).
+                            The pieces it can be promoted to depend on the rules of the board (see `Rules.promotions`).
         """
         super().__init__(color, image)
         self.notation = 'P'
-        self.promotion = (Queen, Rook, Bishop, Knight) if config.rules["giveaway"] == False else (King)
-
-    def calc_moves(self, board, from_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Calculates all possible moves for a pawn from a given position on the board.
-        This function determines the valid moves for a pawn based on its current position,
-        the state of the board, and the pawn's color. It includes standard forward moves,
-        the initial two-square advance, diagonal captures, and en passant captures.
-        Parameters:
-            board (Board): The current state of the chessboard, which provides methods
-                           to check bounds, piece positions, and other game rules.
-            from_pos (tuple[int, int]): The current position of the pawn as a tuple
-                                        (row, column).
-        Returns:
-            list[tuple[int, int]]: A list of tuples representing the valid moves for the
-                                   pawn from the given position.
-        """
-        self.moves = []
-        d = self.color * board.flipped
-        # Déplacement de base vers l'avant
-        if board.in_bounds((from_pos[0] - d, from_pos[1])) and board.is_empty((from_pos[0] - d, from_pos[1])):
-            self.moves.append((from_pos[0] - d, from_pos[1]))
-            # Premier déplacement du pion (2 cases vers l'avant)
-            if from_pos[0] in [1, config.rows-2] and board.in_bounds((from_pos[0] - 2*d, from_pos[1])) and board.is_empty((from_pos[0] - 2*d, from_pos[1])):
-                self.moves.append((from_pos[0] - 2*d, from_pos[1]))
-
-        # Capture diagonale et en passant
-        for d_pos in [(-d, -1), (-d, 1)]:  # Diagonales
-            new_pos = (from_pos[0] + d_pos[0], from_pos[1] + d_pos[1])
-            if not board.in_bounds(new_pos):
-                continue
-            # En passant
-            if board.ep == new_pos and not board.is_empty((from_pos[0], from_pos[1] + d_pos[1])) and board.get_piece((from_pos[0], from_pos[1] + d_pos[1])).is_enemy(self):
-                self.moves.append(new_pos)
-            # Capture normale 
-            if board.is_empty(new_pos):
-                continue
-            piece = board.get_piece(new_pos)
-            if piece.is_enemy(self):
-                self.moves.append(new_pos)
-        return self.moves
-
 
 class Rook(Piece):
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a chess piece with a specified color and optional image.
 
@@ -198,40 +164,8 @@ class Rook(Piece):
         super().__init__(color, image)
         self.notation = 'R'
 
-    def calc_moves(self, board, from_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Calculates all possible moves for a piece on the board from a given position.
-
-        This function determines the valid moves for a piece based on its movement
-        rules (e.g., rook-like movement in this case). It considers the boundaries
-        of the board, empty squares, and enemy pieces that can be captured.
-
-        Parameters:
-            board: The game board object that provides methods to check bounds,
-                   piece presence, and piece ownership.
-            from_pos (tuple[int, int]): The current position of the piece on the board
-                                        as a tuple of (row, column).
-
-        Returns:
-            list[tuple[int, int]]: A list of tuples representing the valid positions
-                                   the piece can move to.
-        """
-        self.moves = []
-        for d_pos in rook_directions:
-            new_pos = (from_pos[0] + d_pos[0], from_pos[1] + d_pos[1])
-            while board.in_bounds(new_pos):
-                if board.is_empty(new_pos):
-                    self.moves.append(new_pos)
-                elif board.get_piece(new_pos).is_enemy(self):
-                    self.moves.append(new_pos)
-                    break
-                else:
-                    break
-                new_pos = (new_pos[0] + d_pos[0], new_pos[1] + d_pos[1])
-        return self.moves
-
 class Bishop(Piece):
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a chess piece with a specified color and optional image.
 
@@ -245,41 +179,8 @@ class Bishop(Piece):
         super().__init__( color, image)
         self.notation = 'B'
 
-    def calc_moves(self, board, from_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Calculates all possible moves for a piece on the board from a given position.
-
-        This function determines the valid moves for a piece based on its movement 
-        rules (e.g., bishop-like movement in this case) and the current state of the board.
-
-        Parameters:
-            board: The board object representing the current state of the chess game. 
-                   It provides methods to check if a position is within bounds, 
-                   if a position is empty, and to retrieve a piece at a specific position.
-            from_pos (tuple[int, int]): The starting position of the piece as a tuple 
-                                        (row, column).
-
-        Returns:
-            list[tuple[int, int]]: A list of tuples representing the valid positions 
-                                   the piece can move to.
-        """
-        self.moves = []
-        for d_pos in bishop_directions:
-            new_pos = (from_pos[0] + d_pos[0], from_pos[1] + d_pos[1])
-            while board.in_bounds(new_pos):
-                if board.is_empty(new_pos):
-                    self.moves.append(new_pos)
-                elif board.get_piece(new_pos).is_enemy(self):
-                    self.moves.append(new_pos)
-                    break
-                else:
-                    break
-                new_pos = (new_pos[0] + d_pos[0], new_pos[1] + d_pos[1])
-        return self.moves
-
-
 class Knight(Piece):
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a chess piece with a specified color and optional image.
 
@@ -295,36 +196,8 @@ class Knight(Piece):
         super().__init__( color, image)
         self.notation = 'N'
 
-    def calc_moves(self, board, from_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Calculates all possible moves for a knight piece from a given position on the board.
-
-        This method determines the valid moves for a knight based on its movement pattern 
-        (L-shaped moves) and the current state of the board. It checks if the target positions 
-        are within the board boundaries and whether they are either empty or occupied by an 
-        enemy piece.
-
-        Parameters:
-            board: The game board object that provides methods to check bounds, 
-                   piece presence, and piece ownership.
-            from_pos (tuple[int, int]): The current position of the knight on the board 
-                                        as a tuple of (row, column).
-
-        Returns:
-            list[tuple[int, int]]: A list of valid target positions (row, column) 
-                                   that the knight can move to.
-        """
-        self.moves = []
-        for d_pos in knight_directions:
-            new_pos = (from_pos[0] + d_pos[0], from_pos[1] + d_pos[1])
-            if board.in_bounds(new_pos):
-                if board.is_empty(new_pos) or board.get_piece(new_pos).is_enemy(self):
-                    self.moves.append(new_pos)
-        return self.moves
-
-
 class Queen(Piece):
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a chess piece with a specified color and optional image.
 
@@ -338,42 +211,8 @@ class Queen(Piece):
         super().__init__(color, image)
         self.notation = 'Q'
 
-    def calc_moves(self, board, from_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Calculates all possible moves for a piece on the board from a given position.
-
-        This function determines the valid moves for a piece based on its movement
-        directions (e.g., queen directions) and the state of the board. It considers
-        whether the destination squares are empty, occupied by an enemy piece, or
-        occupied by an allied piece.
-
-        Parameters:
-            board: The game board object that provides methods to check bounds,
-                   piece positions, and piece ownership.
-            from_pos (tuple[int, int]): The current position of the piece on the board,
-                                        represented as a tuple of (row, column).
-
-        Returns:
-            list[tuple[int, int]]: A list of valid moves represented as tuples of
-                                   (row, column) positions.
-        """
-        self.moves = []
-        for d_pos in queen_directions:
-            new_pos = (from_pos[0] + d_pos[0], from_pos[1] + d_pos[1])
-            while board.in_bounds(new_pos):
-                if board.is_empty(new_pos):  # Case non occupée
-                    self.moves.append(new_pos)
-                elif board.get_piece(new_pos).is_enemy(self):  # Pièce ennemie
-                    self.moves.append(new_pos)
-                    break
-                else:  # Pièce alliée
-                    break
-                new_pos = (new_pos[0] + d_pos[0], new_pos[1] + d_pos[1])
-        return self.moves
-
-    
 class King(Piece):
-    def __init__(self, color: int, image: pygame.Surface = None):
+    def __init__(self, color: int, image: "pygame.Surface" = None):
         """
         Initializes a Piece object with a specified color and optional image.
 
@@ -386,66 +225,3 @@ class King(Piece):
         """
         super().__init__(color, image)
         self.notation = 'K'
-
-    def calc_moves(self, board, from_pos: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Calculates all possible moves for a chess piece from a given position on the board.
-
-        This function determines the valid moves for a piece based on its movement rules, 
-        the current state of the board, and special rules such as castling. It updates the 
-        `self.moves` attribute with the list of valid moves.
-
-        Parameters:
-            board (Board): The current state of the chessboard, which provides methods 
-                           to check bounds, piece positions, and other game rules.
-            from_pos (tuple[int, int]): The current position of the piece as a tuple 
-                                        (row, column).
-
-        Returns:
-            list[tuple[int, int]]: A list of tuples representing the valid positions 
-                                   the piece can move to.
-        """
-        self.moves = []
-        for d_pos in queen_directions:
-            new_pos = (from_pos[0] + d_pos[0], from_pos[1] + d_pos[1])
-            if board.in_bounds(new_pos) and (board.is_empty(new_pos) or board.get_piece(new_pos).is_enemy(self)):
-                self.moves.append(new_pos)
-        # Castling
-        rooks = {1: None, -1: None}
-        # -1 = O-O-O, 1 = O-O
-        # Calculate possible castling
-        possible_castling = []
-        if board.castling[self.color][1]:
-            possible_castling.append(1)
-        if board.castling[self.color][-1]:
-            possible_castling.append(-1)
-        # Find the rook(s) that can castle
-        for d in possible_castling:
-            # -1 = O-O-O, 1 = O-O
-            castling_direction = d*board.flipped
-            for i in range(from_pos[1] + d, flip_pos(7, flipped=d) + d, d):
-                # Skip if empty square
-                if board.is_empty((from_pos[0], i)):
-                    continue
-                if rooks[castling_direction] is not None:
-                    rooks[castling_direction] = None
-                    possible_castling.remove(d)
-                    break
-                piece = board.get_piece((from_pos[0], i))
-                if piece.notation == "R" and piece.is_ally(self):
-                    rooks[castling_direction] = i
-        # Check if the squares between the king and the found rook(s) are empty
-        for d in possible_castling:
-            castling_direction = d*board.flipped
-            if rooks[castling_direction] is None:
-                continue
-            rook_column = rooks[castling_direction] * d
-            dest_rook_column = flip_pos(castling_king_column[castling_direction] - castling_direction, flipped=board.flipped) * d
-            dest_king_column = flip_pos(castling_king_column[castling_direction], flipped=board.flipped) * d
-            start = d * min(from_pos[1] * d, dest_rook_column)
-            end = d * max(rook_column, dest_king_column)
-            columns = list(range(start, end + d, d))
-            if all(board.is_empty((from_pos[0], i)) or i in [rooks[castling_direction], from_pos[1]] for i in columns):
-                castling_column = rooks[castling_direction] if config.rules["chess960"] == True else flip_pos(castling_king_column[castling_direction], flipped=board.flipped)
-                self.moves.append((from_pos[0], castling_column))
-        return self.moves
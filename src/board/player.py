@@ -1,4 +1,3 @@
-from src.config import config
 from src.board.move import Move
 
 class Player:
@@ -18,8 +17,10 @@ class Player:
             color (int): The color of the player.
             pieces (dict): A dictionary where keys are piece types ("P" for pawn,
                            "R" for rook, "N" for knight, "B" for bishop, "Q" for queen,
-                           "K" for king) and values are lists of positions for each
-                           piece type.
+                           "K" for king) and values are dictionaries where keys are the
+                           squares of the pieces of this type (as indexed by the bitboards,
+                           see `Board.get_square`) and values are the pieces. It is kept up
+                           to date by `Board.set_piece`.
             king (None or tuple): The position of the king on the board. Initially set
                                   to None and should be updated when the king's position
                                   is known.
@@ -27,75 +28,95 @@ class Player:
                       A value of -1 indicates no AI control.
         """
         self.color = color
-        # Pieces' position depending on their type
-        self.pieces = {"P": [], "R": [], "N": [], "B": [], "Q": [], "K": []}
+        # Pieces' squares depending on their type
+        self.pieces = {"P": {}, "R": {}, "N": {}, "B": {}, "Q": {}, "K": {}}
         # King's position
         self.king = None
         self.ia = -1
 
-    def add_piece(self, piece) -> None:
+    def add_piece(self, piece, square: int) -> None:
         """
         Adds a chess piece to the player's collection of pieces.
 
-        This method appends the given chess piece to the list of pieces
+        This method stores the given chess piece on its square, among the pieces
         associated with its notation in the player's collection.
 
         Parameters:
             piece: The chess piece to be added. It is expected to have a 
                    `notation` attribute that serves as a key to categorize
                    the piece in the player's collection.
+            square (int): The index of the square of the piece.
         """
-        self.pieces[piece.notation].append(piece)
+        self.pieces[piece.notation][square] = piece
 
-    def remove_piece(self, piece) -> None:
+    def remove_piece(self, piece, square: int) -> None:
         """
-        Removes a piece from the player's collection of pieces. If the piece being removed
-        is the king, the player's king attribute is set to None.
+        Removes a piece from the player's collection of pieces.
 
         Parameters:
             piece (Piece): The piece object to be removed. It must have a `notation` attribute
                            that identifies the type of piece (e.g., 'K' for king).
+            square (int): The index of the square of the piece.
         """
-        self.pieces[piece.notation].remove(piece)
-        if piece.notation == 'K':
-            self.king = None
+        del self.pieces[piece.notation][square]
+
+    def clear_pieces(self) -> None:
+        """
+        Removes every piece from the player's collection, before a new board is set up.
+        """
+        for squares in self.pieces.values():
+            squares.clear()
+        self.king = None
+
+    def copy(self) -> "Player":
+        """
+        Copies the pieces of the player into a new player, for a copy of the board (see `Board.copy`).
+
+        The copy is a plain `Player`, even if the player is an AI: the search of an AI only plays the
+        moves of the players of the board it searches, and keeps its own state in the AI object.
+
+        Returns:
+            Player: A player of the same color, owning the same pieces on the same squares.
+        """
+        player = Player(self.color)
+        player.pieces = {notation: dict(squares) for notation, squares in self.pieces.items()}
+        player.king = self.king
+        player.ia = self.ia
+        return player
+
+    def count_pieces(self) -> int:
+        """
+        Counts the pieces of the player.
+
+        Returns:
+            int: The number of pieces of the player still on the board.
+        """
+        return sum(len(squares) for squares in self.pieces.values())
 
     def get_moves(self, board) -> list[Move]:
         """
         Generates a list of all possible moves for the player based on the current state of the board.
 
-        This method iterates through all tiles on the board, checking if the tile contains a piece
-        belonging to the player. For each piece, it calculates all valid moves, including special
-        handling for pawn promotion. The resulting moves are returned as a list of `Move` objects.
+        The moves are generated on the bitboards of the board (see `get_move_codes`), then turned
+        into `Move` objects. A pawn reaching the last row gives one move for each piece it can be
+        promoted to. These moves can leave the king in check.
 
         Parameters:
-            board (Board): The current state of the chessboard. It provides access to the tiles,
-                           pieces, and utility methods for move calculation.
+            board (Board): The current state of the chessboard.
 
         Returns:
             list[Move]: A list of all possible moves for the player, including regular moves and
                         promotion moves if applicable.
         """
-        moves = []
-        for tile in board.board.values():
-            if board.is_empty(tile.pos):
-                continue
-            if tile.piece.color != self.color:
-                continue
-            for to_pos in tile.calc_moves(board):
-                if to_pos[0] in [0, config.rows - 1] and tile.piece.notation == "P":
-                    for promotion in tile.piece.promotion:
-                        moves.append(board.convert_to_move(tile.pos, to_pos, promotion))
-                else:
-                    moves.append(board.convert_to_move(tile.pos, to_pos))
-        return moves
+        return [board.code_to_move(code) for code in self.get_move_codes(board, legal=False)]
     
     def get_legal_moves(self, board) -> list[Move]:
         """
         Retrieves a list of all legal moves for the player on the given board.
 
-        This method filters the moves generated by `get_moves` to include only those
-        that are legal according to the current state of the board.
+        The legal moves are generated on the bitboards (see `get_move_codes`), then turned into
+        `Move` objects. If the "giveaway" rule is enabled, the captures are the only legal moves
+        when there is at least one.
 
         Parameters:
             board (Board): The current state of the chessboard.
@@ -103,15 +124,35 @@ class Player:
         Returns:
             list[Move]: A list of legal moves that the player can make.
         """
-        return [move for move in self.get_moves(board) if move.is_legal(board)]
-    
+        return [board.code_to_move(code) for code in self.get_move_codes(board)]
+
+    def get_move_codes(self, board, legal: bool = True, noisy: bool = True, quiet: bool = True) -> list[int]:
+        """
+        Generates the moves of the player as integers, without creating `Move` objects.
+
+        The legal moves are generated directly on the bitboards, without playing them: the pinned pieces
+        and the pieces checking the king are found once, and the targets of each piece are restricted
+        accordingly (see `BitboardPosition.generate_moves`). The searches and the perft tool play these
+        codes with `Board.make_move`, and only the move finally chosen is turned into a `Move`.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+            legal (bool): Whether only the legal moves are generated. Defaults to True.
+            noisy (bool): Whether the captures and promotions are generated. Defaults to True.
+            quiet (bool): Whether the other moves are generated. Defaults to True.
+
+        Returns:
+            list[int]: The moves, encoded with `encode_move`.
+        """
+        return board.position.generate_moves(self.color, board.get_ep_square(), board.get_castling_sides(self.color), legal, noisy, quiet)
+
     def is_king_check(self, board) -> bool:
         """
         Determines if the player's king is in check.
 
-        This method checks whether the player's king is under attack by any of the opponent's possible moves.
-        If the "giveaway" rule is enabled in the configuration, the method will always return False, as the 
-        rule implies that checks are not considered.
+        This method checks whether the square of the player's king is attacked by any of the opponent's pieces,
+        without generating the opponent's moves. The test belongs to the rules of the board: if the "giveaway"
+        rule is enabled, the method will always return False, as the rule implies that checks are not considered.
 
         Parameters:
             board (Board): The current state of the chessboard, which includes information about all pieces 
@@ -120,6 +161,29 @@ class Player:
         Returns:
             bool: True if the player's king is in check, False otherwise.
         """
-        if config.rules["giveaway"]:
-            return False
-        return self.king in [move.to_pos for move in board.get_player(-self.color).get_moves(board)]
\ No newline at end of file
+        return board.rules.is_king_check(board, self)
+
+    def search_move(self, board, stop_event=None) -> Move | None:
+        """
+        Searches the move the AI would play, without playing it.
+
+        This is the entry point of the searches run in the background (see `SearchThread`), on a copy
+        of the board. The AI players provide `get_best_move`; the ones whose search can take long
+        override this method to stop as soon as `stop_event` is set.
+
+        Parameters:
+            board (Board): The board to search, which is modified during the search and restored afterwards.
+            stop_event (threading.Event, optional): The event set when the search must stop. Defaults to None.
+
+        Returns:
+            Move | None: The move chosen on the given board, or None if there is no move to play.
+        """
+        return self.get_best_move(board)
+
+    def close(self) -> None:
+        """
+        Releases the resources the player holds, once it is no longer used by a game.
+
+        A human player holds nothing; the AI players whose search runs in other processes override
+        this method to stop them (see `NegamaxAI.close`). The player can still be used afterwards.
+        """
\ No newline at end of file
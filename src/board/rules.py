@@ -0,0 +1,242 @@
+from src.config import config
+from src.board.piece import notation_to_piece
+from src.board.move_encoding import CAPTURE
+
+# Notations of the pieces a pawn can be promoted to, in the order they are generated and displayed
+PROMOTION_NOTATIONS = ("Q", "R", "B", "N")
+GIVEAWAY_PROMOTION_NOTATIONS = ("K",)
+
+class Rules:
+    name = "classic"
+
+    def __init__(self, chess960: bool = False, shuffled_start: bool = True):
+        """
+        Initializes the rules of a classic game, which the variants override.
+
+        The rules of a board are resolved once, when it is created, instead of reading the dictionary of
+        the configuration each time a move is generated or played: the variants only differ by these
+        attributes and hooks, so the hot paths read an attribute of `Board.rules` or call one of its
+        methods. As each board has its own rules, boards of different variants can be used at the same time.
+
+        Parameters:
+            chess960 (bool): Whether the castling moves follow the Chess960 rules. Defaults to False.
+            shuffled_start (bool): Whether the back rows of the starting position are shuffled when the
+                                   Chess960 rules are enabled. Defaults to True.
+
+        Attributes:
+            name (str): The name of the variant, as in `config.rules`.
+            chess960 (bool): Whether the castling moves follow the Chess960 rules, the king then moves
+                             to its rook's square.
+            shuffled_start (bool): Whether the back rows of the starting position are shuffled.
+            checks (bool): Whether a king can be in check, and then must not be left in check.
+            castling (bool): Whether the players can castle.
+            compulsory_captures (bool): Whether the captures are the only legal moves when there is at least one.
+            counts_checks (bool): Whether the checks given by each player are counted (see `Board.checks`).
+            promotions (tuple[str, ...]): The notations of the pieces a pawn can be promoted to.
+            null_move (bool): Whether the search can let the player to move pass to prove that its position is
+                              good enough (see `NegamaxAI.negamax`), which assumes that moving is never worse.
+        """
+        self.chess960 = chess960
+        self.shuffled_start = shuffled_start
+        self.checks = True
+        self.castling = True
+        self.compulsory_captures = False
+        self.counts_checks = False
+        self.promotions = PROMOTION_NOTATIONS
+        self.null_move = True
+
+    @property
+    def promotion_pieces(self) -> tuple[type, ...]:
+        """
+        Retrieves the types of the pieces a pawn can be promoted to, as displayed when promoting.
+
+        Returns:
+            tuple[type, ...]: The types of the pieces, in the order of `promotions`.
+        """
+        return tuple(notation_to_piece(notation) for notation in self.promotions)
+
+    def is_king_check(self, board, player) -> bool:
+        """
+        Determines if the king of a player is in check.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+            player (Player): The player whose king is tested.
+
+        Returns:
+            bool: True if the king's square is attacked by the opponent, False otherwise.
+        """
+        return board.is_square_attacked(player.king, -player.color)
+
+    def filter_moves(self, moves: list[int]) -> list[int]:
+        """
+        Restricts the moves of a player which are legal for the pieces to the ones the variant allows.
+
+        Parameters:
+            moves (list[int]): The moves of the player, encoded with `encode_move`.
+
+        Returns:
+            list[int]: The moves the player can play.
+        """
+        return moves
+
+    def has_won(self, board) -> bool:
+        """
+        Determines whether the player who has just moved has won by the variant's own condition.
+
+        Parameters:
+            board (Board): The current state of the chessboard, after the move.
+
+        Returns:
+            bool: True if the player who has just moved has won, False otherwise.
+        """
+        return False
+
+    def is_lost_without_moves(self, board) -> bool:
+        """
+        Determines whether the player to move has lost, when they have no legal move.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+
+        Returns:
+            bool: True for a checkmate, False for a stalemate.
+        """
+        return self.is_king_check(board, board.current_player)
+
+class KingOfTheHillRules(Rules):
+    name = "king_of_the_hill"
+
+    def has_won(self, board) -> bool:
+        """
+        Determines whether the player who has just moved has brought their king to the center of the board.
+
+        Parameters:
+            board (Board): The current state of the chessboard, after the move.
+
+        Returns:
+            bool: True if the king of the player who has just moved stands in the center, False otherwise.
+        """
+        return board.waiting_player.king in board.get_center()
+
+class ThreeChecksRules(Rules):
+    name = "+3_checks"
+
+    def __init__(self, chess960: bool = False, shuffled_start: bool = True):
+        """
+        Initializes the rules of the "+3 checks" variant, where giving a third check wins the game.
+
+        Parameters:
+            chess960 (bool): Whether the castling moves follow the Chess960 rules. Defaults to False.
+            shuffled_start (bool): Whether the back rows of the starting position are shuffled when the
+                                   Chess960 rules are enabled. Defaults to True.
+        """
+        super().__init__(chess960, shuffled_start)
+        self.counts_checks = True
+
+    def has_won(self, board) -> bool:
+        """
+        Determines whether the player who has just moved has given their third check.
+
+        Parameters:
+            board (Board): The current state of the chessboard, after the move.
+
+        Returns:
+            bool: True if the player who has just moved has given at least 3 checks, False otherwise.
+        """
+        return board.checks[-board.turn] >= 3
+
+class GiveawayRules(Rules):
+    name = "giveaway"
+
+    def __init__(self, chess960: bool = False, shuffled_start: bool = True):
+        """
+        Initializes the rules of the "giveaway" variant, where the kings are ordinary pieces
+        and capturing is compulsory.
+
+        Parameters:
+            chess960 (bool): Whether the castling moves follow the Chess960 rules. Defaults to False.
+            shuffled_start (bool): Whether the back rows of the starting position are shuffled when the
+                                   Chess960 rules are enabled. Defaults to True.
+        """
+        super().__init__(chess960, shuffled_start)
+        self.checks = False
+        self.castling = False
+        self.compulsory_captures = True
+        self.promotions = GIVEAWAY_PROMOTION_NOTATIONS
+        # The compulsory captures make moving worse than passing in most positions
+        self.null_move = False
+
+    def is_king_check(self, board, player) -> bool:
+        """
+        Determines if the king of a player is in check, which never happens as the kings can be captured.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+            player (Player): The player whose king is tested.
+
+        Returns:
+            bool: Always False.
+        """
+        return False
+
+    def filter_moves(self, moves: list[int]) -> list[int]:
+        """
+        Restricts the moves of a player to their captures, when there is at least one.
+
+        Parameters:
+            moves (list[int]): The moves of the player, encoded with `encode_move`.
+
+        Returns:
+            list[int]: The captures if there are some, all the moves otherwise.
+        """
+        captures = [move for move in moves if move & CAPTURE]
+        return captures or moves
+
+    def has_won(self, board) -> bool:
+        """
+        Determines whether the player who has just moved has given away all their pieces.
+
+        Parameters:
+            board (Board): The current state of the chessboard, after the move.
+
+        Returns:
+            bool: True if the player who has just moved has no piece left, False otherwise.
+        """
+        return board.position.occupancy[board.waiting_player.color] == 0
+
+    def is_lost_without_moves(self, board) -> bool:
+        """
+        Determines whether the player to move has lost, when they have no legal move.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+# Rules of the variants, the classic rules being used when none of them is enabled
+VARIANT_RULES = {
+    "king_of_the_hill": KingOfTheHillRules,
+    "+3_checks": ThreeChecksRules,
+    "giveaway": GiveawayRules,
+}
+
+def create_rules(rules: dict = None, shuffled_start: bool = True) -> Rules:
+    """
+    Resolves a dictionary of rules into the rules of a board.
+
+    Parameters:
+        rules (dict, optional): A dictionary where keys are the names of the rules and values are whether
+                                they are enabled, as `config.rules`. Defaults to the rules of the configuration.
+        shuffled_start (bool): Whether the back rows of the starting position are shuffled when the
+                               Chess960 rules are enabled. Defaults to True.
+
+    Returns:
+        Rules: The rules of the first variant enabled, or the classic rules.
+    """
+    rules = config.rules if rules is None else rules
+    rules_type = next((variant for name, variant in VARIANT_RULES.items() if rules.get(name)), Rules)
+    return rules_type(bool(rules.get("chess960")), shuffled_start)
@@ -0,0 +1,97 @@
+from src.config import config
+from src.constants import knight_directions, queen_directions
+
+# Tables already computed, depending on the board's geometry
+_tables = {}
+
+class AttackTables:
+    def __init__(self, rows: int, columns: int):
+        """
+        Precomputes the squares reached by each type of piece from each square of a board of the given geometry.
+
+        The pieces' moves only depend on the geometry of the board, and a board flipped upside down
+        has the same geometry, so the tables are indexed by the positions of the displayed board as
+        well as by the positions of the unflipped one. The bounds of the board are checked once
+        here, instead of every time a move is generated.
+
+        Parameters:
+            rows (int): The number of rows of the board.
+            columns (int): The number of columns of the board.
+
+        Attributes:
+            rows (int): The number of rows of the board.
+            columns (int): The number of columns of the board.
+            knight (dict): A dictionary where keys are positions (row, column) and values are the
+                           positions a knight standing on it can reach.
+            king (dict): A dictionary where keys are positions and values are the positions a king
+                         standing on it can reach with a single step.
+            pawn (dict): A dictionary where keys are the directions of the pawns (1 when they move towards
+                         the row 0, -1 otherwise) and values are dictionaries where keys are positions and
+                         values are the positions a pawn standing on it attacks.
+            rays (dict): A dictionary where keys are positions and values are dictionaries where keys are
+                         directions (d_row, d_column) and values are the positions met by following the
+                         direction, from the nearest to the edge of the board.
+        """
+        self.rows = rows
+        self.columns = columns
+        positions = [(row, column) for row in range(rows) for column in range(columns)]
+        self.knight = {pos: self._steps(pos, knight_directions) for pos in positions}
+        self.king = {pos: self._steps(pos, queen_directions) for pos in positions}
+        self.pawn = {d: {pos: self._steps(pos, [(-d, -1), (-d, 1)]) for pos in positions} for d in [1, -1]}
+        self.rays = {pos: {direction: self._ray(pos, direction) for direction in queen_directions} for pos in positions}
+
+    def in_bounds(self, pos: tuple[int, int]) -> bool:
+        """
+        Checks if a position is within the bounds of the board.
+
+        Parameters:
+            pos (tuple[int, int]): The position (row, column) to check.
+
+        Returns:
+            bool: True if the position is on the board, False otherwise.
+        """
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.columns
+
+    def _steps(self, pos: tuple[int, int], directions: list[tuple[int, int]]) -> tuple[tuple[int, int], ...]:
+        """
+        Computes the positions reached with a single step in each direction.
+
+        Parameters:
+            pos (tuple[int, int]): The starting position (row, column).
+            directions (list[tuple[int, int]]): The steps (d_row, d_column) to make.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The positions reached inside the board.
+        """
+        steps = ((pos[0] + d_row, pos[1] + d_column) for d_row, d_column in directions)
+        return tuple(step for step in steps if self.in_bounds(step))
+
+    def _ray(self, pos: tuple[int, int], direction: tuple[int, int]) -> tuple[tuple[int, int], ...]:
+        """
+        Computes the positions met by following a direction up to the edge of the board.
+
+        Parameters:
+            pos (tuple[int, int]): The starting position (row, column), which is not included.
+            direction (tuple[int, int]): The direction (d_row, d_column) to follow.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The positions of the ray, from the nearest to the farthest.
+        """
+        ray = []
+        next_pos = (pos[0] + direction[0], pos[1] + direction[1])
+        while self.in_bounds(next_pos):
+            ray.append(next_pos)
+            next_pos = (next_pos[0] + direction[0], next_pos[1] + direction[1])
+        return tuple(ray)
+
+def get_tables() -> AttackTables:
+    """
+    Retrieves the tables of the current board's geometry, computing them the first time.
+
+    Returns:
+        AttackTables: The tables matching `config.rows` and `config.columns`.
+    """
+    geometry = (config.rows, config.columns)
+    if geometry not in _tables:
+        _tables[geometry] = AttackTables(*geometry)
+    return _tables[geometry]
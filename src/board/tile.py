@@ -19,7 +19,6 @@ class Tile:
                                    if any. Defaults to None.
         """
         self.pos = pos
-        self.calc_position()
         self.highlight_color = None
         self.piece = None
 
@@ -36,56 +35,36 @@ class Tile:
         """
         return (sum(self.pos)) % 2
 
-    def calc_moves(self, board, **kwds) -> list[tuple[int, int]]:
+    @property
+    def coord(self) -> tuple[int, int]:
         """
-        Calculate the possible moves for the piece on this tile.
+        Calculates the pixel coordinates of the tile on the board.
 
-        This method delegates the calculation of possible moves to the piece
-        located on the tile. It uses the current board state and the position
-        of the tile to determine valid moves.
-
-        Parameters:
-            board (list[list]): The current state of the chessboard, represented
-                as a 2D list where each element corresponds to a tile.
-            **kwds: Additional keyword arguments that may be required for specific
-                piece movement logic.
+        The coordinates are computed when the tile is drawn, from its grid position (`self.pos`),
+        the tile size, the margin and the evaluation bar width defined in the `config` module.
+        They are not stored, so that a tile can be created before the screen's dimensions are known.
 
         Returns:
-            list[tuple[int, int]]: A list of tuples representing the valid moves
-            for the piece. Each tuple contains the row and column indices of a
-            potential destination tile.
-        """
-        return self.piece.calc_moves(board, self.pos, **kwds)
-
-    def calc_position(self) -> None:
+            tuple[int, int]: The pixel coordinates (x, y) of the top left corner of the tile.
         """
-        Calculates and updates the pixel coordinates of the tile on the board.
-
-        This method computes the position of the tile in terms of pixel coordinates
-        based on its grid position (`self.pos`) and updates the `self.coord` attribute.
-        The calculation takes into account the tile size, margin, and evaluation bar width
-        defined in the `config` module.
-        """
-        self.coord = (self.pos[1] * config.tile_size + config.margin + config.eval_bar_width, self.pos[0] * config.tile_size + config.margin)
+        return (self.pos[1] * config.tile_size + config.margin + config.eval_bar_width, self.pos[0] * config.tile_size + config.margin)
 
     def flip(self) -> None:
         """
-        Flips the tile's position and recalculates its coordinates.
+        Flips the tile's position.
 
         This method updates the tile's position by flipping it using the `flip_pos` function.
-        After flipping, it recalculates the tile's position on the board by calling `calc_position`.
         """
         self.pos = flip_pos(self.pos)
-        self.calc_position()
 
     def can_move(self, board, to: tuple[int, int]) -> bool:
         """
         Determines if a piece on the current tile can move to a specified destination tile 
         without putting its king in check.
 
-        This method temporarily simulates the move by swapping the piece to the destination 
-        tile and checks if the king of the current player is in check after the move. 
-        It restores the board to its original state after the check.
+        The move is simulated on the occupancy of the bitboards only (see `BitboardPosition.is_move_safe`),
+        so neither the tiles nor the bitboards of the board are modified. The pawn captured en passant
+        is the one standing next to the moving pawn.
 
         Parameters:
             board (Board): The current state of the chessboard.
@@ -100,25 +79,12 @@ class Tile:
         """
         if self.piece is None:
             raise ValueError(f"No piece on the tile {self.pos}, cannot move to {to}. Board state: {str(board)}")
-        if self.pos == to:
+        if self.pos == to or not board.rules.checks:
             return True
         # When called, to is empty or occupied by a opponent piece
-        # Save the destination square object
-        save_piece = board.get_piece(to)
-        self_piece = self.piece
-        # Swap the piece with the destination square
-        if self.piece.notation == "K":
-            board.get_player(self.piece.color).king = to
-        board.get_tile(to).piece = self.piece
-        self.piece = None
-        # Check if the king is in check after the move
-        can_move = not board.current_player.is_king_check(board)
-        # Restore the initial state of the board
-        self.piece = self_piece
-        board.get_tile(to).piece = save_piece
-        if self.piece.notation == "K":
-            board.get_player(self.piece.color).king = self.pos
-        return can_move
+        captured_pos = (self.pos[0], to[1]) if self.piece.notation == "P" and to == board.ep else to
+        captured_square = board.get_square(captured_pos) if not board.is_empty(captured_pos) else None
+        return board.position.is_move_safe(self.piece.color, board.get_square(self.pos), board.get_square(to), captured_square)
     
     def get_color(self) -> tuple[int, int, int, int]:
         """
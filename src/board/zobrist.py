@@ -0,0 +1,123 @@
+from random import Random
+
+from src.config import config
+from src.utils import flip_pos
+
+# Fixed seed so that every process (and every game) shares the same keys
+ZOBRIST_SEED = 0x5EED
+# Zobrist keys already generated, depending on the board's geometry
+_zobrist_keys = {}
+
+class ZobristKeys:
+    def __init__(self, rows: int, columns: int):
+        """
+        Initializes the random 64-bit keys used to hash a position.
+
+        Parameters:
+            rows (int): The number of rows of the board.
+            columns (int): The number of columns of the board.
+
+        Attributes:
+            pieces (dict): A dictionary where keys are (color, notation) tuples and values are
+                           lists of keys, one for each square of the board.
+            turn (int): The key XORed into the hash when black has to play.
+            castling (dict): A dictionary where keys are (color, direction) tuples and values are
+                             the keys of the corresponding castling rights.
+            en_passant (list[int]): The keys of the en passant square, one for each column.
+        """
+        generator = Random(ZOBRIST_SEED)
+        self.pieces = {
+            (color, notation): [generator.getrandbits(64) for _ in range(rows * columns)]
+            for color in [1, -1] for notation in ["P", "N", "B", "R", "Q", "K"]
+        }
+        self.turn = generator.getrandbits(64)
+        self.castling = {(color, direction): generator.getrandbits(64) for color in [1, -1] for direction in [1, -1]}
+        self.en_passant = [generator.getrandbits(64) for _ in range(columns)]
+
+def get_zobrist_keys() -> ZobristKeys:
+    """
+    Retrieves the Zobrist keys of the current board's geometry, generating them the first time.
+
+    Returns:
+        ZobristKeys: The keys matching `config.rows` and `config.columns`.
+    """
+    geometry = (config.rows, config.columns)
+    if geometry not in _zobrist_keys:
+        _zobrist_keys[geometry] = ZobristKeys(*geometry)
+    return _zobrist_keys[geometry]
+
+def get_square(pos: tuple[int, int], flipped: int) -> int:
+    """
+    Converts a position of the board into the index of the square seen from white's side.
+
+    The hash must not change when the board is flipped, so every key is indexed
+    by the square of the unflipped board.
+
+    Parameters:
+        pos (tuple[int, int]): The position (row, column) on the board.
+        flipped (int): The flipped state of the board (1 for normal, -1 for flipped).
+
+    Returns:
+        int: The index of the square, between 0 and rows * columns - 1.
+    """
+    row, column = flip_pos(pos, flipped=flipped)
+    return row * config.columns + column
+
+def piece_key(piece, pos: tuple[int, int], flipped: int) -> int:
+    """
+    Retrieves the key of a piece standing on a given position.
+
+    XORing this key into a hash adds the piece to the position, XORing it again removes it.
+
+    Parameters:
+        piece (Piece): The piece standing on the position.
+        pos (tuple[int, int]): The position (row, column) of the piece.
+        flipped (int): The flipped state of the board.
+
+    Returns:
+        int: The 64-bit key of the piece on this square.
+    """
+    return get_zobrist_keys().pieces[(piece.color, piece.notation)][get_square(pos, flipped)]
+
+def en_passant_key(ep: tuple[int, int] | None, flipped: int) -> int:
+    """
+    Retrieves the key of an en passant square.
+
+    Parameters:
+        ep (tuple[int, int] | None): The en passant square, or None if there is none.
+        flipped (int): The flipped state of the board.
+
+    Returns:
+        int: The 64-bit key of the column of the en passant square, or 0 if there is none.
+    """
+    if ep is None:
+        return 0
+    return get_zobrist_keys().en_passant[flip_pos(ep[1], flipped=flipped)]
+
+def compute_hash(board) -> int:
+    """
+    Computes the Zobrist hash of a board from scratch.
+
+    The hash covers the pieces and their positions, the side to move, the castling rights
+    and the column of the en passant square. Two boards representing the same position
+    share the same hash, whatever their flipped state.
+
+    Parameters:
+        board (Board): The board to hash.
+
+    Returns:
+        int: The 64-bit Zobrist hash of the position.
+    """
+    keys = get_zobrist_keys()
+    key = 0
+    for pos, tile in board.board.items():
+        if tile.piece is not None:
+            key ^= keys.pieces[(tile.piece.color, tile.piece.notation)][get_square(pos, board.flipped)]
+    if board.turn == -1:
+        key ^= keys.turn
+    for color in [1, -1]:
+        for direction in [1, -1]:
+            if board.castling[color][direction]:
+                key ^= keys.castling[(color, direction)]
+    key ^= en_passant_key(board.ep, board.flipped)
+    return key
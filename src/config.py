@@ -25,6 +25,12 @@ class Config:
             rows (int): Number of rows on the chessboard.
             columns (int): Number of columns on the chessboard.
             debug (bool): Debug mode flag.
+            debug_hash (bool): Whether the incremental hash of the board is checked against a hash
+                               computed from scratch after every move (slow, for debugging only).
+            ai_workers (int): The number of processes searching the moves of the root for each AI,
+                              the search staying in the game's process with 1 worker.
+            ai_stats_log (str): The path of the file where the statistics of each search of the AI are appended
+                                as a line of JSON, empty to not log them.
             rules (dict): A dictionary of chess rule variations, where each key is a rule name 
                           (str) and the value is a boolean indicating whether the rule is enabled.
         """
@@ -40,6 +46,9 @@ class Config:
         self.rows = self.config.getint('BOARD', 'rows')
         self.columns = self.config.getint('BOARD', 'columns')
         self.debug = self.config.getboolean('GENERAL', 'debug')
+        self.debug_hash = self.config.getboolean('GENERAL', 'debug_hash', fallback=False)
+        self.ai_workers = self.config.getint('IA', 'workers', fallback=1)
+        self.ai_stats_log = self.config.get('IA', 'stats_log', fallback='')
         self.rules = {
             "classic": True,
             "puissance_4_pawns": False,
@@ -2,6 +2,9 @@ from enum import StrEnum, Enum
 
 # Different values of pieces
 piece_values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 100}
+# Scores of a finished game, for the Negamax and the evaluation bar
+checkmate_score = 1000
+stalemate_score = 0
 
 # Heatmap for the evaluation function
 piece_heatmaps = {
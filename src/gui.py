@@ -4,6 +4,27 @@ import pygame
 from src.constants import Colors
 
 
+def left_click() -> bool:
+    """
+    Checks if the left mouse button is currently being pressed.
+
+    Returns:
+        bool: True if the left mouse button is pressed, False otherwise.
+    """
+    return bool(pygame.mouse.get_pressed()[0])
+
+def right_click() -> bool:
+    """
+    Check if the right mouse button is currently being pressed.
+
+    This function uses Pygame's `mouse.get_pressed()` method to determine
+    if the right mouse button (index 2) is pressed.
+
+    Returns:
+        bool: True if the right mouse button is pressed, False otherwise.
+    """
+    return bool(pygame.mouse.get_pressed()[2])
+
 def create_rect_surface(color: tuple[int, int, int], width: int, height: int, border_radius: int,
                         alpha: int = 255, border_width=0, border_color=None) -> pygame.Surface:
     """
@@ -0,0 +1,125 @@
+import argparse
+from time import perf_counter
+
+from src.board.perft import create_board
+from src.ia.negamax import NegamaxAI
+
+# Positions searched by the benchmark: name and FEN
+BENCHMARK_POSITIONS = [
+    ("Start position", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+    ("Position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+    ("Position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"),
+    ("Middlegame", "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8"),
+    ("Mate in 2 with a quiet move", "7k/8/5K2/8/8/8/8/R7 w - - 0 1"),
+]
+# Options of the AI compared by the benchmark of the pruning: name and keyword arguments of `NegamaxAI`
+PRUNING_OPTIONS = [
+    ("No pruning", {"null_move": False, "late_move_reductions": False}),
+    ("Null move", {"null_move": True, "late_move_reductions": False}),
+    ("Late move reductions", {"null_move": False, "late_move_reductions": True}),
+    ("Both", {"null_move": True, "late_move_reductions": True}),
+]
+
+def time_search(fen: str, depth: int, workers: int, **options) -> tuple[float, int, str]:
+    """
+    Searches a position with a new AI and measures the time it takes.
+
+    The worker processes are started before the clock, with a first search at depth 1,
+    so that their start is not counted.
+
+    Parameters:
+        fen (str): The FEN string of the position.
+        depth (int): The depth of the search.
+        workers (int): The number of processes searching the moves of the root.
+        **options: The other keyword arguments of `NegamaxAI`, such as `null_move`.
+
+    Returns:
+        tuple: A tuple (elapsed, nodes, move) with the time in seconds, the number of nodes
+               visited and the move found in UCI notation.
+    """
+    board = create_board(fen, {})
+    ai = NegamaxAI(board.turn, 1, workers=workers, **options)
+    try:
+        ai.get_best_move(board)
+        ai.depth = depth
+        start = perf_counter()
+        move = ai.get_best_move(board)
+        elapsed = perf_counter() - start
+    finally:
+        ai.close()
+    return elapsed, ai.stats.nodes, move.to_uci(board)
+
+def run_benchmark(depth: int, workers: int) -> float:
+    """
+    Compares the time the single-process search and the multi-process search take on each position.
+
+    With several processes, each worker has its own transposition table and only knows the score of the
+    first move of the root, not the bounds found by the other workers, so more nodes are visited than by a
+    single process: the speedup is below the number of workers, and the moves found can differ when they
+    score the same. The speedup can only be measured on a machine with at least as many cores as workers.
+
+    Parameters:
+        depth (int): The depth of the searches.
+        workers (int): The number of processes of the multi-process search.
+
+    Returns:
+        float: The speedup over all the positions, the total time of the single-process searches
+               divided by the total time of the multi-process ones.
+    """
+    total_single = 0
+    total_multi = 0
+    for name, fen in BENCHMARK_POSITIONS:
+        single_time, single_nodes, single_move = time_search(fen, depth, 1)
+        multi_time, multi_nodes, multi_move = time_search(fen, depth, workers)
+        total_single += single_time
+        total_multi += multi_time
+        print(f"{name}, depth {depth}: 1 process {single_time:.2f}s ({single_nodes} nodes, {single_move}), "
+              f"{workers} processes {multi_time:.2f}s ({multi_nodes} nodes, {multi_move}), "
+              f"speedup {single_time / max(multi_time, 1e-9):.2f}")
+    speedup = total_single / max(total_multi, 1e-9)
+    print(f"Total: 1 process {total_single:.2f}s, {workers} processes {total_multi:.2f}s, speedup {speedup:.2f}")
+    return speedup
+
+def run_pruning_benchmark(depth: int) -> None:
+    """
+    Compares the nodes visited and the time taken by a single process with the null move pruning and
+    the late move reductions disabled, enabled one at a time and both enabled.
+
+    The pruning visits fewer nodes but can change the move found, as the moves pruned or reduced are
+    not searched as deep as the other ones.
+
+    Parameters:
+        depth (int): The depth of the searches.
+    """
+    totals = {name: [0, 0] for name, _ in PRUNING_OPTIONS}
+    for position, fen in BENCHMARK_POSITIONS:
+        results = []
+        for name, options in PRUNING_OPTIONS:
+            elapsed, nodes, move = time_search(fen, depth, 1, **options)
+            totals[name][0] += elapsed
+            totals[name][1] += nodes
+            results.append(f"{name} {elapsed:.2f}s ({nodes} nodes, {move})")
+        print(f"{position}, depth {depth}: {', '.join(results)}")
+    print(f"Total: {', '.join(f'{name} {elapsed:.2f}s ({nodes} nodes)' for name, (elapsed, nodes) in totals.items())}")
+
+def main():
+    """
+    Runs the benchmark of the multi-process search, or of the pruning, from the command line, without opening a window.
+
+    Use it from the root folder:
+        python3 -m src.ia.benchmark --depth 4 --workers 4
+        python3 -m src.ia.benchmark --depth 5 --pruning
+    """
+    parser = argparse.ArgumentParser(description="Compares the single-process and multi-process searches of the Negamax AI, or its pruning.")
+    parser.add_argument("--depth", type=int, default=4, help="the depth of the searches")
+    parser.add_argument("--workers", type=int, default=4, help="the number of processes of the multi-process search")
+    parser.add_argument("--pruning", action="store_true", help="compare the null move pruning and the late move reductions instead")
+    args = parser.parse_args()
+    if args.pruning:
+        run_pruning_benchmark(args.depth)
+    else:
+        run_benchmark(args.depth, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,21 @@ class ChessModel(nn.Module, Player):
             if move and move.is_legal(board):
                 return move
 
+    def search_move(self, board, stop_event=None) -> object:
+        """
+        Get the best legal move on a copy of the board, searched in the background.
+
+        Args:
+            board: A copy of the current chess board state, which can be flipped.
+            stop_event: Unused, the prediction of the model is fast.
+
+        Returns:
+            object: The best legal move according to the model, on the given board.
+        """
+        if board.flipped == -1:
+            board.flip_board()
+        return self.get_best_move(board)
+
     def play_move(self, board) -> None:
         """
         Execute the best move on the given board and update highlights.
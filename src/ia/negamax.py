@@ -1,128 +1,897 @@
+from time import perf_counter
 from random import choice
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
 
 from src.config import config
+from src.utils import debug_print
 from src.board.player import Player
-from src.constants import piece_values, piece_heatmaps
+from src.board.bitboard import get_masks
+from src.board.zobrist import get_zobrist_keys
+from src.ia.stats import SearchStats
+from src.ia.ordering import MoveOrderer, get_captured_notation
+from src.constants import piece_values, checkmate_score, stalemate_score
+from src.board.move_encoding import get_promotion, is_quiet, code_to_uci, CAPTURE, CASTLING
+from src.ia.transposition import TranspositionTable, is_mate_score, EXACT, LOWER_BOUND, UPPER_BOUND
 
+# Maximum depth of the iterative deepening, the depth reached when the search is only limited by time
+MAX_DEPTH = 64
+# Expected number of moves left in the game, used to share the remaining clock between them
+MOVES_TO_GO = 30
+# Margin added to the value of a captured piece before pruning the capture in the quiescence search
+DELTA_MARGIN = 2
+# Number of plies of the quiescence search in which the checks are answered by all the evasions, when the checks
+# are searched. Deeper, a player in check stands pat or captures like in any other node, so that the search ends
+QUIESCENCE_EVASION_PLIES = 3
+# Width of the null window of the principal variation search, smaller than the difference between two scores
+NULL_WINDOW = 0.01
+# Half-width of the first aspiration window around the score of the previous iteration, doubled after each failure
+ASPIRATION_WINDOW = 0.5
+# Minimum depth at which the null move is tried, and number of plies the search after it is reduced by
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+# Minimum depth at which the late quiet moves are reduced, and number of moves searched before them at full depth.
+# A reduced move keeps at least two plies before the quiescence search, which does not search the quiet replies
+LMR_MIN_DEPTH = 4
+LMR_MIN_MOVES = 3
+# Minimum depth and number of moves after which the quiet moves are reduced by two plies instead of one
+LMR_DEEP_DEPTH = 6
+LMR_DEEP_MOVES = 10
+# Time in seconds between two checks of the stop event while waiting for the worker processes
+WORKERS_POLL_INTERVAL = 0.05
+# The AI of a worker process, created by `_init_worker` and kept from one task to another with its table
+_worker_ai = None
+# The event set by the main process to stop the searches of its workers
+_worker_stop_event = None
+# The search of the main process the worker has last taken part in
+_worker_search_id = None
+
+def _init_worker(options: dict, stop_event) -> None:
+    """
+    Creates the AI of a worker process of the multi-process search.
+
+    Parameters:
+        options (dict): The keyword arguments of `NegamaxAI`, apart from its color and depth.
+        stop_event (multiprocessing.Event): The event set by the main process to stop the searches.
+    """
+    global _worker_ai, _worker_stop_event
+    _worker_ai = NegamaxAI(1, None, workers=1, **options)
+    _worker_stop_event = stop_event
+    # The masks and keys of the board's geometry are computed before the first search, not during it
+    get_masks()
+    get_zobrist_keys()
+
+def _search_root_moves(board, moves: list[int], depth: int, alpha: float, beta: float, null_window: bool, budget: float | None, search_id: int) -> tuple[list[tuple[int, float, list[int]]], dict, bool]:
+    """
+    Searches some of the moves of the root in a worker process (see `NegamaxAI.search_root_moves`).
+
+    Parameters:
+        board (Board): A headless copy of the board, in the position of the root.
+        moves (list[int]): The moves of the root given to this worker, the most promising first.
+        depth (int): The depth of the current iteration.
+        alpha (float): The score the moves have to beat, such as the score of the first move of the root.
+        beta (float): The score above which the opponent avoids the root.
+        null_window (bool): Whether all the moves are first searched with a null window.
+        budget (float | None): The time in seconds left to the search, None if it is only limited by depth.
+        search_id (int): The number of the search of the main process, a new one making the entries of
+                         the worker's table replaceable, as in the main process.
+
+    Returns:
+        tuple: A tuple (results, stats, stopped) with the scores and principal variations of the moves searched,
+               the statistics of the worker's search and whether it ran out of time.
+    """
+    global _worker_search_id
+    _worker_ai.start_search(budget, _worker_stop_event, search_id != _worker_search_id)
+    _worker_search_id = search_id
+    results = _worker_ai.search_root_moves(board, moves, depth, alpha, beta, null_window)
+    return results, _worker_ai.stats, _worker_ai.stopped
 
 class NegamaxAI(Player):
-    def __init__(self, color: int, depth: int):
+    def __init__(self, color: int, depth: int, tt_size: int = 16, time_limit: float = None, move_ordering: bool = True, quiescence: bool = True, quiescence_checks: bool = False, workers: int = None, null_move: bool = True, late_move_reductions: bool = True):
         """
         Initializes the Negamax AI player with the specified color and search depth.
 
         Parameters:
             color (int): The color of the player. Typically, 1 for white and -1 for black.
             depth (int): The maximum depth of the search tree for the Negamax algorithm.
+                         If None, the depth is only limited by time.
+            tt_size (int): The memory budget of the transposition table, in megabytes. Defaults to 16.
+            time_limit (float, optional): The time in seconds the AI can spend on each move.
+                                          Defaults to None, in which case the search is only limited by depth.
+            move_ordering (bool): Whether the moves are sorted before being searched. Only the best move
+                                  of the transposition table is searched first if disabled. Defaults to True.
+            quiescence (bool): Whether the captures are searched at the leaves before evaluating the board.
+                               Defaults to True.
+            quiescence_checks (bool): Whether the quiescence search also searches the moves giving check on its
+                                      first ply, and the evasions of the checks on its first plies. Defaults to False.
+            workers (int, optional): The number of processes searching the moves of the root. Defaults to
+                                     `config.ai_workers`, the search staying in the current process with 1 worker.
+            null_move (bool): Whether the player to move lets the opponent play twice in a row, to prune the
+                              positions which are still too good for the opponent. Defaults to True.
+            late_move_reductions (bool): Whether the quiet moves sorted last are searched less deep,
+                                         unless they turn out to be good. Defaults to True.
 
         Attributes:
             depth (int): The maximum depth of the search tree for the Negamax algorithm.
             stalemate (int): The score assigned to a stalemate situation (default is 0).
-            checkmate (int): The score assigned to a checkmate situation (default is 1000).
+            checkmate (int): The score assigned to a checkmate situation (default is 1000), minus the number of plies
+                             from the root to the checkmate, so that the shortest checkmate is preferred.
             ia (int): A flag indicating that this is an AI player.
+            tt_size (int): The memory budget of the transposition table, in megabytes.
+            tt (TranspositionTable): The table of the positions already searched, kept from one move to another.
+            time_limit (float | None): The time in seconds the AI can spend on each move.
+            deadline (float | None): The time at which the current search must stop.
+            stop_event (threading.Event | None): The event set when the current search must stop before its
+                                                 deadline, when it runs in the background (see `search_move`).
+            stopped (bool): Whether the current search has been aborted because it ran out of time.
+            stats (SearchStats): The statistics of the current search, or of the last one once it is over.
+            completed_depth (int): The depth of the last iteration the current search has completed.
+            pv (list[int]): The principal variation of the last completed iteration, the line of moves both
+                            players are expected to play, starting with the best move (see `get_principal_variation`).
+            pv_table (list[list[int]]): The principal variation found below each ply of the current line.
+            move_ordering (bool): Whether the moves are sorted before being searched.
+            orderer (MoveOrderer): The killer moves and history used to sort the moves.
+            quiescence (bool): Whether the captures are searched at the leaves before evaluating the board.
+            quiescence_checks (bool): Whether the quiescence search also searches the moves giving check.
+            null_move (bool): Whether the null move pruning is enabled, if the rules of the board allow it.
+            late_move_reductions (bool): Whether the late quiet moves are searched less deep.
+            workers (int): The number of processes searching the moves of the root.
+            executor (ProcessPoolExecutor | None): The worker processes, started by the first search
+                                                   which needs them and kept until `close` is called.
+            worker_stop_event (multiprocessing.Event | None): The event shared with the worker processes
+                                                              to stop their searches.
         """
         super().__init__(color)
         self.depth = depth
-        self.stalemate = 0
-        self.checkmate = 1000
+        self.stalemate = stalemate_score
+        self.checkmate = checkmate_score
         self.ia = 1
+        self.tt_size = tt_size
+        self.tt = TranspositionTable(tt_size)
+        self.time_limit = time_limit
+        self.deadline = None
+        self.stop_event = None
+        self.stopped = False
+        self.stats = SearchStats()
+        self.completed_depth = 0
+        self.pv = []
+        self.pv_table = []
+        self.move_ordering = move_ordering
+        self.orderer = MoveOrderer()
+        self.quiescence = quiescence
+        self.quiescence_checks = quiescence_checks
+        self.null_move = null_move
+        self.late_move_reductions = late_move_reductions
+        self.workers = max(1, workers if workers is not None else config.ai_workers)
+        self.executor = None
+        self.worker_stop_event = None
 
-    def get_best_move(self, board):
+    def get_best_move(self, board, time_limit: float = None, remaining_time: float = None, increment: float = 0, stop_event=None):
         """
         Determines the best move for the current player using the Negamax algorithm.
 
-        This method evaluates all possible moves on the given board and selects the 
-        optimal move based on the Negamax algorithm with alpha-beta pruning.
-        If best move is None, the first legal move is returned.
+        This method searches the board with iterative deepening: the position is searched at depth 1,
+        then 2, and so on until the maximum depth is reached or the time budget runs out. Each
+        iteration searches the best move of the previous one first, thanks to the transposition table,
+        in a window around the previous score (see `aspiration_search`). If an iteration is aborted,
+        the best move and principal variation of the last completed iteration are kept.
+        If best move is None, the first legal move is returned. The search plays encoded moves,
+        only the move returned is turned into a `Move` object, to be played with `Move.execute`.
+        With several workers, the moves of the root are shared between processes at each iteration
+        (see `search_in_workers`).
 
         Parameters:
             board (object): The current state of the chessboard. It should be an 
                             object that represents the game state and provides 
                             necessary methods for move generation and evaluation.
+            time_limit (float, optional): The time in seconds allowed for this move. Defaults to
+                                          the `time_limit` of the AI.
+            remaining_time (float, optional): The time in seconds left on the AI's clock, used to
+                                              compute the budget if no time limit is given.
+            increment (float): The time in seconds added to the clock after each move. Defaults to 0.
+            stop_event (threading.Event, optional): The event set when the search must stop, as when it runs
+                                                    out of time. Defaults to None.
 
         Returns:
-            object: The best move determined by the Negamax algorithm. The exact 
-                    type of the return value depends on the implementation of the 
-                    board object and its move representation.
+            Move | None: The best move determined by the Negamax algorithm, or None if there is no legal move.
         """
-        best_move, _ = self.negamax(board, self.depth, -self.checkmate, self.checkmate)
+        budget = self.get_time_budget(time_limit, remaining_time, increment)
+        if self.workers > 1:
+            # Starting the processes is not part of the search's time
+            self.get_executor()
+        start = perf_counter()
+        self.start_search(budget, stop_event)
+        max_depth = min(self.depth, MAX_DEPTH) if self.depth else MAX_DEPTH
+        if self.workers > 1:
+            best_move = self.search_in_workers(board, max_depth, budget, start)
+        else:
+            best_move = None
+            score = None
+            for depth in range(1, max_depth + 1):
+                move, score = self.aspiration_search(lambda alpha, beta: self.negamax(board, depth, alpha, beta), score)
+                if self.stopped:
+                    break
+                best_move = move
+                self.pv = self.complete_principal_variation(board, self.pv_table[0], depth)
+                self.completed_depth = depth
+                self.record_iteration(score)
+                # A forced mate has been found, searching deeper won't change the move
+                if self.is_proven_mate(score, depth):
+                    break
+                # The next iteration would not have the time to finish
+                if budget is not None and perf_counter() - start > budget / 2:
+                    break
+        self.stats.finish()
+        if config.ai_stats_log:
+            self.stats.log(config.ai_stats_log)
         if best_move is None:
-            legal_moves = board.current_player.get_legal_moves(board)
+            legal_moves = board.get_legal_move_codes()
             if legal_moves:
                 best_move = legal_moves[0]
+        return board.code_to_move(best_move) if best_move is not None else None
+
+    def start_search(self, budget: float | None, stop_event=None, new_search: bool = True) -> None:
+        """
+        Resets the clock and starts new statistics before a search.
+
+        Parameters:
+            budget (float | None): The time in seconds the search can take, None if it is only limited by depth.
+            stop_event (threading.Event, optional): The event set when the search must stop. Defaults to None.
+            new_search (bool): Whether the search is a new one, whose entries of the transposition table and
+                               killer moves replace the ones of the previous searches. Defaults to True.
+        """
+        self.deadline = perf_counter() + budget if budget is not None else None
+        self.stop_event = stop_event
+        self.stopped = False
+        self.stats = SearchStats()
+        self.completed_depth = 0
+        self.pv = []
+        self.pv_table = [[] for _ in range(MAX_DEPTH + 1)]
+        if new_search:
+            self.tt.new_search()
+            self.orderer.new_search()
+
+    def search_root_moves(self, board, moves: list[int], depth: int, alpha: float, beta: float, null_window: bool) -> list[tuple[int, float, list[int]]]:
+        """
+        Searches some of the moves of the root, each worker of the multi-process search searching its own.
+
+        The moves are searched with alpha-beta as in `negamax`, the best score found so far raising alpha:
+        the scores above the initial alpha are exact, the other ones are upper bounds, which is enough
+        to sort the moves.
+
+        Parameters:
+            board (Board): The board, in the position of the root.
+            moves (list[int]): The moves to search, the most promising first.
+            depth (int): The depth of the search.
+            alpha (float): The score the moves have to beat.
+            beta (float): The score above which the opponent avoids the root.
+            null_window (bool): Whether all the moves are first searched with a null window, as the moves
+                                following the first one of the root, or only the ones after the first move.
+
+        Returns:
+            list[tuple[int, float, list[int]]]: The moves searched with their scores and principal variations,
+                                                which are incomplete if the search stopped.
+        """
+        results = []
+        for index, move in enumerate(moves):
+            undo = board.make_move(move)
+            score = self.search_after_move(board, depth - 1, alpha, beta, 1, index == 0 and not null_window)
+            board.unmake_move(undo)
+            if self.stopped:
+                break
+            # Only the moves raising alpha have an exact score, and a line to show
+            pv = self.complete_principal_variation(board, [move] + self.pv_table[1], depth) if score > alpha else [move]
+            results.append((move, score, pv))
+            alpha = max(alpha, score)
+        return results
+
+    def search_in_workers(self, board, max_depth: int, budget: float | None, start: float) -> int | None:
+        """
+        Runs the iterative deepening with the moves of the root shared between worker processes.
+
+        The GIL keeps threads from searching at the same time, so the workers are processes, each one
+        with its own AI and transposition table, kept from one search to another. At each iteration, the
+        moves of the root are dealt to the workers, sorted by the scores of the previous iteration, so
+        that each worker starts with a promising move and the best one goes to the first worker. A copy
+        of the board is sent to them, and they all stop as soon as one of them runs out of time or the
+        search is cancelled. The first move is searched alone beforehand, in an aspiration window, so
+        that the other ones are searched with a null window around its score, as a single process would do.
+
+        Parameters:
+            board (Board): The board, in the position to search.
+            max_depth (int): The depth of the last iteration.
+            budget (float | None): The time in seconds the search can take, None if it is only limited by depth.
+            start (float): The time at which the search started.
+
+        Returns:
+            int | None: The best move of the last completed iteration, encoded with `encode_move`.
+        """
+        moves = self.orderer.order_moves(board, board.get_legal_move_codes(), 0)
+        if not moves:
+            return None
+        executor = self.get_executor()
+        position = board.copy()
+        best_move = None
+        score = None
+        for depth in range(1, max_depth + 1):
+            results = {}
+
+            def search_first_move(alpha: float, beta: float) -> tuple[int, float]:
+                results.update(self._run_workers(executor, position, [moves[:1]], depth, alpha, beta, False, budget, start))
+                return moves[0], results[moves[0]][0] if moves[0] in results else 0
+
+            # The score of the first move is the bound of the other ones
+            _, first_score = self.aspiration_search(search_first_move, score)
+            if not self.stopped and len(moves) > 1:
+                others = moves[1:]
+                chunks = [others[index::self.workers] for index in range(min(self.workers, len(others)))]
+                results.update(self._run_workers(executor, position, chunks, depth, first_score, self.checkmate, True, budget, start))
+            if self.stopped:
+                break
+            moves.sort(key=lambda move: results[move][0], reverse=True)
+            best_move = moves[0]
+            score, self.pv = results[best_move]
+            self.completed_depth = depth
+            self.record_iteration(score)
+            # A forced mate has been found, searching deeper won't change the move
+            if self.is_proven_mate(score, depth):
+                break
+            # The next iteration would not have the time to finish
+            if budget is not None and perf_counter() - start > budget / 2:
+                break
         return best_move
 
-    def negamax(self, board, depth, alpha, beta):
+    def _run_workers(self, executor: ProcessPoolExecutor, board, chunks: list[list[int]], depth: int, alpha: float, beta: float, null_window: bool, budget: float | None, start: float) -> dict[int, tuple[float, list[int]]]:
+        """
+        Searches some moves of the root in the worker processes, a list of moves for each worker, and waits for them.
+
+        Parameters:
+            executor (ProcessPoolExecutor): The worker processes.
+            board (Board): The headless copy of the board sent to the workers.
+            chunks (list[list[int]]): The moves given to each worker.
+            depth (int): The depth of the current iteration.
+            alpha (float): The score the moves have to beat.
+            beta (float): The score above which the opponent avoids the root.
+            null_window (bool): Whether all the moves are first searched with a null window.
+            budget (float | None): The time in seconds the search can take, None if it is only limited by depth.
+            start (float): The time at which the search started.
+
+        Returns:
+            dict[int, tuple[float, list[int]]]: The scores and principal variations of the moves searched. `stopped`
+                                                is set if the workers ran out of time or the search was cancelled,
+                                                in which case the scores are incomplete.
+        """
+        self.worker_stop_event.clear()
+        remaining = budget - (perf_counter() - start) if budget is not None else None
+        # The generation of the table tells the workers when a new search starts
+        futures = [executor.submit(_search_root_moves, board, chunk, depth, alpha, beta, null_window, remaining, self.tt.generation) for chunk in chunks]
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=WORKERS_POLL_INTERVAL, return_when=FIRST_EXCEPTION)
+            if self.stop_event is not None and self.stop_event.is_set():
+                self.worker_stop_event.set()
+        scores = {}
+        for future in futures:
+            results, stats, stopped = future.result()
+            for move, score, pv in results:
+                scores[move] = (score, pv)
+            self.stats.add(stats)
+            if stopped:
+                # The other workers would not finish the iteration either
+                self.stopped = True
+                self.worker_stop_event.set()
+        return scores
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """
+        Retrieves the worker processes of the AI, starting them the first time.
+
+        The processes are spawned rather than forked, since the search can run in a thread of the interface.
+        They are all started at once, a process of the pool being otherwise only started when a task is given to it.
+
+        Returns:
+            ProcessPoolExecutor: The worker processes.
+        """
+        if self.executor is None:
+            context = get_context("spawn")
+            self.worker_stop_event = context.Event()
+            options = {
+                "tt_size": self.tt_size,
+                "move_ordering": self.move_ordering,
+                "quiescence": self.quiescence,
+                "quiescence_checks": self.quiescence_checks,
+                "null_move": self.null_move,
+                "late_move_reductions": self.late_move_reductions,
+            }
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker, initargs=(options, self.worker_stop_event))
+            wait([self.executor.submit(int) for _ in range(self.workers)])
+        return self.executor
+
+    def close(self) -> None:
+        """
+        Stops the worker processes of the AI, if they have been started.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+            self.worker_stop_event = None
+
+    def search_move(self, board, stop_event=None):
+        """
+        Searches the best move on a copy of the board, stopping as soon as `stop_event` is set.
+
+        Parameters:
+            board (Board): The board to search.
+            stop_event (threading.Event, optional): The event set when the search must stop. Defaults to None.
+
+        Returns:
+            Move | None: The best move found, or None if there is no legal move.
+        """
+        return self.get_best_move(board, stop_event=stop_event)
+
+    def is_out_of_time(self) -> bool:
+        """
+        Determines whether the current search must stop, because its deadline has passed or it has been cancelled.
+
+        Returns:
+            bool: True if the search must stop, False otherwise.
+        """
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            return True
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def get_stats(self) -> dict:
+        """
+        Retrieves the statistics of the last search, to measure the efficiency of the move ordering and of the pruning.
+
+        Returns:
+            dict: A dictionary containing the number of nodes and quiescence nodes, the nodes per second, the number of beta
+                  cutoffs and of cutoffs caused by the first move searched, the probes and hits of the transposition table,
+                  and the depth, score, principal variation and time of each iteration (see `SearchStats.to_dict`).
+        """
+        return self.stats.to_dict()
+
+    def complete_principal_variation(self, board, pv: list[int], depth: int) -> list[int]:
+        """
+        Completes a principal variation with the best moves stored in the transposition table.
+
+        The line kept by `negamax` stops where a score has been read from the transposition table
+        instead of being searched, so it is followed on with the best move of each position of the
+        table, as long as the move is legal and the position is not repeated.
+
+        Parameters:
+            board (Board): The board, in the position of the root.
+            pv (list[int]): The principal variation found by the search, starting with the best move.
+            depth (int): The depth of the search, which the line does not go beyond.
+
+        Returns:
+            list[int]: The completed principal variation.
+        """
+        pv = list(pv)
+        undos = [board.make_move(move) for move in pv]
+        while len(pv) < depth and board.hash_counts[board.hash] < 2:
+            entry = self.tt.probe(board.hash)
+            if entry is None or entry.move not in board.current_player.get_move_codes(board):
+                break
+            pv.append(entry.move)
+            undos.append(board.make_move(entry.move))
+        for undo in reversed(undos):
+            board.unmake_move(undo)
+        return pv
+
+    def get_principal_variation(self) -> list[str]:
+        """
+        Retrieves the principal variation of the last completed iteration, to display or log it.
+
+        The line stops before the depth of the search where a position is repeated or the game is over.
+
+        Returns:
+            list[str]: The moves of the line in UCI notation, starting with the best move.
+        """
+        return [code_to_uci(move) for move in self.pv]
+
+    def record_iteration(self, score: float) -> None:
+        """
+        Records a completed iteration of the search in its statistics, and prints it when debugging is enabled.
+
+        Parameters:
+            score (float): The score of the best move, for the player to move.
+        """
+        self.stats.add_iteration(self.completed_depth, score, self.get_principal_variation())
+        iteration = self.stats.iterations[-1]
+        debug_print(f"Depth {iteration['depth']}: score {score}, {iteration['nodes']} nodes in {iteration['duration']:.2f}s, pv {' '.join(iteration['pv'])}")
+
+    def get_time_budget(self, time_limit: float = None, remaining_time: float = None, increment: float = 0) -> float | None:
+        """
+        Computes the time the AI can spend searching the current move.
+
+        Parameters:
+            time_limit (float, optional): The time in seconds allowed for this move.
+            remaining_time (float, optional): The time in seconds left on the AI's clock.
+            increment (float): The time in seconds added to the clock after each move. Defaults to 0.
+
+        Returns:
+            float | None: The budget in seconds, or None if the search is only limited by depth.
+        """
+        if time_limit is not None:
+            return time_limit
+        if remaining_time is not None:
+            # Never use more than half of the clock on a single move
+            return min(remaining_time / MOVES_TO_GO + increment, remaining_time / 2)
+        return self.time_limit
+
+    def is_proven_mate(self, score: float, depth: int) -> bool:
+        """
+        Determines whether the score of an iteration is a checkmate found within the depth of the iteration.
+
+        A checkmate found deeper, by the quiescence search, is not proven to be the shortest one, and
+        a checkmate of the transposition table can come from a longer line, so the search goes on.
+
+        Parameters:
+            score (float): The score of the best move, for the player to move.
+            depth (int): The depth of the iteration.
+
+        Returns:
+            bool: True if the score is a checkmate in at most `depth` plies, False otherwise.
+        """
+        return is_mate_score(score) and self.checkmate - abs(score) <= depth
+
+    def aspiration_search(self, search, previous_score: float | None) -> tuple[int | None, float]:
+        """
+        Searches the root in a narrow window around the score of the previous iteration.
+
+        The score rarely changes much from one iteration to the next, and a narrow window cuts more
+        branches than the full one. If the score falls outside of the window, it is only a bound:
+        the window is widened on the side of the failure and the root is searched again, until the
+        score falls inside the window or the window reaches the scores of the checkmates.
+
+        Parameters:
+            search (Callable[[float, float], tuple[int | None, float]]): The search of the root in a window
+                                                                        (alpha, beta), returning the best move and its score.
+            previous_score (float | None): The score of the previous iteration, None for the first one,
+                                           which is searched with the full window.
+
+        Returns:
+            tuple: A tuple (best_move, score) returned by the last search, meaningless if the search stopped.
+        """
+        # There is nothing to expect from the first iteration, nor around a checkmate
+        if previous_score is None or is_mate_score(previous_score):
+            return search(-self.checkmate, self.checkmate)
+        window = ASPIRATION_WINDOW
+        alpha = previous_score - window
+        beta = previous_score + window
+        while True:
+            move, score = search(alpha, beta)
+            if self.stopped:
+                return move, score
+            window *= 2
+            if score <= alpha and alpha > -self.checkmate:
+                alpha = max(score - window, -self.checkmate)
+            elif score >= beta and beta < self.checkmate:
+                beta = min(score + window, self.checkmate)
+            else:
+                return move, score
+
+    def search_after_move(self, board, depth: int, alpha: float, beta: float, ply: int, first: bool, reduction: int = 0) -> float:
+        """
+        Searches the position reached by a move with the principal variation search.
+
+        With a good move ordering, the first move searched is the best one, so the other ones only have
+        to be proved worse, which a null window around alpha does faster than the full window. A move
+        which turns out to be better is searched again with the full window, to get its exact score and
+        principal variation. A node which already has a null window gains nothing from it.
+        A late move can also be searched less deep first, and is only searched at full depth if it beats alpha.
+
+        Parameters:
+            board (Board): The board, after the move.
+            depth (int): The depth of the search of the position after the move.
+            alpha (float): The score the move has to beat, for the player who has played it.
+            beta (float): The score above which the opponent avoids the position before the move.
+            ply (int): The distance from the root to the position after the move.
+            first (bool): Whether the move is the first one searched, with the full window.
+            reduction (int): The number of plies the first search of the move is reduced by. Defaults to 0.
+
+        Returns:
+            float: The score of the move for the player who has played it.
+        """
+        if first:
+            _, score = self.negamax(board, depth, -beta, -alpha, ply)
+            return -score
+        if reduction:
+            _, score = self.negamax(board, depth - reduction, -alpha - NULL_WINDOW, -alpha, ply)
+            score = -score
+            # The reduced search is trusted as long as the move does not beat alpha
+            if score <= alpha or self.stopped:
+                return score
+        if beta - alpha <= NULL_WINDOW:
+            _, score = self.negamax(board, depth, -beta, -alpha, ply)
+            return -score
+        _, score = self.negamax(board, depth, -alpha - NULL_WINDOW, -alpha, ply)
+        score = -score
+        if alpha < score < beta and not self.stopped:
+            _, score = self.negamax(board, depth, -beta, -alpha, ply)
+            score = -score
+        return score
+
+    def negamax(self, board, depth, alpha, beta, ply=0, null_move=True):
         """
         Implements the Negamax algorithm for evaluating and selecting the best move in a chess game.
         The Negamax algorithm is a variant of the Minimax algorithm, optimized for two-player zero-sum games like chess.
         It recursively evaluates possible moves to a specified depth and returns the best move along with its score.
+        Positions already searched deep enough are retrieved from the transposition table instead of being searched again.
+        The moves after the first one are searched with a null window (see `search_after_move`), and the line of the
+        moves raising alpha is kept in `pv_table`. A position repeating one of the game or of the current line is scored
+        as a draw. Outside of the principal variation, a position which is still too good for the opponent when the player
+        to move passes is pruned (null move pruning), and the quiet moves sorted last are searched less deep at first
+        (late move reductions).
         Parameters:
             board (Board): The current state of the chessboard. It provides information about the game state, 
-                           including the current player's legal moves.
+                           including the current player's legal moves. A node without legal moves is scored
+                           as a checkmate or a stalemate.
             depth (int): The maximum depth to search in the game tree. A depth of 0 indicates the base case, 
-                         where the evaluation function is used to score the board.
+                         where the quiescence search (or the evaluation function) is used to score the board.
             alpha (float): The alpha value for alpha-beta pruning. It represents the best score that the maximizing 
                            player is assured of.
             beta (float): The beta value for alpha-beta pruning. It represents the best score that the minimizing 
                           player is assured of.
+            ply (int): The distance to the root of the search. The root is never cut by the transposition table,
+                       so that a move is always returned. Defaults to 0.
+            null_move (bool): Whether the player to move can pass, which is not the case right after a null move,
+                              nor while checking one. Defaults to True.
         Returns:
             tuple: A tuple containing:
-                - best_move (Move or None): The best move found by the algorithm. If depth is 0, this will be None.
+                - best_move (int or None): The best move found by the algorithm, encoded with `encode_move`.
+                                           If depth is 0, this will be None.
                 - max_score (float): The score of the best move, as evaluated by the algorithm. A higher score 
                                      indicates a better move for the current player.
         """
+        # Check the clock, a node costs much more than reading it
+        self.stats.nodes += 1
+        if self.is_out_of_time():
+            self.stopped = True
+        if self.stopped:
+            return None, 0
+        self.pv_table[ply] = []
+
         if depth == 0:
+            if self.quiescence:
+                return None, self.quiescence_search(board, alpha, beta, 0, ply)
             return None, board.turn * self.evaluate_board(board)
-        
+
+        # A position already met in the game or the search is a draw, the opponent can repeat it again
+        if ply > 0 and board.hash_counts[board.hash] >= 2:
+            return None, self.stalemate
+
+        alpha_origin = alpha
+        key = board.hash
+        entry = self.tt.probe(key)
+        self.stats.tt_probes += 1
+        tt_move = None
+        if entry is not None:
+            self.stats.tt_hits += 1
+            tt_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                entry_score = entry.get_score(ply)
+                if entry.bound == EXACT:
+                    return None, entry_score
+                if entry.bound == LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                elif entry.bound == UPPER_BOUND:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return None, entry_score
+
+        player = board.current_player
+        in_check = (self.null_move or self.late_move_reductions) and depth >= min(NULL_MOVE_MIN_DEPTH, LMR_MIN_DEPTH) and player.is_king_check(board)
+        if (null_move and self.null_move and board.rules.null_move and ply > 0 and depth >= NULL_MOVE_MIN_DEPTH
+                and beta - alpha <= NULL_WINDOW and not is_mate_score(beta) and not in_check
+                and board.turn * self.evaluate_board(board) >= beta):
+            if self.is_null_move_cutoff(board, depth, beta, ply):
+                return None, beta
+            if self.stopped:
+                return None, 0
+
         max_score = -self.checkmate
         best_move = None
 
-        for move in board.current_player.get_legal_moves(board):
-            move.move(board)
-            _, score = self.negamax(board, depth - 1, -beta, -alpha)
-            score = -score
-            move.undo(board)
+        if self.move_ordering:
+            # The moves are generated by stages, as they are searched
+            moves = self.orderer.pick_moves(board, ply, tt_move)
+        else:
+            moves = player.get_move_codes(board)
+            # Search the best move of the previous search first
+            if tt_move is not None:
+                moves.sort(key=lambda move: move != tt_move)
+        searched = 0
+        for move in moves:
+            searched += 1
+            undo = board.make_move(move)
+            reduction = 0
+            # The moves sorted last rarely beat the first ones, unless they capture, promote or give check
+            if (self.late_move_reductions and searched > LMR_MIN_MOVES and depth >= LMR_MIN_DEPTH and not in_check
+                    and is_quiet(move) and move not in self.orderer.get_killers(ply) and not board.current_player.is_king_check(board)):
+                reduction = 2 if searched > LMR_DEEP_MOVES and depth >= LMR_DEEP_DEPTH else 1
+            score = self.search_after_move(board, depth - 1, alpha, beta, ply + 1, searched == 1, reduction)
+            board.unmake_move(undo)
+            # The score of an aborted search is meaningless
+            if self.stopped:
+                return best_move, max_score
 
             if score > max_score:
                 max_score = score
                 best_move = move
+                if score > alpha:
+                    self.pv_table[ply] = [move] + self.pv_table[ply + 1]
 
             alpha = max(alpha, score)
             if alpha >= beta:
+                self.stats.cutoffs += 1
+                if searched == 1:
+                    self.stats.first_move_cutoffs += 1
+                if self.move_ordering:
+                    self.orderer.update(board, move, depth, ply)
                 break
 
+        if searched == 0:
+            # The game is over, whatever the remaining depth
+            score = -(self.checkmate - ply) if board.rules.is_lost_without_moves(board) else self.stalemate
+            self.tt.store(key, MAX_DEPTH, EXACT, score, None, ply)
+            return None, score
+        if max_score <= alpha_origin:
+            bound = UPPER_BOUND
+        elif max_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, bound, max_score, best_move, ply)
         return best_move, max_score
 
+    def is_null_move_cutoff(self, board, depth: int, beta: float, ply: int) -> bool:
+        """
+        Determines whether a position can be pruned because it is still too good for the opponent when
+        the player to move passes.
+
+        In most positions, playing a move is better than passing, so if the opponent cannot bring the
+        score below beta after a null move, searched less deep, they would not either after a real move.
+        This is wrong in zugzwang, where every move worsens the position, as it often happens when the player
+        to move only has pawns: the position is then searched again without null move, less deep, to confirm the cutoff.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+            depth (int): The remaining depth of the search of the position.
+            beta (float): The score above which the opponent avoids the position.
+            ply (int): The distance from the root to the position.
+
+        Returns:
+            bool: True if the position can be pruned, False if it has to be searched or the search stopped.
+        """
+        reduced_depth = depth - 1 - NULL_MOVE_REDUCTION
+        undo = board.make_null_move()
+        _, score = self.negamax(board, reduced_depth, -beta, -beta + NULL_WINDOW, ply + 1, False)
+        board.unmake_null_move(undo)
+        if self.stopped or -score < beta:
+            return False
+        if board.position.has_non_pawn_material(board.turn):
+            return True
+        _, score = self.negamax(board, reduced_depth, beta - NULL_WINDOW, beta, ply, False)
+        return not self.stopped and score >= beta
+
+    def quiescence_search(self, board, alpha, beta, qply=0, ply=0):
+        """
+        Searches the captures of a leaf until the position is quiet, to avoid the horizon effect.
+
+        Evaluating a board in the middle of an exchange gives a wrong score, such as a queen taking
+        a defended pawn on the last ply. The quiescence search lets the player to move either keep
+        the static evaluation (stand pat) or try its captures, until no capture improves the score.
+        Captures that cannot bring the score back to alpha, even with a margin, are not searched
+        (delta pruning). A leaf in check searches every evasion instead, so that the checkmates
+        are still found on the last ply without evaluating each leaf's legal moves. When the checks
+        are searched, the evasions are searched up to `QUIESCENCE_EVASION_PLIES` plies.
+
+        Parameters:
+            board (Board): The current state of the chessboard.
+            alpha (float): The best score that the player to move is assured of.
+            beta (float): The best score that the opponent is assured of.
+            qply (int): The distance to the leaf where the quiescence search started. Defaults to 0.
+            ply (int): The distance from the root of the search to that leaf, to score the checkmates. Defaults to 0.
+
+        Returns:
+            float: The score of the position for the player to move.
+        """
+        self.stats.nodes += 1
+        self.stats.qnodes += 1
+        if self.is_out_of_time():
+            self.stopped = True
+        if self.stopped:
+            return 0
+
+        player = board.current_player
+        # A leaf in check is not quiet, and it is where the checkmates are found
+        in_check = (qply == 0 or (self.quiescence_checks and qply <= QUIESCENCE_EVASION_PLIES)) and player.is_king_check(board)
+        if in_check:
+            # Standing pat is not an option when in check, every evasion is searched
+            moves = player.get_move_codes(board)
+            if not moves:
+                return -(self.checkmate - ply - qply)
+            best_score = -self.checkmate
+        else:
+            stand_pat = board.turn * self.evaluate_board(board)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            best_score = stand_pat
+            moves = []
+            # Only a few of the pseudo-legal moves are searched, their legality is checked afterwards
+            search_checks = self.quiescence_checks and qply == 0
+            has_capture = False
+            for move in player.get_move_codes(board, legal=False, quiet=search_checks):
+                if move & CASTLING:
+                    continue
+                promotion = get_promotion(move)
+                if move & CAPTURE:
+                    has_capture = True
+                    # Delta pruning, even winning the piece for free would not reach alpha
+                    gain = piece_values[get_captured_notation(board, move)] + DELTA_MARGIN
+                    if promotion is not None:
+                        gain += piece_values[promotion] - piece_values["P"]
+                    if stand_pat + gain <= alpha:
+                        continue
+                elif promotion is None and not (search_checks and self.gives_check(board, move)):
+                    continue
+                if not board.rules.checks or board.position.is_legal(player.color, move):
+                    moves.append(move)
+            # The other moves are illegal when a capture is compulsory, even if the captures have been pruned
+            if has_capture and board.rules.compulsory_captures:
+                moves = [move for move in moves if move & CAPTURE]
+        moves = self.orderer.order_moves(board, moves, 0)
+
+        for move in moves:
+            undo = board.make_move(move)
+            score = -self.quiescence_search(board, -beta, -alpha, qply + 1, ply)
+            board.unmake_move(undo)
+            if self.stopped:
+                return best_score
+            if score > best_score:
+                best_score = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score
+
+    def gives_check(self, board, move: int) -> bool:
+        """
+        Determines whether a move puts the opponent's king in check.
+
+        Parameters:
+            board (Board): The board on which the move is played.
+            move (int): The move to test, encoded with `encode_move`.
+
+        Returns:
+            bool: True if the opponent's king is in check after the move, False otherwise.
+        """
+        undo = board.make_move(move)
+        check = board.current_player.is_king_check(board)
+        board.unmake_move(undo)
+        return check
+
     def evaluate_board(self, board):
         """
         Evaluates the current state of the chess board and returns a score representing the board's favorability
-        for the current player.
+        for the white player.
 
-        This method calculates the score based on the positions and values of the pieces on the board, as well as
-        the game's current state (e.g., stalemate or checkmate). Positive scores favor the current player, while
-        negative scores favor the opponent.
+        This method is called at every leaf of the search, so it only reads the material and heatmap score
+        kept up to date by the board at each move, without generating any move. Checkmates and stalemates
+        are detected by the search itself, when a node has no legal moves.
 
         Parameters:
             board (Board): The chess board object representing the current state of the game. It contains
                            information about the pieces, their positions, and the current player's turn.
 
         Returns:
-            int: A numerical score representing the evaluation of the board. Higher scores indicate a more
-                 favorable position for the current player, while lower scores indicate a less favorable position.
-                 Special values are returned for stalemates and checkmates.
+            float: A numerical score representing the evaluation of the board. Positive scores favor the white
+                   player, while negative scores favor the black player.
         """
-        if board.is_stalemate():
-            if board.current_player.is_king_check(board):
-                return self.checkmate * -board.turn
-            else:
-                return self.stalemate
-        score = 0
-        for tile in board.board.values():
-            if board.is_empty(tile.pos):
-                continue
-            piece_score = piece_heatmaps[tile.piece.color*board.flipped][tile.piece.notation][tile.pos[0]][tile.pos[1]]
-            score += (piece_values[tile.piece.notation.upper()] + piece_score) * tile.piece.color
-        return score
+        return board.evaluation
 
     def play_move(self, board):
         """
@@ -172,15 +941,7 @@ class RandomAI(Player):
         Returns:
             object: A randomly selected legal move from the list of possible moves.
         """
-        moves = self.get_moves(board)
-        if config.rules["giveaway"] == True:
-            capture_moves = [move for move in moves if move.is_capture()]
-            if len(capture_moves) != 0:
-                moves = capture_moves
-            else:
-                moves = [move for move in moves if not move.castling]
-        else:
-            moves = self.get_legal_moves(board)
+        moves = self.get_legal_moves(board)
         return choice(moves)
     
     def play_move(self, board):
@@ -0,0 +1,218 @@
+from src.constants import piece_values
+from src.board.move_encoding import get_from_square, get_to_square, get_promotion, CAPTURE, EN_PASSANT
+
+# Scores given to each kind of move, the highest ones are searched first
+TT_MOVE_SCORE = 1_000_000
+CAPTURE_SCORE = 100_000
+KILLER_SCORES = (90_000, 80_000)
+# History scores stay below the killer moves
+MAX_HISTORY_SCORE = 50_000
+
+class MoveOrderer:
+    def __init__(self):
+        """
+        Initializes the move orderer used by the Negamax algorithm to search the most promising moves first.
+
+        The better the first moves searched, the more branches alpha-beta pruning can cut.
+        Moves are searched in this order: the best move found by a previous search (from the
+        transposition table), the winning captures sorted by MVV-LVA (most valuable victim, least
+        valuable attacker), the killer moves of the ply, the quiet moves sorted by their history
+        score, then the losing captures. `pick_moves` only generates each stage when it is reached.
+
+        Attributes:
+            killers (list[list]): For each ply, the two last quiet moves which caused a beta cutoff.
+            history (dict): A dictionary where keys are (color, from_square, to_square) tuples and values are
+                            scores increased each time the quiet move causes a beta cutoff.
+        """
+        self.killers = []
+        self.history = {}
+
+    def new_search(self) -> None:
+        """
+        Prepares the orderer for a new search.
+
+        Killer moves only make sense within a search, so they are removed. The history
+        is kept but halved, so that the moves of the current position weigh more.
+        """
+        self.killers = []
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+    def get_killers(self, ply: int) -> list:
+        """
+        Retrieves the killer moves of a ply, creating the slots if needed.
+
+        Parameters:
+            ply (int): The distance to the root of the search.
+
+        Returns:
+            list: The two killer moves of the ply, encoded with `encode_move`, or None.
+        """
+        while len(self.killers) <= ply:
+            self.killers.append([None, None])
+        return self.killers[ply]
+
+    def score_move(self, board, move: int, ply: int, tt_move: int = None) -> int:
+        """
+        Computes the score used to sort a move, the highest scores being searched first.
+
+        The pieces are read from the bitboards of the board, the move itself is only an integer.
+
+        Parameters:
+            board (Board): The board on which the move is played.
+            move (int): The move to score, encoded with `encode_move`.
+            ply (int): The distance to the root of the search.
+            tt_move (int, optional): The best move stored in the transposition table.
+
+        Returns:
+            int: The score of the move.
+        """
+        if move == tt_move:
+            return TT_MOVE_SCORE
+        promotion = get_promotion(move)
+        if move & CAPTURE:
+            # Most valuable victim, least valuable attacker
+            attacker = board.position.mailbox[get_from_square(move)]
+            score = CAPTURE_SCORE + 10 * piece_values[get_captured_notation(board, move)] - piece_values[attacker]
+            if promotion is not None:
+                score += piece_values[promotion]
+            return score
+        if promotion is not None:
+            return CAPTURE_SCORE + piece_values[promotion]
+        killers = self.get_killers(ply)
+        for killer, killer_score in zip(killers, KILLER_SCORES):
+            if move == killer:
+                return killer_score
+        return min(self.history.get((board.turn, get_from_square(move), get_to_square(move)), 0), MAX_HISTORY_SCORE)
+
+    def order_moves(self, board, moves: list[int], ply: int, tt_move: int = None) -> list[int]:
+        """
+        Sorts moves so that the most promising ones are searched first.
+
+        Parameters:
+            board (Board): The board on which the moves are played.
+            moves (list[int]): The moves to sort, encoded with `encode_move`.
+            ply (int): The distance to the root of the search.
+            tt_move (int, optional): The best move stored in the transposition table.
+
+        Returns:
+            list[int]: The moves, sorted from the most to the least promising.
+        """
+        return sorted(moves, key=lambda move: self.score_move(board, move, ply, tt_move), reverse=True)
+
+    def pick_moves(self, board, ply: int, tt_move: int = None):
+        """
+        Yields the legal moves of the current player, the most promising first, generating them by stages.
+
+        A node is often cut by its first moves, so the moves are only generated, sorted and checked
+        for legality when their stage is reached: the move of the transposition table is searched
+        before any move is generated, and the quiet moves are only generated if no capture caused
+        a cutoff. The moves coming from another position (the move of the transposition table and
+        the killer moves) are only searched if they are legal here. In giveaway, whether a quiet
+        move is legal depends on all the captures, so the legal moves are sorted at once.
+
+        Parameters:
+            board (Board): The board on which the moves are played. It must be in the same state
+                           each time the next move is requested.
+            ply (int): The distance to the root of the search.
+            tt_move (int, optional): The best move stored in the transposition table.
+
+        Yields:
+            int: The legal moves, encoded with `encode_move`.
+        """
+        player = board.current_player
+        if board.rules.compulsory_captures:
+            yield from self.order_moves(board, player.get_move_codes(board), ply, tt_move)
+            return
+        position = board.position
+        color = player.color
+        if tt_move is not None and position.is_pseudo_legal(color, tt_move, board.get_ep_square(), board.get_castling_sides(color)) and position.is_legal(color, tt_move):
+            yield tt_move
+
+        # Winning captures and promotions, the losing captures are kept for the end
+        losing_captures = []
+        noisy_moves = [move for move in player.get_move_codes(board, legal=False, quiet=False) if move != tt_move]
+        for move in sorted(noisy_moves, key=lambda move: self.score_move(board, move, ply), reverse=True):
+            if is_losing_capture(board, move):
+                losing_captures.append(move)
+            elif position.is_legal(color, move):
+                yield move
+
+        # Killer moves, if they are moves of this position
+        quiet_moves = [move for move in player.get_move_codes(board, legal=False, noisy=False) if move != tt_move]
+        killers = [killer for killer in dict.fromkeys(self.get_killers(ply)) if killer in quiet_moves]
+        for move in killers:
+            if position.is_legal(color, move):
+                yield move
+
+        # Quiet moves, sorted by their history score
+        quiet_moves = [move for move in quiet_moves if move not in killers]
+        for move in sorted(quiet_moves, key=lambda move: self.score_move(board, move, ply), reverse=True):
+            if position.is_legal(color, move):
+                yield move
+
+        for move in losing_captures:
+            if position.is_legal(color, move):
+                yield move
+
+    def update(self, board, move: int, depth: int, ply: int) -> None:
+        """
+        Remembers a quiet move which caused a beta cutoff, as a killer move and in the history.
+
+        Captures and promotions are already searched early, so they are not remembered.
+
+        Parameters:
+            board (Board): The board on which the move is played.
+            move (int): The move which caused the beta cutoff, encoded with `encode_move`.
+            depth (int): The remaining depth of the node, deeper cutoffs weigh more.
+            ply (int): The distance to the root of the search.
+        """
+        if move & CAPTURE or get_promotion(move) is not None:
+            return
+        killers = self.get_killers(ply)
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history_key = (board.turn, get_from_square(move), get_to_square(move))
+        self.history[history_key] = self.history.get(history_key, 0) + depth * depth
+
+def is_losing_capture(board, move: int) -> bool:
+    """
+    Determines whether a capture is likely to lose material.
+
+    A capture is losing when the captured piece, plus the promotion if any, is worth less than the
+    capturing piece and the destination square is defended, so that the capturing piece can be taken back.
+
+    Parameters:
+        board (Board): The board on which the move is played, before it is played.
+        move (int): The move, encoded with `encode_move`.
+
+    Returns:
+        bool: True if the move is a capture likely to lose material, False otherwise.
+    """
+    if not move & CAPTURE:
+        return False
+    position = board.position
+    from_square, to_square = get_from_square(move), get_to_square(move)
+    gain = piece_values[get_captured_notation(board, move)]
+    promotion = get_promotion(move)
+    if promotion is not None:
+        gain += piece_values[promotion] - piece_values["P"]
+    if gain >= piece_values[position.mailbox[from_square]]:
+        return False
+    return position.is_attacked(to_square, -board.turn, position.occupied & ~(1 << from_square))
+
+def get_captured_notation(board, move: int) -> str | None:
+    """
+    Retrieves the notation of the piece captured by a move.
+
+    Parameters:
+        board (Board): The board on which the move is played, before it is played.
+        move (int): The move, encoded with `encode_move`.
+
+    Returns:
+        str | None: The notation of the captured piece, or None if the move is not a capture.
+    """
+    if not move & CAPTURE:
+        return None
+    # The pawn captured en passant does not stand on the destination square
+    return "P" if move & EN_PASSANT else board.position.mailbox[get_to_square(move)]
@@ -0,0 +1,79 @@
+from threading import Thread, Event
+
+class SearchThread:
+    def __init__(self, player, board):
+        """
+        Starts the search of an AI player on a worker thread, so that the interface keeps running meanwhile.
+
+        The AI searches a copy of the board (see `Board.copy`), so the interface can still draw and flip
+        the board during the search. The move found is kept as its code, which does not depend on the
+        orientation of the board, and turned back into a `Move` of the board by `poll` once the search is over.
+
+        Parameters:
+            player (Player): The AI player to move, which provides `search_move`.
+            board (Board): The board of the game, in the position to search.
+
+        Attributes:
+            player (Player): The AI player searching.
+            board (Board): The board of the game.
+            hash (int): The hash of the position searched, to check that the board is still in it.
+            stop_event (Event): The event set to cancel the search.
+            done (Event): The event set when the search is over.
+            code (int | None): The code of the move found, None until the search is over or if there is no move.
+            error (Exception | None): The exception raised by the search, if any, raised again by `poll`.
+            thread (Thread): The worker thread of the search.
+        """
+        self.player = player
+        self.board = board
+        self.hash = board.hash
+        self.stop_event = Event()
+        self.done = Event()
+        self.code = None
+        self.error = None
+        # The copy is made here, before the interface can change the board
+        self.thread = Thread(target=self._run, args=(board.copy(),), daemon=True)
+        self.thread.start()
+
+    def _run(self, board) -> None:
+        """
+        Searches the move of the player on the copy of the board, in the worker thread.
+
+        Parameters:
+            board (Board): The copy of the board to search.
+        """
+        try:
+            move = self.player.search_move(board, self.stop_event)
+            self.code = move.code if move is not None else None
+        except Exception as error:
+            self.error = error
+        finally:
+            self.done.set()
+
+    def poll(self):
+        """
+        Retrieves the move found by the search, without waiting for it.
+
+        Returns:
+            Move | None: The move to play on the board, or None if the search is not over, has been
+                         cancelled, has found no move or the board has left the position searched.
+
+        Raises:
+            Exception: The exception raised by the search, if any.
+        """
+        if not self.done.is_set() or self.stop_event.is_set():
+            return None
+        if self.error is not None:
+            raise self.error
+        if self.code is None or self.board.hash != self.hash:
+            return None
+        return self.board.code_to_move(self.code)
+
+    def cancel(self) -> None:
+        """
+        Stops the search and waits for the worker thread to finish.
+
+        The searches check whether they are cancelled at each node, so the thread ends almost at once,
+        and the AI player can start another search right after without two of them sharing its state.
+        """
+        self.stop_event.set()
+        self.thread.join()
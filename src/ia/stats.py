@@ -0,0 +1,150 @@
+import json
+from time import perf_counter
+
+# Number of decimals the times are rounded to in the logs
+TIME_DECIMALS = 4
+
+class SearchStats:
+    def __init__(self):
+        """
+        Initializes the statistics of a search of the Negamax AI, which tell where the search spends its time.
+
+        The counters are increased by the search itself, at each node, and the iterative deepening records
+        each iteration it completes. The worker processes of the multi-process search have their own
+        statistics, added to the ones of the main process (see `add`). The statistics can be written as a
+        line of JSON (see `log`), and are drawn on the game in debug mode.
+
+        Attributes:
+            start (float): The time at which the search started.
+            elapsed (float): The time in seconds the search has taken, up to its last completed iteration or its end.
+            nodes (int): The number of nodes visited, quiescence nodes included.
+            qnodes (int): The number of nodes visited by the quiescence search.
+            cutoffs (int): The number of beta cutoffs.
+            first_move_cutoffs (int): The number of beta cutoffs caused by the first move searched.
+            tt_probes (int): The number of positions looked up in the transposition table.
+            tt_hits (int): The number of positions found in the transposition table.
+            depth (int): The depth of the last completed iteration.
+            score (float | None): The score of the best move of the last completed iteration, for the player to move.
+            pv (list[str]): The principal variation of the last completed iteration, in UCI notation.
+            iterations (list[dict]): For each completed iteration, its depth, score, principal variation,
+                                     number of nodes, duration and time since the start of the search.
+        """
+        self.start = perf_counter()
+        self.elapsed = 0
+        self.nodes = 0
+        self.qnodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.depth = 0
+        self.score = None
+        self.pv = []
+        self.iterations = []
+
+    @property
+    def nps(self) -> float:
+        """
+        Computes the number of nodes visited per second.
+
+        Returns:
+            float: The nodes per second, 0 if no time has been measured yet.
+        """
+        return self.nodes / self.elapsed if self.elapsed else 0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Computes the share of the beta cutoffs caused by the first move searched, which measures the move ordering.
+
+        Returns:
+            float: The rate between 0 and 1, 0 if there has been no cutoff.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """
+        Computes the share of the positions looked up which were found in the transposition table.
+
+        Returns:
+            float: The rate between 0 and 1, 0 if there has been no probe.
+        """
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0
+
+    def add(self, other: "SearchStats") -> None:
+        """
+        Adds the counters of another search, such as the one of a worker process, to these statistics.
+
+        Parameters:
+            other (SearchStats): The statistics of the other search.
+        """
+        self.nodes += other.nodes
+        self.qnodes += other.qnodes
+        self.cutoffs += other.cutoffs
+        self.first_move_cutoffs += other.first_move_cutoffs
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+
+    def add_iteration(self, depth: int, score: float, pv: list[str]) -> None:
+        """
+        Records an iteration of the iterative deepening which has been completed.
+
+        Parameters:
+            depth (int): The depth of the iteration.
+            score (float): The score of the best move, for the player to move.
+            pv (list[str]): The principal variation found, in UCI notation.
+        """
+        previous = self.iterations[-1] if self.iterations else {"nodes": 0, "time": 0}
+        self.elapsed = perf_counter() - self.start
+        self.depth = depth
+        self.score = score
+        self.pv = pv
+        self.iterations.append({
+            "depth": depth,
+            "score": score,
+            "pv": pv,
+            "nodes": self.nodes - previous["nodes"],
+            "duration": round(self.elapsed - previous["time"], TIME_DECIMALS),
+            "time": round(self.elapsed, TIME_DECIMALS),
+        })
+
+    def finish(self) -> None:
+        """
+        Records the end of the search, including the time spent on an aborted iteration.
+        """
+        self.elapsed = perf_counter() - self.start
+
+    def to_dict(self) -> dict:
+        """
+        Converts the statistics into a dictionary, as written in the logs.
+
+        Returns:
+            dict: The counters, the rates and the iterations of the search.
+        """
+        return {
+            "depth": self.depth,
+            "score": self.score,
+            "pv": self.pv,
+            "time": round(self.elapsed, TIME_DECIMALS),
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "nps": round(self.nps),
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": self.tt_hit_rate,
+            "iterations": self.iterations,
+        }
+
+    def log(self, path: str) -> None:
+        """
+        Appends the statistics to a file of JSON lines, one line per search.
+
+        Parameters:
+            path (str): The path of the file.
+        """
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(self.to_dict()) + "\n")
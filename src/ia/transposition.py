@@ -0,0 +1,141 @@
+from src.constants import checkmate_score
+
+# Types of bound stored with a score
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Approximate size in bytes of one stored entry (object, key, score and move code)
+ENTRY_SIZE = 256
+# Scores further from 0 than this bound are checkmates, `checkmate_score` minus the number of plies to the checkmate
+MATE_THRESHOLD = checkmate_score - 256
+
+def is_mate_score(score: float) -> bool:
+    """
+    Determines whether a score is the one of a checkmate found by the search.
+
+    Parameters:
+        score (float): The score of a position.
+
+    Returns:
+        bool: True if the score is a checkmate for either player, False otherwise.
+    """
+    return abs(score) > MATE_THRESHOLD
+
+class TTEntry:
+    __slots__ = ("key", "depth", "bound", "score", "move", "generation")
+
+    def __init__(self, key: int, depth: int, bound: int, score: float, move: int | None, generation: int):
+        """
+        Initializes an entry of the transposition table.
+
+        Parameters:
+            key (int): The Zobrist hash of the position.
+            depth (int): The depth to which the position has been searched.
+            bound (int): The type of the score (EXACT, LOWER_BOUND or UPPER_BOUND).
+            score (float): The score of the position for the player who has to play, the checkmates being
+                           counted from the position rather than from the root (see `TranspositionTable.store`).
+            move (int | None): The best move found, encoded with `encode_move`.
+            generation (int): The search during which the entry has been stored.
+        """
+        self.key = key
+        self.depth = depth
+        self.bound = bound
+        self.score = score
+        self.move = move
+        self.generation = generation
+
+    def get_score(self, ply: int) -> float:
+        """
+        Retrieves the score of the entry for the position reached at a given distance from the root.
+
+        Parameters:
+            ply (int): The distance from the root of the current search to the position.
+
+        Returns:
+            float: The score, a checkmate being counted from the root of the current search.
+        """
+        if self.score > MATE_THRESHOLD:
+            return self.score - ply
+        if self.score < -MATE_THRESHOLD:
+            return self.score + ply
+        return self.score
+
+class TranspositionTable:
+    def __init__(self, size_mb: int = 16):
+        """
+        Initializes a fixed-size transposition table.
+
+        The table is never cleared between two searches, so that what has been found while
+        searching a move is reused to search the next ones. Entries are replaced depending
+        on their depth and on the search they come from.
+
+        Parameters:
+            size_mb (int): The memory budget of the table, in megabytes. Defaults to 16.
+
+        Attributes:
+            size (int): The number of entries the table can hold.
+            entries (list[TTEntry | None]): The entries, indexed by their key modulo `size`.
+            generation (int): The number of the current search.
+        """
+        self.size = max(1, size_mb * 1024 * 1024 // ENTRY_SIZE)
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """
+        Starts a new search, making the entries of the previous searches replaceable.
+        """
+        self.generation += 1
+
+    def clear(self) -> None:
+        """
+        Removes all the entries of the table.
+        """
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key: int) -> TTEntry | None:
+        """
+        Retrieves the entry stored for a position.
+
+        Parameters:
+            key (int): The Zobrist hash of the position.
+
+        Returns:
+            TTEntry | None: The entry of the position, or None if the position is not in the table.
+        """
+        entry = self.entries[key % self.size]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: float, move: int | None, ply: int = 0) -> None:
+        """
+        Stores the result of a search in the table.
+
+        The slot is replaced if it is empty, if it holds the same position, if it comes from
+        a previous search or if it has been searched less deeply. Otherwise the deeper
+        entry of the current search is kept. A checkmate is stored as counted from the position,
+        so that it is still right when the position is reached at another distance from the root.
+
+        Parameters:
+            key (int): The Zobrist hash of the position.
+            depth (int): The depth to which the position has been searched.
+            bound (int): The type of the score (EXACT, LOWER_BOUND or UPPER_BOUND).
+            score (float): The score of the position for the player who has to play.
+            move (int | None): The best move found, encoded with `encode_move`.
+            ply (int): The distance from the root of the current search to the position. Defaults to 0.
+        """
+        if score > MATE_THRESHOLD:
+            score += ply
+        elif score < -MATE_THRESHOLD:
+            score -= ply
+        index = key % self.size
+        entry = self.entries[index]
+        if entry is not None and entry.key != key and entry.generation == self.generation and entry.depth > depth:
+            return
+        # Keep the best move already known if none has been found this time
+        if move is None and entry is not None and entry.key == key:
+            move = entry.move
+        self.entries[index] = TTEntry(key, depth, bound, score, move, self.generation)
@@ -4,10 +4,12 @@ from src.config import config
 from src.board.board import Board
 from src.scenes.scene import Scene
 from src.board.player import Player
-from src.constants import Fonts, Colors
+from src.ia.search_thread import SearchThread
+from src.constants import Fonts, Colors, checkmate_score
 from src.board.piece import piece_to_notation
-from src.gui import RectButton, Label, create_rect_surface
-from src.utils import left_click, right_click, get_pos, debug_print, load_image
+from src.assets import load_image
+from src.utils import get_pos, debug_print
+from src.gui import RectButton, Label, create_rect_surface, left_click, right_click
 
 
 class Game(Scene):
@@ -27,11 +29,17 @@ class Game(Scene):
         self.current_player = current_player
         self.waiting_player = waiting_player
         self.board = Board(current_player, waiting_player, "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        self.board.attach_assets()
         if (self.current_player.ia + self.waiting_player.ia) == 0 and self.waiting_player.ia == -1:
             self.board.flip_board()
         self.evaluation_bar = pygame.Rect(config.margin, config.margin, config.eval_bar_width, config.height-config.margin*2)
         self.history_background = pygame.Rect(config.margin+config.columns*config.tile_size+config.eval_bar_width, config.margin, config.width*0.35, config.height-config.margin*2)
         self.ia_counter = 0
+        # The search of the AI to move, run in the background
+        self.search = None
+        # The AI whose statistics of its last search are drawn in debug mode
+        self.search_player = None
+        self.debug_font = pygame.font.Font(f"data/assets/font/{Fonts.TYPE_MACHINE}", int(config.height*0.022)) if config.debug else None
         self.bg = load_image('data/assets/images/game_bg.jpeg', (config.width, config.height))
         super().__init__()
 
@@ -54,7 +62,7 @@ class Game(Scene):
                 text_color=Colors.DARK_GRAY.value,
                 font_size=int(config.height*0.1),
                 font_name=Fonts.GEIZER,
-                command=self.manager.go_back
+                command=self.leave
             ),
             "flip": RectButton(
                 x=self.history_background.centerx, 
@@ -63,7 +71,7 @@ class Game(Scene):
                 height=config.width*0.05, 
                 color=Colors.LIGHT_GRAY.value, 
                 hovered_color=Colors.WHITE.value,
-                command=self.board.flip_board, 
+                command=self._cancelling(lambda:self.board.flip_board()), 
                 image=load_image("data/assets/images/arrows.png",(config.width*0.05, config.width*0.05))
             ),
             'undo':RectButton(
@@ -77,7 +85,7 @@ class Game(Scene):
                 font_name=Fonts.GEIZER, 
                 font_size=font_size,
                 text_color=Colors.BLACK.value, 
-                command=lambda:self.board.move_tree.go_backward(self.board)
+                command=self._cancelling(lambda:self.board.move_tree.go_backward(self.board))
             ) ,
             'redo':RectButton(
                 x=self.history_background.centerx+config.width*0.07, 
@@ -90,7 +98,7 @@ class Game(Scene):
                 font_name=Fonts.GEIZER, 
                 font_size=font_size,
                 text_color=Colors.BLACK.value, 
-                command=lambda:self.board.move_tree.go_forward(self.board)
+                command=self._cancelling(lambda:self.board.move_tree.go_forward(self.board))
             ),
             'root':RectButton(
                 x=self.history_background.centerx-config.width*0.14, 
@@ -103,7 +111,7 @@ class Game(Scene):
                 font_name=Fonts.GEIZER, 
                 font_size=font_size,
                 text_color=Colors.BLACK.value, 
-                command=lambda:self.board.move_tree.go_root(self.board)
+                command=self._cancelling(lambda:self.board.move_tree.go_root(self.board))
             ),
             'leaf':RectButton(
                 x=self.history_background.centerx+config.width*0.14, 
@@ -116,10 +124,50 @@ class Game(Scene):
                 font_name=Fonts.GEIZER, 
                 font_size=font_size,
                 text_color=Colors.BLACK.value, 
-                command=lambda:self.board.move_tree.go_leaf(self.board)
+                command=self._cancelling(lambda:self.board.move_tree.go_leaf(self.board))
             ) 
         }
 
+    def _cancelling(self, command):
+        """
+        Wraps the command of a button which changes the board,
+        so that the search of the AI is cancelled first.
+
+        Args:
+            command (callable): The command of the button.
+
+        Returns:
+            callable: The command cancelling the search before running.
+        """
+        def cancelling_command():
+            self.cancel_search()
+            command()
+        return cancelling_command
+
+    def cancel_search(self):
+        """
+        Cancels the search of the AI running in the background, if any.
+        """
+        if self.search is not None:
+            self.search.cancel()
+            self.search = None
+
+    def close_players(self):
+        """
+        Cancels the search of the AI and releases the resources of both players, such as the
+        worker processes of the Negamax AI, when the game is left.
+        """
+        self.cancel_search()
+        self.current_player.close()
+        self.waiting_player.close()
+
+    def leave(self):
+        """
+        Leaves the game for the previous scene, closing the players first.
+        """
+        self.close_players()
+        self.manager.go_back()
+
     def create_labels(self):
         """
         Initializes label elements for the game UI.
@@ -152,6 +200,8 @@ class Game(Scene):
             label.draw(screen)
 
         super().render(screen)
+        if config.debug:
+            self._draw_search_stats(screen)
         
     def update(self):
         """
@@ -159,11 +209,18 @@ class Game(Scene):
         """
         super().update()
         if self.board.game_over == False and self.board.current_player.ia == True:
-            if self.ia_counter >= 1:
-
-                self.board.current_player.play_move(self.board)
-                self.ia_counter = 0
-            else :
+            # The AI searches in the background, the window is drawn meanwhile
+            if self.search is None:
+                self.search = SearchThread(self.board.current_player, self.board)
+                self.search_player = self.board.current_player
+            elif self.ia_counter >= 1 and self.search.done.is_set():
+                move = self.search.poll()
+                self.search = None
+                if move is not None:
+                    move.execute(self.board)
+                    self.board.update_highlights()
+                    self.ia_counter = 0
+            if self.ia_counter < 1:
                 self.ia_counter += 1/config.fps
         if self.board.winner and not self.labels:
             self.handle_winner()
@@ -186,6 +243,39 @@ class Game(Scene):
                 raise ValueError(f"Piece image is None for {tile.piece}")
             screen.blit(tile.piece.image, tile.coord)
 
+    def _draw_search_stats(self, screen:pygame.Surface):
+        """
+        Draws the statistics of the last search of the AI over the board, in debug mode.
+
+        The statistics are read while the search runs, so they show the iterations completed so far.
+        Only the AIs keeping statistics of their searches, such as the Negamax AI, are shown.
+
+        Args:
+            screen (pygame.Surface): The screen where the statistics are drawn.
+        """
+        stats = getattr(self.search_player, "stats", None)
+        if stats is None:
+            return
+        lines = [
+            f"Depth {stats.depth}, score {stats.score}, {stats.elapsed:.2f}s",
+            f"{stats.nodes} nodes ({stats.qnodes} quiescence), {stats.nps:.0f} nodes/s",
+            f"First move cutoffs {stats.first_move_cutoff_rate:.0%}, TT hits {stats.tt_hit_rate:.0%} of {stats.tt_probes}",
+        ]
+        # Only the last iterations, the first ones take no time
+        for iteration in stats.iterations[-5:]:
+            lines.append(f"Depth {iteration['depth']}: {iteration['duration']:.2f}s, {iteration['nodes']} nodes")
+        lines.append("PV " + " ".join(stats.pv[:8]))
+        surfaces = [self.debug_font.render(line, True, Colors.WHITE.value) for line in lines]
+        padding = config.margin // 4
+        width = max(surface.get_width() for surface in surfaces) + padding * 2
+        height = sum(surface.get_height() for surface in surfaces) + padding * 2
+        x, y = config.margin + config.eval_bar_width, config.margin
+        screen.blit(create_rect_surface(Colors.BLACK.value, width, height, 0, 180), (x, y))
+        y += padding
+        for surface in surfaces:
+            screen.blit(surface, (x + padding, y))
+            y += surface.get_height()
+
     def _draw_highlight(self, screen:pygame.Surface):
         """
         Draws highlights on squares for selected pieces or legal moves.
@@ -231,11 +321,11 @@ class Game(Scene):
         # Drawing the promotion's frame
         # We normalize the rect to avoid negative width or height, this flips the rect and makes it in the right direction when the board is flipped
         # pos needs to be offset by 1 if the board is flipped
-        rect = pygame.Rect((pos[1] - min(0, self.board.flipped*piece.color)) * config.tile_size + config.margin + config.eval_bar_width, (pos[0] - min(0, self.board.flipped*piece.color)) * config.tile_size + config.margin, self.board.flipped*piece.color * config.tile_size, self.board.flipped*piece.color * len(piece.promotion) * config.tile_size)
+        rect = pygame.Rect((pos[1] - min(0, self.board.flipped*piece.color)) * config.tile_size + config.margin + config.eval_bar_width, (pos[0] - min(0, self.board.flipped*piece.color)) * config.tile_size + config.margin, self.board.flipped*piece.color * config.tile_size, self.board.flipped*piece.color * len(self.board.rules.promotions) * config.tile_size)
         rect.normalize()
         pygame.draw.rect(screen, Colors.WHITE.value, rect)
         # Drawing the promotion's pieces
-        for i, type_piece in enumerate(piece.promotion):
+        for i, type_piece in enumerate(self.board.rules.promotion_pieces):
             image = self.board.piece_images[("w" if piece.color == 1 else "b") + piece_to_notation(type_piece)]
             screen.blit(image, (pos[1] * config.tile_size + config.margin + config.eval_bar_width, (pos[0] + i * self.board.flipped*piece.color) * config.tile_size + config.margin))
 
@@ -277,14 +367,20 @@ class Game(Scene):
         """
         super().handle_event(event)
         keys = pygame.key.get_pressed()
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        if event.type == pygame.QUIT:
+            self.close_players()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
             if left_click():
                 self.handle_left_click(keys)
             elif right_click():
                 self.handle_right_click(keys)
         elif event.type == pygame.KEYDOWN:
+            # These keys change the board, the position searched by the AI is left
+            if any(keys[key] for key in (pygame.K_r, pygame.K_f, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)):
+                self.cancel_search()
             if keys[pygame.K_r]:
                 self.board = Board(self.current_player if self.current_player.color == 1 else self.waiting_player, self.current_player if self.current_player.color == -1 else self.waiting_player)
+                self.board.attach_assets()
             if keys[pygame.K_f]:
                 self.board.flip_board()
             if keys[pygame.K_LEFT]:
@@ -338,7 +434,7 @@ class Game(Scene):
         Args:
             screen (pygame.Surface): The screen where the evaluation bar is drawn.
         """
-        value = max(0, min(1, (self.board.score*30 + self.board.negamax.checkmate) / (2 * self.board.negamax.checkmate)))
+        value = max(0, min(1, (self.board.score*30 + checkmate_score) / (2 * checkmate_score)))
 
         white_height = value * self.evaluation_bar.height
         black_height = self.evaluation_bar.height - white_height
@@ -4,7 +4,7 @@ from src.config import config
 from src.scenes.scene import Scene
 from src.gui import Label, RectButton, create_rect_surface
 from src.constants import Colors, Fonts, available_board, available_piece, available_sound
-from src.utils import generate_piece_images, generate_board_image, load_image, generate_sounds, resize_image
+from src.assets import generate_piece_images, generate_board_image, load_image, generate_sounds, resize_image
 
 
 class SettingsMenu(Scene):
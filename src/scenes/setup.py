@@ -3,7 +3,7 @@ import random
 import pygame
 
 from src.config import config
-from src.utils import load_image
+from src.assets import load_image
 from src.scenes.game import Game
 from src.scenes.scene import Scene
 from src.board.player import Player
@@ -398,6 +398,8 @@ class PlayerVsIaMenu(Scene):
             button (RadioButton): The button that was clicked.
         """
         button.state = True
+        # The replaced AI may have started worker processes
+        self.player2.close()
         self.player2 = str_to_ia(ia, self.player2.color, self.depth)
         for b in self.ia_buttons.values():
             if button is not b:
@@ -654,9 +656,12 @@ class IaVsIaMenu(Scene):
             button_dict (dict): The dictionary containing all the IA buttons.
         """
         button.state = True
+        # The replaced AI may have started worker processes
         if num == 1:
+            self.player1.close()
             self.player1 = str_to_ia(ia, 1, self.depth[1])
         else:
+            self.player2.close()
             self.player2 = str_to_ia(ia, -1, self.depth[2])
         for b in button_dict.values():
             if button is not b: